@@ -0,0 +1 @@
+"""Washington State EV analytics dashboard: data, indexes, analytics, sidebar and page modules."""
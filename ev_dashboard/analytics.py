@@ -0,0 +1,608 @@
+"""Per-filter-state analytics: similarity, forecasts, bootstrap intervals, top-k,
+approximate sketches and the KPI helpers shared by the pages."""
+
+import hashlib
+import json
+import os
+import time
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from ev_dashboard.indexes import UNKNOWN_LABEL, build_facet_codes
+from ev_dashboard.result_store import persistent_result
+
+
+# Regional similarity: regions are compared by their make (or vehicle type) mix. The region x
+# category matrix comes from one bincount over combined codes; similarity and clustering are
+# batched matrix products. Dense arrays are fine here: even postal codes x makes is a few MB.
+SIMILARITY_LEVELS = ['County', 'City', 'Postal Code']
+MIN_REGION_VEHICLES = 20
+SIMILARITY_TOP_K = 5
+SIMILARITY_BLOCK_SIZE = 512
+
+
+def region_labels(geo_tree, depth):
+    """Display label per node at a level, qualified by its parent below the county level"""
+    labels = geo_tree['node_labels'][depth]
+    names = labels.iloc[:, -1].astype(str)
+    if depth == 0:
+        return names.to_numpy()
+    return (names + " (" + labels.iloc[:, -2].astype(str) + ")").to_numpy()
+
+
+def region_category_matrix(geo_tree, facet, rows, depth):
+    """Vehicle counts per region x category from one bincount over the combined codes"""
+    regions = geo_tree['node_ids'][depth][geo_tree['leaf_ids'][rows]]
+    categories = facet['codes'][rows]
+    known = categories >= 0
+    n_regions, n_categories = len(geo_tree['node_labels'][depth]), len(facet['options'])
+    combined = regions[known].astype('int64') * n_categories + categories[known]
+    return np.bincount(combined, minlength=n_regions * n_categories).reshape(n_regions, n_categories)
+
+
+def top_k_cosine(vectors, k):
+    """All-pairs cosine top-k, computed in row blocks so memory stays bounded"""
+    k = min(k, len(vectors) - 1)
+    neighbors = np.zeros((len(vectors), k), dtype='int64')
+    scores = np.zeros((len(vectors), k), dtype='float32')
+    if k <= 0:
+        return neighbors, scores
+    for start in range(0, len(vectors), SIMILARITY_BLOCK_SIZE):
+        block = vectors[start:start + SIMILARITY_BLOCK_SIZE] @ vectors.T
+        block[np.arange(len(block)), np.arange(start, start + len(block))] = -np.inf  # skip self
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(block, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        neighbors[start:start + len(block)] = np.take_along_axis(top, order, axis=1)
+        scores[start:start + len(block)] = np.take_along_axis(top_scores, order, axis=1)
+    return neighbors, scores
+
+
+def kmeans(vectors, n_clusters, n_iter=50, seed=42):
+    """Batched Lloyd's k-means with k-means++ seeding"""
+    rng = np.random.default_rng(seed)
+    n_clusters = min(n_clusters, len(vectors))
+    centers = [vectors[rng.integers(len(vectors))]]
+    for _ in range(1, n_clusters):
+        distances = ((vectors[:, None, :] - np.array(centers)[None]) ** 2).sum(axis=2).min(axis=1)
+        probabilities = distances / distances.sum() if distances.sum() > 0 else None
+        centers.append(vectors[rng.choice(len(vectors), p=probabilities)])
+    centers = np.array(centers)
+
+    labels = np.full(len(vectors), -1)
+    squared_norms = (vectors ** 2).sum(axis=1)[:, None]
+    for _ in range(n_iter):
+        distances = squared_norms - 2 * vectors @ centers.T + (centers ** 2).sum(axis=1)[None]
+        new_labels = distances.argmin(axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        sizes = np.bincount(labels, minlength=n_clusters)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, vectors)
+        filled = sizes > 0
+        centers[filled] = sums[filled] / sizes[filled, None]
+    return labels, centers
+
+
+@st.cache_data(max_entries=32)
+@persistent_result('region_similarity')
+def region_similarity(_geo_tree, _facet, _rows, filter_signature, depth, facet_column, n_clusters):
+    """Share matrix, top-k similar regions and k-means clusters for one level and filter state"""
+    counts = region_category_matrix(_geo_tree, _facet, _rows, depth)
+    totals = counts.sum(axis=1)
+    kept = np.flatnonzero(totals >= MIN_REGION_VEHICLES)
+    labels = region_labels(_geo_tree, depth)
+    kept = kept[labels[kept] != UNKNOWN_LABEL]
+    if len(kept) < 2:
+        return None
+
+    shares = (counts[kept] / totals[kept, None]).astype('float32')
+    unit_vectors = shares / np.linalg.norm(shares, axis=1, keepdims=True)
+    neighbors, scores = top_k_cosine(unit_vectors, SIMILARITY_TOP_K)
+    clusters, centers = kmeans(shares, n_clusters)
+
+    return {
+        'regions': labels[kept],
+        'vehicles': totals[kept],
+        'categories': _facet['options'],
+        'shares': shares,
+        'neighbors': neighbors,
+        'scores': scores,
+        'clusters': clusters,
+        'centers': centers,
+    }
+
+
+# Adoption curves: cumulative registrations by model year for every county (or make) are fit
+# with a log-linear growth model. All groups are solved together from closed-form weighted
+# least-squares sums, so there is no per-group Python loop.
+FIT_WINDOW = 6  # most recent model years used for each fit
+FORECAST_YEARS = 3
+MIN_FIT_YEARS = 3
+
+
+@st.cache_data(max_entries=32)
+@persistent_result('fit_adoption_curves')
+def fit_adoption_curves(_group_codes, _model_years, options, filter_signature, group_column):
+    """Fit log(cumulative registrations) = intercept + slope * year for every group at once"""
+    known = _group_codes >= 0
+    codes, model_years = _group_codes[known], _model_years[known].astype('int64')
+    if len(codes) == 0:
+        return None
+    years = np.arange(model_years.min(), model_years.max() + 1)
+    n_groups, n_years = len(options), len(years)
+
+    counts = np.bincount(codes * n_years + (model_years - years[0]), minlength=n_groups * n_years)
+    cumulative = counts.reshape(n_groups, n_years).cumsum(axis=1)
+
+    # Weighted least squares on the fit window, with years centred on the latest model year
+    window = slice(max(0, n_years - FIT_WINDOW), n_years)
+    t = (years[window] - years[-1]).astype('float64')
+    observed = cumulative[:, window]
+    weights = (observed > 0).astype('float64')
+    log_counts = np.log(np.where(observed > 0, observed, 1))
+
+    n = weights.sum(axis=1)
+    sum_t = weights @ t
+    sum_y = (weights * log_counts).sum(axis=1)
+    sum_tt = weights @ (t ** 2)
+    sum_ty = (weights * log_counts) @ t
+    denominator = n * sum_tt - sum_t ** 2
+    valid = (n >= MIN_FIT_YEARS) & (denominator > 0)
+    safe_denominator = np.where(valid, denominator, 1)
+    slope = np.where(valid, (n * sum_ty - sum_t * sum_y) / safe_denominator, np.nan)
+    intercept = np.where(valid, (sum_y - slope * sum_t) / np.maximum(n, 1), np.nan)
+
+    residuals = weights * (log_counts - (intercept[:, None] + slope[:, None] * t[None]))
+    sigma = np.sqrt((residuals ** 2).sum(axis=1) / np.maximum(n - 2, 1))
+
+    return {
+        'group_column': group_column,
+        'options': options,
+        'years': years,
+        'cumulative': cumulative,
+        'slope': slope,
+        'intercept': intercept,
+        'sigma': sigma,
+        'n': n,
+        'mean_t': sum_t / np.maximum(n, 1),
+        'sxx': np.where(valid, denominator / np.maximum(n, 1), np.nan),
+        'valid': valid,
+    }
+
+
+def adoption_forecast(curves, group_index):
+    """Actual cumulative counts plus forecast and 95% prediction band for one group"""
+    years = curves['years']
+    actual = pd.DataFrame({
+        'Model Year': years,
+        'Vehicles': curves['cumulative'][group_index],
+        'Series': 'Actual',
+    })
+    if not curves['valid'][group_index]:
+        return actual, None
+
+    future_years = years[-1] + np.arange(1, FORECAST_YEARS + 1)
+    t = (future_years - years[-1]).astype('float64')
+    predicted = curves['intercept'][group_index] + curves['slope'][group_index] * t
+    n = curves['n'][group_index]
+    standard_error = curves['sigma'][group_index] * np.sqrt(
+        1 + 1 / n + (t - curves['mean_t'][group_index]) ** 2 / curves['sxx'][group_index]
+    )
+    forecast = pd.DataFrame({
+        'Model Year': future_years,
+        'Vehicles': np.exp(predicted),
+        'Lower': np.exp(predicted - 1.96 * standard_error),
+        'Upper': np.exp(predicted + 1.96 * standard_error),
+        'Series': 'Forecast',
+    })
+    return actual, forecast
+
+
+# Bootstrap confidence intervals for KPIs. Replicates are drawn as blocks of resampling index
+# matrices, so each block is one vectorized gather and reduction. Block sizes come from the
+# measured cost per replicate, so the time budget is checked before it would be exceeded.
+# Large samples are resampled m-out-of-n (m = BOOTSTRAP_MAX_RESAMPLE) and the spread is
+# rescaled by sqrt(m / n), which holds for the root-n statistics used here (mean, median).
+BOOTSTRAP_REPLICATES = 2000
+BOOTSTRAP_TIME_BUDGET = 0.5  # seconds
+BOOTSTRAP_BLOCK_ELEMENTS = 2_000_000
+BOOTSTRAP_CALIBRATION_REPLICATES = 20
+BOOTSTRAP_MAX_RESAMPLE = 20_000
+BOOTSTRAP_STATISTICS = {'mean': np.mean, 'median': np.median}
+
+
+@st.cache_data(max_entries=64)
+@persistent_result('bootstrap_interval')
+def bootstrap_interval(_values, filter_signature, column, statistic, confidence=0.95):
+    """Percentile bootstrap interval for a statistic of the non-missing values"""
+    values = _values[~np.isnan(_values)]
+    if len(values) < 2:
+        return None
+
+    rng = np.random.default_rng(42)
+    reduce = BOOTSTRAP_STATISTICS[statistic]
+    resample_size = min(len(values), BOOTSTRAP_MAX_RESAMPLE)
+    max_block = max(1, BOOTSTRAP_BLOCK_ELEMENTS // resample_size)
+    estimates = []
+    started = time.perf_counter()
+    drawn = 0
+    size = min(BOOTSTRAP_CALIBRATION_REPLICATES, max_block)
+    while drawn < BOOTSTRAP_REPLICATES and size > 0:
+        resample = rng.integers(0, len(values), size=(size, resample_size))
+        estimates.append(reduce(values[resample], axis=1))
+        drawn += size
+        # Size the next block to what the remaining budget affords at the measured rate
+        elapsed = time.perf_counter() - started
+        affordable = int((BOOTSTRAP_TIME_BUDGET - elapsed) / (elapsed / drawn))
+        size = min(max_block, affordable, BOOTSTRAP_REPLICATES - drawn)
+
+    estimates = np.concatenate(estimates)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(estimates, [tail, 100 - tail])
+    if resample_size < len(values):
+        point = reduce(values)
+        scale = np.sqrt(resample_size / len(values))
+        low, high = point + (low - point) * scale, point + (high - point) * scale
+    return {'low': low, 'high': high, 'replicates': drawn, 'sample_size': len(values),
+            'resample_size': resample_size}
+
+
+def format_interval(interval, value_format):
+    """Caption text for a bootstrap interval"""
+    if interval is None:
+        return "Too few vehicles for a confidence interval"
+    resamples = f"{interval['replicates']:,} resamples"
+    if interval.get('resample_size', interval['sample_size']) < interval['sample_size']:
+        resamples += f" of {interval['resample_size']:,}"
+    return (f"95% CI {value_format.format(interval['low'])} – {value_format.format(interval['high'])} "
+            f"(n={interval['sample_size']:,}, {resamples})")
+
+
+# Make x Model Year contingency matrix shared by the heatmap, make diversity and growth
+# metrics. Built once per filter state with a single bincount over the combined codes.
+@st.cache_data(max_entries=32)
+@persistent_result('build_make_year_matrix')
+def build_make_year_matrix(_make_codes, _model_years, makes, filter_signature, n_rows):
+    """Dense vehicle counts per make (rows) and model year (columns)"""
+    if len(_make_codes) == 0:
+        return None
+    model_years = _model_years.astype('int64')
+    years = np.arange(model_years.min(), model_years.max() + 1)
+    counts = np.bincount(_make_codes * len(years) + (model_years - years[0]), minlength=len(makes) * len(years))
+    return {'matrix': counts.reshape(len(makes), len(years)), 'makes': np.array(makes, dtype=object), 'years': years}
+
+
+def get_make_year_matrix(filtered_df):
+    """Make x Model Year matrix for the current filtered dataframe"""
+    facet = build_facet_codes(st.session_state.df, st.session_state.dataset_version)['Make']
+    rows = filtered_df.index.to_numpy()
+    return build_make_year_matrix(
+        facet['codes'][rows], st.session_state.df['Model Year'].to_numpy()[rows], facet['options'],
+        st.session_state.filter_signature, len(rows)
+    )
+
+
+# Top-k engine for the "largest N categories" charts. Counts come from one bincount over the
+# facet codes and an argpartition over the counts. Inputs with more rows than
+# TOP_K_SKETCH_ROWS are streamed in chunks through a mergeable Misra-Gries summary instead,
+# and only its candidates are counted exactly, so no filtered copy of the rows is built.
+TOP_K_SUBSETS = {
+    'luxury': (80000, float('inf')),
+    'premium': (60000, float('inf')),
+    'value': (0, 45000),
+}
+# EV_TOP_K_SKETCH_ROWS overrides the row count above which the sketch is used
+TOP_K_SKETCH_ROWS = int(os.environ.get("EV_TOP_K_SKETCH_ROWS", 10_000_000))
+TOP_K_SKETCH_CAPACITY = 256
+TOP_K_SKETCH_CHUNK = 1_000_000
+
+
+def largest_k(counts, k):
+    """Positions of the k largest counts, ordered by count (ties by position)"""
+    k = min(k, len(counts))
+    if k == 0:
+        return np.array([], dtype=np.int64)
+    top = np.argpartition(-counts, k - 1)[:k] if k < len(counts) else np.arange(len(counts))
+    return top[np.lexsort((top, -counts[top]))]
+
+
+def top_k_chunks(codes, prices, subset):
+    """Known codes of the rows in a price subset, one chunk at a time"""
+    for start in range(0, len(codes), TOP_K_SKETCH_CHUNK):
+        chunk = codes[start:start + TOP_K_SKETCH_CHUNK]
+        if subset is not None:
+            low, high = TOP_K_SUBSETS[subset]
+            chunk_prices = prices[start:start + TOP_K_SKETCH_CHUNK]
+            chunk = chunk[(chunk_prices > low) & (chunk_prices <= high)]
+        yield chunk[chunk >= 0]
+
+
+def misra_gries(chunks, capacity):
+    """Heavy-hitter candidates: every code with frequency above n / (capacity + 1) survives"""
+    summary_codes = np.array([], dtype=np.int64)
+    summary_counts = np.array([], dtype=np.int64)
+    for chunk in chunks:
+        chunk_codes, chunk_counts = np.unique(chunk, return_counts=True)
+        # Merge the chunk's summary into the running one, then keep `capacity` counters
+        merged_codes, inverse = np.unique(np.concatenate([summary_codes, chunk_codes]), return_inverse=True)
+        merged_counts = np.bincount(inverse, weights=np.concatenate([summary_counts, chunk_counts]))
+        merged_counts = merged_counts.astype(np.int64)
+        if len(merged_counts) > capacity:
+            cutoff = np.partition(merged_counts, len(merged_counts) - capacity - 1)[len(merged_counts) - capacity - 1]
+            merged_counts = merged_counts - cutoff
+            keep = merged_counts > 0
+            merged_codes, merged_counts = merged_codes[keep], merged_counts[keep]
+        summary_codes, summary_counts = merged_codes, merged_counts
+    return summary_codes
+
+
+def sketch_top_k(codes, prices, subset, k):
+    """Top-k codes and exact counts over the Misra-Gries candidates, in two streaming passes"""
+    candidates = misra_gries(top_k_chunks(codes, prices, subset), max(TOP_K_SKETCH_CAPACITY, k))
+    counts = np.zeros(len(candidates), dtype=np.int64)
+    for chunk in top_k_chunks(codes, prices, subset):
+        counts += np.bincount(np.searchsorted(candidates, chunk[np.isin(chunk, candidates)]),
+                              minlength=len(candidates))
+    top = largest_k(counts, k)
+    return candidates[top], counts[top]
+
+
+@st.cache_data(max_entries=128)
+@persistent_result('compute_top_k')
+def compute_top_k(_codes, _prices, options, column, filter_signature, k, subset, n_rows):
+    """Top-k options by vehicle count as a [column, 'Count'] frame"""
+    if len(_codes) > TOP_K_SKETCH_ROWS:
+        top_options, top_counts = sketch_top_k(_codes, _prices, subset, k)
+    else:
+        codes = _codes
+        if subset is not None:
+            low, high = TOP_K_SUBSETS[subset]
+            codes = codes[(_prices > low) & (_prices <= high)]
+        codes = codes[codes >= 0]
+        counts = np.bincount(codes, minlength=len(options))
+        top_options = largest_k(counts, k)
+        top_counts = counts[top_options]
+        nonzero = top_counts > 0
+        top_options, top_counts = top_options[nonzero], top_counts[nonzero]
+
+    return pd.DataFrame({column: np.array(options, dtype=object)[top_options], 'Count': top_counts})
+
+
+def top_k_counts(df, column, k, subset=None):
+    """Largest k categories of a facet column in df, memoized per filter state.
+
+    The unfiltered dataset is memoized per dataset version, so pages that rank over all
+    vehicles share one entry instead of storing a copy under every filter state.
+    """
+    facet = build_facet_codes(st.session_state.df, st.session_state.dataset_version)[column]
+    if df is st.session_state.df:
+        signature = f"dataset-{st.session_state.dataset_version}"
+    else:
+        signature = st.session_state.filter_signature
+    rows = df.index.to_numpy()
+    prices = st.session_state.df['Base MSRP'].to_numpy()[rows] if subset is not None else None
+    return compute_top_k(facet['codes'][rows], prices, facet['options'], column, signature, k, subset, len(rows))
+
+
+# Approximate query mode. Vehicles are bucketed into Make x Vehicle Type x Model Year cube
+# cells, each holding a HyperLogLog sketch of its cities and log-binned histograms of price
+# and range. Both sketches merge exactly (register max / bin sum), so a filtered query is a
+# merge over the selected cells instead of a pass over the rows.
+SKETCH_HLL_PRECISION = 10  # 1,024 registers, ~3.3% standard error
+SKETCH_RELATIVE_ACCURACY = 0.01  # quantile bins guarantee 1% relative error
+SKETCH_QUANTILE_COLUMNS = ['Base MSRP', 'Electric Range']
+SKETCH_FULL_QUERY = {'makes': None, 'types': None, 'years': None}
+
+
+def mix64(values):
+    """SplitMix64 finalizer: well-distributed 64-bit hashes of integer codes"""
+    hashes = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    hashes = (hashes ^ (hashes >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    hashes = (hashes ^ (hashes >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return hashes ^ (hashes >> np.uint64(31))
+
+
+def hll_registers(cell_ids, hashes, n_cells):
+    """HyperLogLog registers per cell: max leading-zero rank of the hashes in each bucket"""
+    p = SKETCH_HLL_PRECISION
+    buckets = (hashes >> np.uint64(64 - p)).astype(np.int64)
+    # Rank of the first set bit after the bucket bits; the top 53 bits convert to float exactly
+    remainder = (hashes << np.uint64(p)) >> np.uint64(11)
+    bit_length = np.frexp(remainder.astype(np.float64))[1]
+    ranks = (54 - bit_length).astype(np.uint8)
+    registers = np.zeros(n_cells << p, dtype=np.uint8)
+    np.maximum.at(registers, (cell_ids << p) + buckets, ranks)
+    return registers.reshape(n_cells, 1 << p)
+
+
+def hll_estimate(registers):
+    """Distinct-count estimate from merged HyperLogLog registers"""
+    m = len(registers)
+    estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(np.exp2(-registers.astype(np.float64)))
+    empty = int((registers == 0).sum())
+    if estimate <= 2.5 * m and empty:
+        estimate = m * np.log(m / empty)  # linear counting for small cardinalities
+    return estimate
+
+
+def log_histograms(cell_ids, values, n_cells):
+    """Per-cell counts over logarithmic bins of width (1 + a) / (1 - a)"""
+    gamma = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+    bins = np.ceil(np.log(values) / np.log(gamma)).astype(np.int64)
+    offset = bins.min() if len(bins) else 0
+    n_bins = int(bins.max() - offset + 1) if len(bins) else 1
+    counts = np.bincount(cell_ids * n_bins + (bins - offset), minlength=n_cells * n_bins)
+    return {'counts': counts.reshape(n_cells, n_bins).astype(np.int32), 'offset': offset, 'gamma': gamma}
+
+
+@st.cache_resource
+def build_sketch_cube(_df, dataset_version):
+    """Mergeable city and quantile sketches for every Make x Vehicle Type x Model Year cell"""
+    facets = build_facet_codes(_df, dataset_version)
+    make_codes = facets['Make']['codes'].astype(np.int64)
+    type_codes = facets['Electric Vehicle Type']['codes'].astype(np.int64)
+    years = _df['Model Year'].to_numpy().astype(np.int64)
+    first_year = years.min()
+    n_types = len(facets['Electric Vehicle Type']['options'])
+    n_years = years.max() - first_year + 1
+
+    cell_keys, cell_ids = np.unique((make_codes * n_types + type_codes) * n_years + (years - first_year),
+                                    return_inverse=True)
+    cube = {
+        'make': cell_keys // (n_types * n_years),
+        'type': cell_keys // n_years % n_types,
+        'year': cell_keys % n_years + first_year,
+    }
+    if 'City' in _df.columns:
+        city_codes, _ = pd.factorize(_df['City'])
+        known = city_codes >= 0
+        cube['City'] = hll_registers(cell_ids[known], mix64(city_codes[known]), len(cell_keys))
+    for column in SKETCH_QUANTILE_COLUMNS:
+        if column in _df.columns:
+            values = _df[column].to_numpy(dtype='float64')
+            known = values > 0
+            cube[column] = log_histograms(cell_ids[known], values[known], len(cell_keys))
+    return cube
+
+
+def sketch_cells(cube, query):
+    """Cube cells covered by a Make / Vehicle Type / Model Year query"""
+    cells = np.ones(len(cube['make']), dtype=bool)
+    if query['makes'] is not None:
+        cells &= np.isin(cube['make'], query['makes'])
+    if query['types'] is not None:
+        cells &= np.isin(cube['type'], query['types'])
+    if query['years'] is not None:
+        cells &= (cube['year'] >= query['years'][0]) & (cube['year'] <= query['years'][1])
+    return cells
+
+
+def sketch_estimate(statistic, column, query=None):
+    """Approximate distinct count or quantile merged from the sketch cube.
+
+    Returns None when approximate mode is off or the active filters cut across the cube
+    (county, location, price, range or CAFV), so the caller computes the exact value.
+    """
+    query = st.session_state.get('sketch_query') if query is None else query
+    if not st.session_state.get('approx_mode') or query is None:
+        return None
+    cube = build_sketch_cube(st.session_state.df, st.session_state.dataset_version)
+    if column not in cube:
+        return None
+    cells = sketch_cells(cube, query)
+    if not cells.any():
+        return None
+    if statistic == 'distinct':
+        return {'value': hll_estimate(cube[column][cells].max(axis=0)),
+                'error': 1.04 / np.sqrt(1 << SKETCH_HLL_PRECISION)}
+
+    histogram = cube[column]
+    counts = histogram['counts'][cells].sum(axis=0)
+    if counts.sum() == 0:
+        return None
+    rank = np.searchsorted(np.cumsum(counts), statistic * (counts.sum() - 1) + 1)
+    gamma = histogram['gamma']
+    value = 2 * gamma ** (rank + histogram['offset']) / (gamma + 1)
+    return {'value': value, 'error': SKETCH_RELATIVE_ACCURACY}
+
+
+def format_sketch_error(estimate):
+    """Caption text for an approximate value"""
+    return f"Approximate: ±{estimate['error']:.1%} relative error"
+
+
+def get_filter_signature(filter_state):
+    """Stable short hash of the applied filter state"""
+    encoded = json.dumps(filter_state, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode()).hexdigest()[:16]
+
+
+# Helper functions for calculations
+def calculate_growth_rate(df):
+    """Calculate year-over-year growth rate"""
+    if 'Model Year' not in df.columns or len(df) < 2:
+        return None
+
+    yearly_counts = get_make_year_matrix(df)['matrix'].sum(axis=0)
+    yearly_counts = yearly_counts[yearly_counts > 0]
+    if len(yearly_counts) < 2:
+        return None
+
+    return ((yearly_counts[-1] - yearly_counts[-2]) / yearly_counts[-2]) * 100
+
+
+def calculate_price_trend(df):
+    """Calculate price trend"""
+    if 'Base MSRP' not in df.columns or 'Model Year' not in df.columns:
+        return None
+
+    yearly_prices = df.groupby('Model Year')['Base MSRP'].mean().dropna()
+    if len(yearly_prices) < 2:
+        return None
+
+    return ((yearly_prices.iloc[-1] - yearly_prices.iloc[-2]) / yearly_prices.iloc[-2]) * 100
+
+
+def calculate_range_trend(df):
+    """Calculate range trend"""
+    if 'Model Year' not in df.columns:
+        return None
+
+    yearly_ranges = df.groupby('Model Year')['Electric Range'].mean()
+    if len(yearly_ranges) < 2:
+        return None
+
+    return ((yearly_ranges.iloc[-1] - yearly_ranges.iloc[-2]) / yearly_ranges.iloc[-2]) * 100
+
+
+def calculate_market_concentration(df):
+    """Calculate market concentration (HHI)"""
+    if 'Make' not in df.columns:
+        return 0
+
+    market_shares = df['Make'].value_counts(normalize=True)
+    hhi = (market_shares ** 2).sum() * 100
+    return hhi
+
+
+def calculate_range_improvement(df):
+    """Calculate overall range improvement over time"""
+    if 'Model Year' not in df.columns or len(df) < 2:
+        return None
+
+    yearly_avg = df.groupby('Model Year')['Electric Range'].mean()
+    if len(yearly_avg) < 2:
+        return None
+
+    first_year_avg = yearly_avg.iloc[0]
+    last_year_avg = yearly_avg.iloc[-1]
+
+    return ((last_year_avg - first_year_avg) / first_year_avg) * 100
+
+
+def calculate_fastest_growing_make(df):
+    """Calculate fastest growing make year over year"""
+    if 'Model Year' not in df.columns or len(df) < 50:
+        return None
+
+    # Get last two years of data from the Make x Model Year matrix
+    make_year = get_make_year_matrix(df)
+    active_years = np.flatnonzero(make_year['matrix'].sum(axis=0) > 0)
+    if len(active_years) < 2:
+        return None
+
+    recent_counts = make_year['matrix'][:, active_years[-1]]
+    previous_counts = make_year['matrix'][:, active_years[-2]]
+
+    eligible = (previous_counts > 0) & (recent_counts >= 5)  # Minimum volume threshold
+    if not eligible.any():
+        return None
+
+    growth = np.full(len(recent_counts), -np.inf)
+    growth[eligible] = (recent_counts[eligible] - previous_counts[eligible]) / previous_counts[eligible] * 100
+    fastest = int(np.argmax(growth))
+    return make_year['makes'][fastest], growth[fastest]
@@ -0,0 +1,273 @@
+"""Dataset loading, column selection and cleaning."""
+
+import hashlib
+import json
+import logging
+import os
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # without pyarrow every process parses the CSV itself
+    pa = None
+
+
+# Column usage registry: which dataset columns each page and the sidebar filters read.
+# load_data only reads the union of these, so unused DOL columns (VIN, State, Legislative
+# District, Electric Utility, DOL Vehicle ID) never reach memory.
+COLUMN_USAGE = {
+    "filters": ['Model Year', 'Make', 'Electric Vehicle Type', 'Electric Range', 'Base MSRP', 'County',
+                'Clean Alternative Fuel Vehicle (CAFV) Eligibility'],
+    "home": ['Make', 'Base MSRP', 'Electric Range', 'County'],
+    "overview": ['Model Year', 'Make', 'Model', 'Electric Vehicle Type', 'Electric Range', 'Base MSRP', 'County'],
+    "price": ['Model Year', 'Make', 'Electric Vehicle Type', 'Electric Range', 'Base MSRP'],
+    "geographic": ['County', 'City', 'Postal Code', '2020 Census Tract', 'Electric Vehicle Type',
+                   'Electric Range', 'Base MSRP', 'Vehicle Location'],
+    "performance": ['Model Year', 'Make', 'Model', 'Electric Vehicle Type', 'Electric Range'],
+    "leaders": ['Model Year', 'Make', 'Model', 'Electric Range', 'Base MSRP'],
+    "distribution": ['Electric Vehicle Type', 'Electric Range'],
+    "pie": ['Electric Vehicle Type', 'Make'],
+    "boxplot": ['Make', 'Electric Vehicle Type', 'Electric Range'],
+    "heatmap": ['Model Year', 'Make', 'Electric Vehicle Type', 'Electric Range', 'Base MSRP'],
+    "trends": ['Model Year', 'Make', 'Electric Vehicle Type', 'Electric Range'],
+}
+
+
+def get_required_columns():
+    """Return the union of columns used by any page or filter"""
+    return sorted({col for cols in COLUMN_USAGE.values() for col in cols})
+
+
+def downcast_numeric_columns(df):
+    """Downcast numeric columns to the smallest dtype that holds their values exactly"""
+    for col in df.select_dtypes(include='integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in df.select_dtypes(include='float').columns:
+        values = df[col]
+        if values.notna().all() and (values % 1 == 0).all():
+            df[col] = pd.to_numeric(values.astype('int64'), downcast='integer')
+            continue
+        as_float32 = values.astype('float32')
+        # Only keep float32 when the round trip is lossless (e.g. whole-dollar prices)
+        if ((as_float32.astype('float64') == values) | values.isna()).all():
+            df[col] = as_float32
+    return df
+
+
+def get_memory_footprint(df):
+    """Return the in-memory size of a dataframe in megabytes"""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def parse_points(values):
+    """Parse WKT "POINT (lon lat)" strings into float32 longitude and latitude arrays"""
+    coords = pd.Series(values, dtype='object').str.extract(r'POINT \(\s*(\S+)\s+(\S+)\s*\)')
+    # float32 keeps roughly metre-level precision at Washington's latitudes
+    longitude = pd.to_numeric(coords[0], errors='coerce').to_numpy(dtype='float32')
+    latitude = pd.to_numeric(coords[1], errors='coerce').to_numpy(dtype='float32')
+    return longitude, latitude
+
+
+# Cleaning rules in the order they are checked. A row is rejected under the first rule it
+# fails. A missing or zero MSRP is not a rejection: those rows are kept and only the price
+# analytics exclude them.
+CLEANING_RULES = {
+    1: "Missing required field",
+    2: "Invalid model year",
+    3: "Missing or zero electric range",
+}
+REQUIRED_COLUMNS = ['Model Year', 'Make', 'Electric Vehicle Type', 'Electric Range']
+PRICE_BINS = [0, 30000, 50000, 80000, float('inf')]
+PRICE_LABELS = ['Budget (<$30K)', 'Mid-Range ($30K-$50K)', 'Premium ($50K-$80K)', 'Luxury ($80K+)']
+RANGE_BINS = [0, 100, 200, 300, float('inf')]
+RANGE_LABELS = ['Short (<100mi)', 'Medium (100-200mi)', 'Long (200-300mi)', 'Ultra (300mi+)']
+
+
+def title_case(values):
+    """Title-case a string column by converting each distinct value once"""
+    codes, uniques = pd.factorize(values)
+    # Missing values get code -1, which picks the trailing NaN
+    titled = np.append(pd.Index(uniques).str.title().to_numpy(dtype=object), np.nan)
+    return titled[codes]
+
+
+def clean_data(raw):
+    """Validate the raw dataset with one combined mask and build the cleaned frame once
+
+    Returns the cleaned dataframe and a report of how many rows each rule rejected.
+    """
+    model_year = pd.to_numeric(raw['Model Year'], errors='coerce').to_numpy(dtype='float64')
+    electric_range = pd.to_numeric(raw['Electric Range'], errors='coerce').to_numpy(dtype='float64')
+
+    # Reason code per row: 0 keeps the row, otherwise the first failing rule
+    reasons = np.select(
+        [
+            raw[REQUIRED_COLUMNS].isna().any(axis=1).to_numpy(),
+            np.isnan(model_year),
+            ~(electric_range > 0),
+        ],
+        list(CLEANING_RULES),
+        default=0
+    )
+    keep = reasons == 0
+
+    cleaned = {col: raw[col].array[keep] for col in raw.columns}
+    cleaned['Model Year'] = model_year[keep].astype('int64')
+    cleaned['Electric Range'] = electric_range[keep]
+    cleaned['Range_Category'] = pd.cut(cleaned['Electric Range'], bins=RANGE_BINS, labels=RANGE_LABELS)
+
+    unpriced = 0
+    if 'Base MSRP' in raw.columns:
+        msrp = pd.to_numeric(raw['Base MSRP'], errors='coerce').to_numpy(dtype='float64')[keep]
+        msrp[~(msrp > 0)] = np.nan  # The DOL file uses 0 for "no published MSRP"
+        unpriced = int(np.isnan(msrp).sum())
+        cleaned['Base MSRP'] = msrp
+        cleaned['Price_Category'] = pd.cut(msrp, bins=PRICE_BINS, labels=PRICE_LABELS)
+
+    # Geographic processing
+    for col in ['County', 'City']:
+        if col in cleaned:
+            cleaned[col] = title_case(cleaned[col])
+    if 'Vehicle Location' in cleaned:
+        cleaned['Longitude'], cleaned['Latitude'] = parse_points(cleaned.pop('Vehicle Location'))
+
+    df = pd.DataFrame(cleaned)
+
+    rejected = np.bincount(reasons, minlength=len(CLEANING_RULES) + 1)
+    report = {"Rows read": len(raw)}
+    for code, rule in CLEANING_RULES.items():
+        report[rule] = int(rejected[code])
+    report["Rows kept"] = int(keep.sum())
+    report["Kept without MSRP"] = unpriced
+    return df, report
+
+
+# Data Loading and Caching
+# EV_DATA_PATH points the app at another copy of the file (load tests use a synthetic one)
+DATA_PATH = os.environ.get("EV_DATA_PATH", "data/electric_vehicle_population.csv")
+
+
+def get_dataset_version():
+    """Identify the current dataset file so data and derived indexes are cached per version"""
+    try:
+        stat = os.stat(DATA_PATH)
+    except FileNotFoundError:
+        return "missing"
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+# Cleaned datasets published as uncompressed Arrow IPC files, one per dataset version.
+# Every server process on the host maps the same file read-only, so the OS page cache holds
+# one copy of the data however many processes serve it.
+SHARED_DATASET_DIR = os.path.join(os.path.dirname(DATA_PATH), "shared")
+# Bump whenever clean_data or downcast_numeric_columns change the frame they produce, so
+# files published by older code are not mapped after a deploy
+CLEANING_SCHEMA_VERSION = 1
+# Columns clean_data derives from the CSV ('Vehicle Location' becomes Longitude/Latitude)
+DERIVED_COLUMNS = ['Range_Category', 'Price_Category', 'Longitude', 'Latitude']
+
+
+def get_dataset_schema():
+    """Identify the cleaning code and column projection a published dataset was built with"""
+    encoded = json.dumps([CLEANING_SCHEMA_VERSION, get_required_columns()])
+    return hashlib.sha1(encoded.encode()).hexdigest()[:12]
+
+
+def shared_dataset_path(dataset_version):
+    """Path of the published Arrow file for a dataset version and the current schema"""
+    return os.path.join(SHARED_DATASET_DIR, f"ev-{dataset_version}-{get_dataset_schema()}.arrow")
+
+
+def matches_schema(table):
+    """Whether a mapped table was published with the current schema and has its columns"""
+    metadata = table.schema.metadata or {}
+    if metadata.get(b'dataset_schema') != get_dataset_schema().encode():
+        return False
+    expected = set(get_required_columns()) - {'Vehicle Location'} | set(DERIVED_COLUMNS)
+    columns = set(table.column_names)
+    return columns <= expected and set(REQUIRED_COLUMNS + ['Range_Category']) <= columns
+
+
+def publish_shared_dataset(df, report, dataset_version):
+    """Write the cleaned dataset (and its cleaning report) for other processes to map"""
+    path = shared_dataset_path(dataset_version)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **table.schema.metadata, b'cleaning_report': json.dumps(report, default=int).encode(),
+        b'dataset_schema': get_dataset_schema().encode(),
+    })
+    os.makedirs(SHARED_DATASET_DIR, exist_ok=True)
+    # Write under a per-process name and rename, so readers never map a partial file
+    partial_path = f"{path}.{os.getpid()}.partial"
+    with pa.OSFile(partial_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(partial_path, path)
+    # Unlinking older versions is safe for processes that still have them mapped
+    for name in os.listdir(SHARED_DATASET_DIR):
+        if name.endswith(".arrow") and name != os.path.basename(path):
+            try:
+                os.remove(os.path.join(SHARED_DATASET_DIR, name))
+            except OSError:
+                pass
+
+
+def open_shared_dataset(dataset_version):
+    """Map a published dataset read-only, or None when there is none for this version.
+
+    Numeric and string columns stay zero-copy views of the mapped file; only columns with
+    missing values and the categoricals are materialized per process.
+    """
+    path = shared_dataset_path(dataset_version)
+    if pa is None or not os.path.exists(path):
+        return None
+    try:
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if not matches_schema(table):
+        logging.getLogger(__name__).warning("Ignoring %s: it does not match the current dataset schema", path)
+        return None
+    report = json.loads(table.schema.metadata.get(b'cleaning_report', b'{}'))
+    return table.to_pandas(split_blocks=True), report
+
+
+def parse_dataset():
+    """Read and clean the dataset CSV"""
+    required_columns = set(get_required_columns())
+    raw = pd.read_csv(DATA_PATH, usecols=lambda col: col in required_columns)
+    df, report = clean_data(raw)
+    return downcast_numeric_columns(df), report
+
+
+@st.cache_resource(ttl=3600)
+def load_data(dataset_version):
+    """Load and preprocess the WA State EV dataset.
+
+    One dataframe per process, shared read-only by every session: mapped from the host's
+    published Arrow file when one exists, otherwise parsed from the CSV and published.
+    """
+    shared = open_shared_dataset(dataset_version)
+    if shared is not None:
+        return shared
+    try:
+        df, report = parse_dataset()
+    except FileNotFoundError:
+        st.error("Dataset not found. Please ensure the WA State EV data is available.")
+        return pd.DataFrame(), {}
+    if pa is None:
+        return df, report
+    try:
+        publish_shared_dataset(df, report, dataset_version)
+    except (OSError, pa.ArrowException):
+        logging.getLogger(__name__).exception("Could not publish the shared dataset file")
+        return df, report
+    return open_shared_dataset(dataset_version) or (df, report)
+
+
+def has_price_data(df):
+    """Check whether any vehicle in the dataset has a published MSRP"""
+    return 'Base MSRP' in df.columns and df['Base MSRP'].notna().any()
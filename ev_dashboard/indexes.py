@@ -0,0 +1,592 @@
+"""Per-dataset indexes behind the filters and aggregate views: range index, facet codes,
+map grid, spatial index and the geographic and vehicle hierarchies."""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from ev_dashboard.result_store import persistent_result
+
+
+# Range index for the numeric sliders. Each column is sorted once per vehicle type with
+# prefix sums of MSRP and range, so any [low, high] count or mean takes two binary searches.
+RANGE_INDEX_COLUMNS = ['Model Year', 'Base MSRP', 'Electric Range']
+
+
+def prefix_sum(values):
+    """Cumulative sum with a leading zero, so sum(values[i:j]) == result[j] - result[i]"""
+    return np.concatenate([[0], np.cumsum(values, dtype='float64')])
+
+
+@st.cache_resource
+def build_range_index(_df, dataset_version):
+    """Build the per-type sorted value arrays and prefix sums for the slider columns"""
+    ev_types = _df['Electric Vehicle Type'].to_numpy()
+    electric_range = _df['Electric Range'].to_numpy(dtype='float64')
+    if 'Base MSRP' in _df.columns:
+        msrp = _df['Base MSRP'].to_numpy(dtype='float64')
+    else:
+        msrp = np.full(len(_df), np.nan)
+
+    index = {}
+    for column in RANGE_INDEX_COLUMNS:
+        if column not in _df.columns:
+            continue
+        values = _df[column].to_numpy(dtype='float64')
+        index[column] = {}
+        for ev_type in pd.unique(ev_types):
+            rows = np.flatnonzero((ev_types == ev_type) & ~np.isnan(values))
+            order = rows[np.argsort(values[rows], kind='stable')]
+            priced = ~np.isnan(msrp[order])
+            index[column][ev_type] = {
+                'values': values[order],
+                'msrp_sum': prefix_sum(np.where(priced, msrp[order], 0)),
+                'msrp_count': prefix_sum(priced),
+                'range_sum': prefix_sum(electric_range[order]),
+            }
+    return index
+
+
+def query_range_index(range_index, column, value_range, ev_types):
+    """Count vehicles of the given types with column inside value_range, plus their averages"""
+    count = msrp_sum = msrp_count = range_sum = 0
+    for ev_type in ev_types:
+        entry = range_index.get(column, {}).get(ev_type)
+        if entry is None:
+            continue
+        start = np.searchsorted(entry['values'], value_range[0], side='left')
+        stop = np.searchsorted(entry['values'], value_range[1], side='right')
+        count += stop - start
+        msrp_sum += entry['msrp_sum'][stop] - entry['msrp_sum'][start]
+        msrp_count += entry['msrp_count'][stop] - entry['msrp_count'][start]
+        range_sum += entry['range_sum'][stop] - entry['range_sum'][start]
+
+    return {
+        'count': int(count),
+        'avg_price': msrp_sum / msrp_count if msrp_count else None,
+        'avg_range': range_sum / count if count else None,
+    }
+
+
+# Faceted filtering for the multiselects. Each column is integer-encoded once per dataset
+# version, so option lists, selection masks and per-option counts are array lookups.
+FACET_COLUMNS = ['County', 'Make', 'Electric Vehicle Type']
+CAFV_COLUMN = 'Clean Alternative Fuel Vehicle (CAFV) Eligibility'
+
+
+@st.cache_resource
+def build_facet_codes(_df, dataset_version):
+    """Integer-encode the multiselect columns and cache their sorted option vocabularies"""
+    facets = {}
+    for column in FACET_COLUMNS:
+        if column not in _df.columns:
+            continue
+        codes, options = pd.factorize(_df[column], sort=True)
+        options = options.tolist()
+        facets[column] = {
+            'codes': codes,
+            'options': options,
+            'positions': {option: position for position, option in enumerate(options)},
+        }
+    return facets
+
+
+def validate_selection(facet, selected):
+    """Keep only the selected options that exist in the facet vocabulary"""
+    return [option for option in selected if option in facet['positions']]
+
+
+def active_selection(facet, selected):
+    """Sorted selection, or None when it does not restrict rows (empty or every option)"""
+    if not selected or len(set(selected)) == len(facet['options']):
+        return None
+    return sorted(selected)
+
+
+def selection_mask(facet, selected):
+    """Row mask for a multiselect; an empty or complete selection does not restrict rows"""
+    if not selected or len(set(selected)) == len(facet['options']):
+        return None
+    lookup = np.zeros(len(facet['options']) + 1, dtype=bool)
+    lookup[[facet['positions'][option] for option in selected]] = True
+    # Missing values have code -1 and land on the trailing False
+    return lookup[facet['codes']]
+
+
+def numeric_filter_mask(df, year_range, range_filter, price_filter=None, cafv_eligible=False):
+    """Row mask for the slider and checkbox filters"""
+    years = df['Model Year'].to_numpy()
+    ranges = df['Electric Range'].to_numpy()
+    mask = (years >= year_range[0]) & (years <= year_range[1]) & \
+           (ranges >= range_filter[0]) & (ranges <= range_filter[1])
+    if price_filter is not None:
+        prices = df['Base MSRP'].to_numpy()
+        mask &= (prices >= price_filter[0]) & (prices <= price_filter[1])
+    if cafv_eligible and CAFV_COLUMN in df.columns:
+        mask &= df[CAFV_COLUMN].notna().to_numpy()
+    return mask
+
+
+def combine_masks(masks, exclude=None):
+    """AND together the filter masks, optionally leaving one filter out"""
+    combined = None
+    for name, mask in masks.items():
+        if name == exclude or mask is None:
+            continue
+        combined = mask.copy() if combined is None else combined & mask
+    return combined
+
+
+def facet_counts(facet, mask):
+    """Vehicles per option that would match if that option were selected, via one bincount"""
+    codes = facet['codes'] if mask is None else facet['codes'][mask]
+    counts = np.bincount(codes[codes >= 0], minlength=len(facet['options']))
+    return dict(zip(facet['options'], counts.tolist()))
+
+
+# Spatial aggregation for the adoption map. Every vehicle gets a grid cell id at several
+# resolutions once per dataset version; a map view is then one bincount over the filtered rows.
+# Cell ids are renumbered over the occupied cells only, so a few mis-geocoded vehicles far
+# outside Washington do not stretch the grid (and every bincount) to millions of empty cells.
+MAP_CELL_SIZES = [0.64, 0.32, 0.16, 0.08, 0.04, 0.02, 0.01]  # degrees, coarse to fine
+MAX_MAP_CELLS = 3000
+
+
+@st.cache_resource
+def build_grid_index(_df, dataset_version):
+    """Assign each vehicle to a grid cell at every map resolution"""
+    if 'Longitude' not in _df.columns:
+        return None
+
+    longitude = _df['Longitude'].to_numpy(dtype='float64')
+    latitude = _df['Latitude'].to_numpy(dtype='float64')
+    located = ~(np.isnan(longitude) | np.isnan(latitude))
+    if not located.any():
+        return None
+    origin = (longitude[located].min(), latitude[located].min())
+
+    levels = []
+    for cell_size in MAP_CELL_SIZES:
+        columns = np.floor((longitude[located] - origin[0]) / cell_size).astype('int64')
+        rows = np.floor((latitude[located] - origin[1]) / cell_size).astype('int64')
+        n_columns = int(columns.max()) + 1
+        grid_cells, dense_cells = np.unique(rows * n_columns + columns, return_inverse=True)
+        cells = np.full(len(_df), -1, dtype='int32')
+        cells[located] = dense_cells
+        levels.append({'cell_size': cell_size, 'n_columns': n_columns, 'grid_cells': grid_cells, 'cells': cells})
+
+    # Bounding boxes used to zoom the map to a single county
+    county_bounds = {}
+    if 'County' in _df.columns:
+        located_df = pd.DataFrame({
+            'County': _df['County'].to_numpy()[located],
+            'Longitude': longitude[located],
+            'Latitude': latitude[located],
+        })
+        bounds = located_df.groupby('County').agg(['min', 'max'])
+        for county, row in bounds.iterrows():
+            county_bounds[county] = (row[('Longitude', 'min')], row[('Latitude', 'min')],
+                                     row[('Longitude', 'max')], row[('Latitude', 'max')])
+
+    return {'origin': origin, 'levels': levels, 'county_bounds': county_bounds}
+
+
+def grid_cell_counts(grid_index, level, rows, bounds=None):
+    """Vehicles per non-empty grid cell for the given rows, optionally clipped to a bounding box"""
+    level_index = grid_index['levels'][level]
+    cells = level_index['cells'][rows]
+    counts = np.bincount(cells[cells >= 0], minlength=len(level_index['grid_cells']))
+    occupied = np.flatnonzero(counts)
+    grid_cells = level_index['grid_cells'][occupied]
+
+    cell_size = level_index['cell_size']
+    longitude = grid_index['origin'][0] + (grid_cells % level_index['n_columns'] + 0.5) * cell_size
+    latitude = grid_index['origin'][1] + (grid_cells // level_index['n_columns'] + 0.5) * cell_size
+    cell_counts = pd.DataFrame({'Longitude': longitude, 'Latitude': latitude, 'Count': counts[occupied]})
+
+    if bounds is not None:
+        min_lon, min_lat, max_lon, max_lat = bounds
+        cell_counts = cell_counts[
+            cell_counts['Longitude'].between(min_lon - cell_size, max_lon + cell_size) &
+            cell_counts['Latitude'].between(min_lat - cell_size, max_lat + cell_size)
+            ]
+    return cell_counts
+
+
+def auto_map_level(grid_index, rows, bounds=None):
+    """Pick the finest resolution that keeps the map under MAX_MAP_CELLS cells"""
+    level = 0
+    for candidate in range(len(grid_index['levels'])):
+        if len(grid_cell_counts(grid_index, candidate, rows, bounds)) > MAX_MAP_CELLS:
+            break
+        level = candidate
+    return level
+
+
+# Spatial index for location filters: vehicles are bucketed into a coarse grid and stored
+# sorted by cell, so a radius or bounding-box query only inspects the cells it overlaps.
+SPATIAL_CELL_SIZE = 0.05  # degrees, roughly 3 miles
+CUSTOM_CENTER = "Custom coordinates"
+
+
+@st.cache_resource
+def build_spatial_index(_df, dataset_version):
+    """Bucket located vehicles into grid cells and store row positions sorted by cell"""
+    if 'Longitude' not in _df.columns:
+        return None
+
+    longitude = _df['Longitude'].to_numpy(dtype='float64')
+    latitude = _df['Latitude'].to_numpy(dtype='float64')
+    located = np.flatnonzero(~(np.isnan(longitude) | np.isnan(latitude)))
+    if len(located) == 0:
+        return None
+
+    origin = (longitude[located].min(), latitude[located].min())
+    columns = ((longitude[located] - origin[0]) // SPATIAL_CELL_SIZE).astype('int64')
+    rows = ((latitude[located] - origin[1]) // SPATIAL_CELL_SIZE).astype('int64')
+    n_columns, n_rows = int(columns.max()) + 1, int(rows.max()) + 1
+    cells = rows * n_columns + columns
+
+    # City centroids give planners a quick way to center a radius search
+    city_centers = {}
+    if 'City' in _df.columns:
+        centers = pd.DataFrame({
+            'City': _df['City'].to_numpy()[located],
+            'Longitude': longitude[located],
+            'Latitude': latitude[located],
+        }).groupby('City').median()
+        city_centers = {city: (row['Longitude'], row['Latitude']) for city, row in centers.iterrows()}
+
+    return {
+        'origin': origin,
+        'n_columns': n_columns,
+        'n_rows': n_rows,
+        'order': located[np.argsort(cells, kind='stable')],
+        'cell_starts': prefix_sum(np.bincount(cells, minlength=n_rows * n_columns)).astype('int64'),
+        'longitude': longitude,
+        'latitude': latitude,
+        'bounds': (longitude[located].min(), latitude[located].min(),
+                   longitude[located].max(), latitude[located].max()),
+        'city_centers': city_centers,
+    }
+
+
+def query_bbox(spatial_index, min_lon, min_lat, max_lon, max_lat):
+    """Sorted row positions of vehicles inside a bounding box"""
+    origin = spatial_index['origin']
+    first_column = max(int((min_lon - origin[0]) // SPATIAL_CELL_SIZE), 0)
+    last_column = min(int((max_lon - origin[0]) // SPATIAL_CELL_SIZE), spatial_index['n_columns'] - 1)
+    first_row = max(int((min_lat - origin[1]) // SPATIAL_CELL_SIZE), 0)
+    last_row = min(int((max_lat - origin[1]) // SPATIAL_CELL_SIZE), spatial_index['n_rows'] - 1)
+    if first_column > last_column or first_row > last_row:
+        return np.array([], dtype='int64')
+
+    # Cells in one grid row are contiguous in the sorted order, so each row is one slice
+    starts = spatial_index['cell_starts']
+    candidates = np.concatenate([
+        spatial_index['order'][starts[row * spatial_index['n_columns'] + first_column]:
+                               starts[row * spatial_index['n_columns'] + last_column + 1]]
+        for row in range(first_row, last_row + 1)
+    ])
+    longitude = spatial_index['longitude'][candidates]
+    latitude = spatial_index['latitude'][candidates]
+    inside = (longitude >= min_lon) & (longitude <= max_lon) & (latitude >= min_lat) & (latitude <= max_lat)
+    return np.sort(candidates[inside])
+
+
+def query_radius(spatial_index, center_lon, center_lat, radius_miles):
+    """Sorted row positions of vehicles within radius_miles of a point"""
+    lat_delta = radius_miles / 69.0
+    lon_delta = radius_miles / (69.0 * max(np.cos(np.radians(center_lat)), 0.01))
+    candidates = query_bbox(spatial_index, center_lon - lon_delta, center_lat - lat_delta,
+                            center_lon + lon_delta, center_lat + lat_delta)
+
+    # Haversine distance on the bounding-box candidates only
+    lon1, lat1 = np.radians(center_lon), np.radians(center_lat)
+    lon2 = np.radians(spatial_index['longitude'][candidates])
+    lat2 = np.radians(spatial_index['latitude'][candidates])
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    distance = 2 * 3958.8 * np.arcsin(np.sqrt(a))
+    return candidates[distance <= radius_miles]
+
+
+def rows_to_mask(rows, n_rows):
+    """Turn a row selection into a boolean mask (None means no restriction)"""
+    if rows is None:
+        return None
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[rows] = True
+    return mask
+
+
+# Hierarchical geographic rollups (County > City > Postal Code > Census Tract). Every vehicle
+# is assigned to a leaf of the tree once per dataset version; totals for any level under any
+# filter are a bincount over leaf ids followed by a rollup over the (small) leaf table.
+GEO_LEVELS = ['County', 'City', 'Postal Code', '2020 Census Tract']
+UNKNOWN_LABEL = "Unknown"
+
+
+def format_geo_labels(values):
+    """Readable labels for a geographic level (numeric codes without decimals, Unknown for missing)"""
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values):
+        labels = values.round().astype('Int64').astype('string')
+    else:
+        labels = values.astype('string')
+    return labels.fillna(UNKNOWN_LABEL).astype(object).to_numpy()
+
+
+@st.cache_resource
+def build_geo_tree(_df, dataset_version):
+    """Build the leaf table, per-level node ids and precomputed unfiltered aggregates"""
+    levels = []
+    for level in GEO_LEVELS:
+        if level not in _df.columns:
+            break
+        levels.append(level)
+    if not levels:
+        return None
+
+    grouped = _df.groupby(levels, dropna=False, sort=True)
+    leaf_ids = grouped.ngroup().to_numpy()
+    leaf_paths = grouped.size().index.to_frame(index=False)
+    for level in levels:
+        leaf_paths[level] = format_geo_labels(leaf_paths[level])
+
+    # Node ids of every leaf's ancestor at each level, plus that level's node labels
+    node_ids, node_labels = [], []
+    for depth in range(len(levels)):
+        prefix = leaf_paths[levels[:depth + 1]]
+        node_grouping = prefix.groupby(levels[:depth + 1], sort=False)
+        node_ids.append(node_grouping.ngroup().to_numpy())
+        node_labels.append(node_grouping.size().index.to_frame(index=False))
+
+    # Per-row values summed at each node: count, one column per vehicle type, MSRP and range
+    ev_types = sorted(_df['Electric Vehicle Type'].dropna().unique().tolist())
+    type_values = _df['Electric Vehicle Type'].to_numpy()
+    msrp = _df['Base MSRP'].to_numpy(dtype='float64') if 'Base MSRP' in _df.columns else np.full(len(_df), np.nan)
+    row_values = np.column_stack(
+        [np.ones(len(_df))] +
+        [type_values == ev_type for ev_type in ev_types] +
+        [np.nan_to_num(msrp), ~np.isnan(msrp), _df['Electric Range'].to_numpy(dtype='float64')]
+    ).astype('float32')
+
+    geo_tree = {
+        'levels': levels,
+        'ev_types': ev_types,
+        'leaf_ids': leaf_ids,
+        'n_leaves': len(leaf_paths),
+        'node_ids': node_ids,
+        'node_labels': node_labels,
+        'row_values': row_values,
+    }
+    geo_tree['leaf_totals'] = geo_leaf_totals(geo_tree, None)
+    return geo_tree
+
+
+def geo_leaf_totals(geo_tree, rows):
+    """Sum the per-row values into tree leaves for the selected rows (None means every row)"""
+    if rows is None:
+        if 'leaf_totals' in geo_tree:
+            return geo_tree['leaf_totals']
+        rows = slice(None)
+    elif len(rows) == len(geo_tree['leaf_ids']):
+        return geo_tree['leaf_totals']
+
+    leaf_ids = geo_tree['leaf_ids'][rows]
+    values = geo_tree['row_values'][rows]
+    return np.column_stack([
+        np.bincount(leaf_ids, weights=values[:, column], minlength=geo_tree['n_leaves'])
+        for column in range(values.shape[1])
+    ])
+
+
+def geo_level_table(geo_tree, leaf_totals, depth, parent_path=()):
+    """Counts, type mix and MSRP/range averages for one level, optionally under a parent path"""
+    node_ids = geo_tree['node_ids'][depth]
+    n_nodes = len(geo_tree['node_labels'][depth])
+    sums = np.column_stack([
+        np.bincount(node_ids, weights=leaf_totals[:, column], minlength=n_nodes)
+        for column in range(leaf_totals.shape[1])
+    ])
+
+    n_types = len(geo_tree['ev_types'])
+    table = geo_tree['node_labels'][depth].copy()
+    table['Count'] = sums[:, 0].round().astype('int64')
+    for position, ev_type in enumerate(geo_tree['ev_types']):
+        table[ev_type] = sums[:, 1 + position].round().astype('int64')
+    priced = sums[:, 2 + n_types]
+    table['Avg MSRP'] = np.divide(sums[:, 1 + n_types], priced, out=np.full(n_nodes, np.nan), where=priced > 0)
+    table['Avg Range'] = np.divide(sums[:, 3 + n_types], sums[:, 0], out=np.full(n_nodes, np.nan),
+                                   where=sums[:, 0] > 0)
+
+    for level, label in zip(geo_tree['levels'], parent_path):
+        table = table[table[level] == label]
+    return table[table['Count'] > 0].sort_values('Count', ascending=False)
+
+
+# Vehicle hierarchy Make > Model > Model Year, built the same way as the geographic tree.
+# Leaves carry count, range and price stats plus a pointer to their longest-range row, so
+# drill-down tables and "longest range vehicle" lookups never rescan the rows.
+MODEL_LEVELS = ['Make', 'Model', 'Model Year']
+
+
+def group_argmax(groups, values, positions, n_groups):
+    """Index of the largest value in each group (ties go to the lowest position), -1 if empty"""
+    order = np.lexsort((-positions, values, groups))
+    last = np.flatnonzero(np.r_[groups[order][1:] != groups[order][:-1], True])
+    argmax = np.full(n_groups, -1, dtype=np.int64)
+    argmax[groups[order][last]] = order[last]
+    return argmax
+
+
+@st.cache_resource
+def build_model_tree(_df, dataset_version):
+    """Leaf ids, per-level node ids and labels, and unfiltered leaf stats for the vehicle hierarchy"""
+    levels = [level for level in MODEL_LEVELS if level in _df.columns]
+    if levels != MODEL_LEVELS:
+        return None
+
+    grouped = _df.groupby(levels, dropna=False, sort=True)
+    leaf_paths = grouped.size().index.to_frame(index=False)
+    for level in levels:
+        leaf_paths[level] = format_geo_labels(leaf_paths[level])
+
+    node_ids, node_labels = [], []
+    for depth in range(len(levels)):
+        node_grouping = leaf_paths[levels[:depth + 1]].groupby(levels[:depth + 1], sort=False)
+        node_ids.append(node_grouping.ngroup().to_numpy())
+        node_labels.append(node_grouping.size().index.to_frame(index=False))
+
+    model_tree = {
+        'levels': levels,
+        'leaf_ids': grouped.ngroup().to_numpy(),
+        'leaf_paths': leaf_paths,
+        'node_ids': node_ids,
+        'node_labels': node_labels,
+        'ranges': _df['Electric Range'].to_numpy(dtype='float64'),
+        'msrp': _df['Base MSRP'].to_numpy(dtype='float64') if 'Base MSRP' in _df.columns
+        else np.full(len(_df), np.nan),
+    }
+    model_tree['leaf_stats'] = summarize_model_leaves(model_tree, np.arange(len(_df)))
+    return model_tree
+
+
+def summarize_model_leaves(model_tree, rows):
+    """Per-leaf count, range sum/max, argmax row, and MSRP sum/count/min/max for the given rows"""
+    n_leaves = len(model_tree['leaf_paths'])
+    leaf_ids = model_tree['leaf_ids'][rows]
+    ranges = model_tree['ranges'][rows]
+    msrp = model_tree['msrp'][rows]
+    priced = ~np.isnan(msrp)
+
+    stats = {
+        'count': np.bincount(leaf_ids, minlength=n_leaves),
+        'range_sum': np.bincount(leaf_ids, weights=ranges, minlength=n_leaves),
+        'msrp_sum': np.bincount(leaf_ids[priced], weights=msrp[priced], minlength=n_leaves),
+        'msrp_count': np.bincount(leaf_ids[priced], minlength=n_leaves),
+        'msrp_min': np.full(n_leaves, np.inf),
+        'msrp_max': np.full(n_leaves, -np.inf),
+    }
+    np.minimum.at(stats['msrp_min'], leaf_ids[priced], msrp[priced])
+    np.maximum.at(stats['msrp_max'], leaf_ids[priced], msrp[priced])
+    argmax = group_argmax(leaf_ids, ranges, rows, n_leaves)
+    stats['argmax_row'] = np.where(argmax >= 0, rows[np.maximum(argmax, 0)], -1)
+    stats['range_max'] = np.where(argmax >= 0, ranges[np.maximum(argmax, 0)], -np.inf)
+    return stats
+
+
+@st.cache_data(max_entries=16)
+@persistent_result('model_leaf_stats')
+def model_leaf_stats(_model_tree, _rows, filter_signature, n_rows):
+    """Leaf stats for the filtered rows, reusing the unfiltered stats when nothing is filtered"""
+    if n_rows == len(_model_tree['leaf_ids']):
+        return _model_tree['leaf_stats']
+    return summarize_model_leaves(_model_tree, _rows)
+
+
+def get_model_leaf_stats(model_tree, filtered_df):
+    """Leaf stats of the vehicle hierarchy for the current filtered dataframe"""
+    rows = filtered_df.index.to_numpy()
+    return model_leaf_stats(model_tree, rows, st.session_state.filter_signature, len(rows))
+
+
+def model_level_table(model_tree, leaf_stats, depth, parent_path=()):
+    """Counts, range and price stats for one hierarchy level, optionally under a parent path"""
+    node_ids = model_tree['node_ids'][depth]
+    n_nodes = len(model_tree['node_labels'][depth])
+    counts = np.bincount(node_ids, weights=leaf_stats['count'], minlength=n_nodes)
+    range_sums = np.bincount(node_ids, weights=leaf_stats['range_sum'], minlength=n_nodes)
+    msrp_sums = np.bincount(node_ids, weights=leaf_stats['msrp_sum'], minlength=n_nodes)
+    msrp_counts = np.bincount(node_ids, weights=leaf_stats['msrp_count'], minlength=n_nodes)
+    msrp_min = np.full(n_nodes, np.inf)
+    msrp_max = np.full(n_nodes, -np.inf)
+    np.minimum.at(msrp_min, node_ids, leaf_stats['msrp_min'])
+    np.maximum.at(msrp_max, node_ids, leaf_stats['msrp_max'])
+    best_leaf = group_argmax(node_ids, leaf_stats['range_max'], leaf_stats['argmax_row'], n_nodes)
+
+    table = model_tree['node_labels'][depth].copy()
+    table['Count'] = counts.round().astype('int64')
+    table['Avg Range'] = np.divide(range_sums, counts, out=np.full(n_nodes, np.nan), where=counts > 0)
+    table['Max Range'] = leaf_stats['range_max'][best_leaf]
+    table['Avg MSRP'] = np.divide(msrp_sums, msrp_counts, out=np.full(n_nodes, np.nan), where=msrp_counts > 0)
+    table['Min MSRP'] = np.where(msrp_counts > 0, msrp_min, np.nan)
+    table['Max MSRP'] = np.where(msrp_counts > 0, msrp_max, np.nan)
+    table['Top Row'] = leaf_stats['argmax_row'][best_leaf]
+
+    for level, label in zip(model_tree['levels'], parent_path):
+        table = table[table[level] == label]
+    return table[table['Count'] > 0].sort_values('Count', ascending=False)
+
+
+def longest_range_vehicle(model_tree, leaf_stats):
+    """Range, make and model of the longest-range vehicle, from the leaf argmax pointers"""
+    best_leaf = group_argmax(np.zeros(len(leaf_stats['count']), dtype=np.int64), leaf_stats['range_max'],
+                             leaf_stats['argmax_row'], 1)[0]
+    path = model_tree['leaf_paths'].iloc[best_leaf]
+    return leaf_stats['range_max'][best_leaf], path['Make'], path['Model']
+
+
+# Stratified sample order for Sample Mode. Rows are ranked once per dataset: the first few
+# rows of every EV type x make stratum lead, then each stratum's remaining rows are spread
+# evenly through the order. The sample of any filtered subset is its first k rows in this
+# order, so small strata are kept, and the sample is stable across reruns and costs one mask pass.
+SAMPLE_STRATA = ['Electric Vehicle Type', 'Make']
+SAMPLE_MIN_PER_STRATUM = 5
+SAMPLE_SEED = 42
+
+
+@st.cache_resource
+def build_sample_order(_df, dataset_version):
+    """Row positions of the dataset in stratified sample order"""
+    facets = build_facet_codes(_df, dataset_version)
+    rng = np.random.default_rng(SAMPLE_SEED)
+    strata = np.zeros(len(_df), dtype=np.int64)
+    for column in SAMPLE_STRATA:
+        if column in facets:
+            # Missing values (code -1) form their own stratum
+            strata = strata * (len(facets[column]['options']) + 1) + facets[column]['codes'] + 1
+
+    # Random rank of every row within its stratum
+    by_stratum = rng.permutation(len(_df))
+    by_stratum = by_stratum[np.argsort(strata[by_stratum], kind='stable')]
+    _, starts, sizes = np.unique(strata[by_stratum], return_index=True, return_counts=True)
+    ranks = np.empty(len(_df), dtype=np.int64)
+    ranks[by_stratum] = np.arange(len(_df)) - np.repeat(starts, sizes)
+    stratum_sizes = np.empty(len(_df), dtype=np.int64)
+    stratum_sizes[by_stratum] = np.repeat(sizes, sizes)
+
+    jitter = rng.random(len(_df))
+    keys = np.where(
+        ranks < SAMPLE_MIN_PER_STRATUM,
+        ranks + jitter - SAMPLE_MIN_PER_STRATUM,  # negative: every stratum's first rows, interleaved
+        (ranks + jitter) / stratum_sizes,  # in [0, 1): the rest, proportionally spread
+    )
+    return np.argsort(keys, kind='stable')
+
+
+def sample_rows(sample_order, rows, n_rows, size):
+    """The first `size` of the given row positions in sample order, returned in dataset order"""
+    selected = np.zeros(n_rows, dtype=bool)
+    selected[rows] = True
+    return np.sort(sample_order[selected[sample_order]][:size])
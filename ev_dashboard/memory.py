@@ -0,0 +1,102 @@
+"""Per-session memory accounting and the session state budget.
+
+After each run the session's state and its filtered/display frames are measured by deep
+size. Objects every session shares (the dataset frame) are not counted. The totals are kept
+per process for the admin panel. A session whose state passes its budget is logged once and
+counted as over budget. Nothing is evicted: session state only holds filter selections and
+small handles (about 10 KB after visiting every page), and the large per-filter data lives
+in the bounded process-wide caches. The filtered and display frames are rebuilt on every run
+and dropped with it, so they are reported but not held against the budget.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Per-session budget for session state; EV_SESSION_BUDGET_MB overrides it
+SESSION_MEMORY_BUDGET = float(os.environ.get("EV_SESSION_BUDGET_MB", 64)) * 1024 * 1024
+# Sessions not seen for this long drop out of the process totals
+SESSION_MEMORY_TTL = 3600
+
+# Session id -> {'state', 'frames', 'over_budget', 'seen'} for every session run in this process
+SESSION_MEMORY = {}
+_memory_lock = threading.Lock()
+
+
+def deep_size(value, seen=None):
+    """Approximate bytes held by a value, counting objects already in seen as zero"""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(deep_size(key, seen) + deep_size(item, seen) for key, item in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(deep_size(item, seen) for item in value)
+    return sys.getsizeof(value)
+
+
+def state_sizes(items, shared=()):
+    """Deep size of each session state entry; the shared objects count as zero"""
+    seen = {id(value) for value in shared}
+    return {key: deep_size(value, seen) for key, value in items}
+
+
+def measure_session(session_id, items, shared, filtered_df, display_df):
+    """Record one session's state and frame sizes; returns its entry in SESSION_MEMORY"""
+    sizes = state_sizes(items, shared=shared)
+    frames = deep_size(filtered_df, {id(value) for value in shared}) + deep_size(display_df, {id(filtered_df)})
+    state = sum(sizes.values())
+    over_budget = state > SESSION_MEMORY_BUDGET
+
+    now = time.time()
+    with _memory_lock:
+        previous = SESSION_MEMORY.get(session_id, {})
+        if over_budget and not previous.get('over_budget'):
+            # Once per crossing, not on every run while the session stays over
+            largest = max(sizes, key=sizes.get)
+            logging.getLogger(__name__).warning(
+                "Session %s holds %.1f MB of state, over its %g MB budget (largest entry %r, %.1f MB)",
+                session_id, state / 1024 / 1024, SESSION_MEMORY_BUDGET / 1024 / 1024, largest,
+                sizes[largest] / 1024 / 1024
+            )
+        SESSION_MEMORY[session_id] = {'state': state, 'frames': frames, 'over_budget': over_budget, 'seen': now}
+        for stale_id in [key for key, entry in SESSION_MEMORY.items() if now - entry['seen'] > SESSION_MEMORY_TTL]:
+            del SESSION_MEMORY[stale_id]
+        return dict(SESSION_MEMORY[session_id])
+
+
+def record_session_memory(filtered_df, display_df):
+    """Measure the running session and update the process totals"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None
+    state = st.session_state
+    items = [(key, state[key]) for key in list(state.keys()) if key != 'df']
+    return measure_session(ctx.session_id, items, [state.get('df')], filtered_df, display_df)
+
+
+def process_memory_totals():
+    """Session count, state and frame totals, and sessions over budget across this process"""
+    with _memory_lock:
+        entries = list(SESSION_MEMORY.values())
+    return {
+        'sessions': len(entries),
+        'state': sum(entry['state'] for entry in entries),
+        'frames': sum(entry['frames'] for entry in entries),
+        'largest': max((entry['state'] for entry in entries), default=0),
+        'over_budget': sum(entry['over_budget'] for entry in entries),
+    }
@@ -0,0 +1,247 @@
+"""Background cache prewarming.
+
+A worker thread replays a default session headlessly (no script run context, so widgets
+return their defaults and elements are not sent anywhere) through the sidebar and every
+page. The data load, per-dataset indexes and default-filter aggregates all land in the
+process-wide st.cache_data / st.cache_resource stores before real sessions ask for them.
+It then replays the most popular logged filter states (ev_dashboard.usage) on the pages
+they were viewed on, and keeps doing so as new states become popular.
+
+A second worker prefetches the pages next to the one a session just rendered, under that
+session's filters, while no foreground run is in progress.
+"""
+
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+from streamlit import runtime
+
+from ev_dashboard.analytics import get_filter_signature
+from ev_dashboard.data import get_dataset_version
+from ev_dashboard.sidebar import (
+    PAGES, SAMPLE_SIZE, apply_filter_state, create_sidebar_filters, display_sample, init_session_state,
+)
+from ev_dashboard.usage import clear_warm, is_warm, load_usage_log, mark_warm, popular_states, save_usage_log
+from ev_dashboard.views import load_page
+
+PREWARM_POLL_SECONDS = 30
+PREWARM_POPULAR_STATES = 5
+# Pages on either side of the current one in the navigation list to prefetch
+PREFETCH_NEIGHBORS = 1
+# Pending prefetch jobs; further requests are dropped while the queue is full
+PREFETCH_QUEUE_SIZE = 4
+
+# Dataset version -> seconds the prewarm took, for every version warmed in this process
+PREWARMED_VERSIONS = {}
+_worker = None
+_prefetch_worker = None
+_worker_lock = threading.Lock()
+_prefetch_queue = queue.Queue(maxsize=PREFETCH_QUEUE_SIZE)
+# Both workers replay into the one context-less session state, so only one replays at a time
+_replay_lock = threading.Lock()
+# Set while no session is mid-run; background work only starts a page while it is set
+_foreground_idle = threading.Event()
+_foreground_idle.set()
+_foreground_runs = 0
+_foreground_lock = threading.Lock()
+# Streamlit logs a "missing ScriptRunContext" warning for every element drawn without a session
+_context_logger = logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context")
+
+
+@contextmanager
+def foreground_run():
+    """Mark a session's script run in progress so background replays hold off until it ends"""
+    global _foreground_runs
+    with _foreground_lock:
+        _foreground_runs += 1
+        _foreground_idle.clear()
+    try:
+        yield
+    finally:
+        with _foreground_lock:
+            _foreground_runs -= 1
+            if _foreground_runs == 0:
+                _foreground_idle.set()
+
+
+@contextmanager
+def headless_replay():
+    """Exclusive use of the context-less session state, cleared afterwards"""
+    state = st.session_state
+    with _replay_lock:
+        previous_level = _context_logger.level
+        _context_logger.setLevel(logging.ERROR)
+        try:
+            yield state
+        finally:
+            _context_logger.setLevel(previous_level)
+            # Drop the replayed session so it neither pins the dataframe nor leaks into the next replay
+            for key in list(state.keys()):
+                del state[key]
+
+
+def render_pages(filtered_df, display_df, slugs, cancelled=None):
+    """Render the given pages for the session's current filters and mark them warm.
+
+    Each page waits for the foreground to go idle first; with a cancelled event the remaining
+    pages are skipped once the event is set.
+    """
+    state = st.session_state
+    labels = {slug: page for page, slug in PAGES.items()}
+    for slug in slugs:
+        _foreground_idle.wait()
+        if cancelled is not None and cancelled.is_set():
+            return
+        state.current_page = labels[slug]
+        render_page = load_page(slug)
+        if slug == "home":
+            render_page()
+        else:
+            render_page(filtered_df, display_df)
+        mark_warm(state.filter_signature, slug)
+
+
+def cold_popular_states(dataset_version):
+    """Popular logged states, pinned to the dataset version, with the pages not yet warm for them"""
+    cold = []
+    for entry in popular_states(PREWARM_POPULAR_STATES):
+        filter_state = dict(entry['state'], dataset_version=dataset_version)
+        signature = get_filter_signature(filter_state)
+        slugs = [slug for slug in entry['pages'] if slug in PAGES.values() and not is_warm(signature, slug)]
+        if slugs:
+            cold.append((filter_state, slugs))
+    return cold
+
+
+def prewarm_default_state():
+    """Render the default filter state of every page once, then the cold popular states"""
+    started = time.perf_counter()
+    # Like prefetching, yield to foreground runs before every state and every page
+    _foreground_idle.wait()
+    with headless_replay() as state:
+        init_session_state()
+        if state.df.empty:
+            return
+        if state.dataset_version not in PREWARMED_VERSIONS:
+            _foreground_idle.wait()
+            filtered_df, display_df = create_sidebar_filters()
+            render_pages(filtered_df, display_df, PAGES.values())
+        for filter_state, slugs in cold_popular_states(state.dataset_version):
+            _foreground_idle.wait()
+            try:
+                _, filtered_df = apply_filter_state(filter_state)
+                render_pages(filtered_df, display_sample(filtered_df, True), slugs)
+            except Exception:
+                # A logged state can name values the reloaded data no longer has; mark it so the
+                # worker does not retry it every poll
+                logging.getLogger(__name__).warning("Skipped prewarming filter state %s", filter_state)
+                for slug in slugs:
+                    mark_warm(get_filter_signature(filter_state), slug)
+        PREWARMED_VERSIONS.setdefault(state.dataset_version, time.perf_counter() - started)
+
+
+def prewarm_worker():
+    """Warm the caches for the current dataset, again whenever the data file changes, and for
+    logged filter states as they become popular"""
+    load_usage_log()
+    while True:
+        dataset_version = get_dataset_version()
+        if dataset_version != "missing" and (
+                dataset_version not in PREWARMED_VERSIONS or cold_popular_states(dataset_version)):
+            if dataset_version not in PREWARMED_VERSIONS:
+                # Entries for the previous dataset no longer describe what is cached
+                clear_warm()
+            try:
+                prewarm_default_state()
+            except Exception:
+                logging.getLogger(__name__).exception("Cache prewarm failed for dataset %s", dataset_version)
+                PREWARMED_VERSIONS[dataset_version] = None
+        save_usage_log()
+        time.sleep(PREWARM_POLL_SECONDS)
+
+
+def neighbor_pages(slug):
+    """Pages within PREFETCH_NEIGHBORS of the given one in the navigation list, nearest first"""
+    slugs = list(PAGES.values())
+    position = slugs.index(slug)
+    neighbors = []
+    for distance in range(1, PREFETCH_NEIGHBORS + 1):
+        for index in (position + distance, position - distance):
+            if 0 <= index < len(slugs) and slugs[index] != "home":
+                neighbors.append(slugs[index])
+    return neighbors
+
+
+def prefetch_job(job):
+    """Render a session's neighboring pages under its filter state unless cancelled"""
+    _foreground_idle.wait()
+    if job['cancelled'].is_set():
+        return
+    with headless_replay() as state:
+        init_session_state()
+        if state.df.empty or state.dataset_version != job['filter_state']['dataset_version']:
+            return
+        _, filtered_df = apply_filter_state(job['filter_state'])
+        display_df = display_sample(filtered_df, job['use_sample'], job['sample_size'])
+        render_pages(filtered_df, display_df, job['slugs'], cancelled=job['cancelled'])
+
+
+def prefetch_worker():
+    """Run queued prefetch jobs one at a time"""
+    while True:
+        job = _prefetch_queue.get()
+        try:
+            prefetch_job(job)
+        except Exception:
+            logging.getLogger(__name__).exception("Prefetch failed for pages %s", job['slugs'])
+
+
+def prefetch_neighbors(slug):
+    """Queue the current session's neighboring pages for background rendering.
+
+    Cancels the session's previous job when its filters have changed since; requests are
+    dropped rather than queued behind a full queue.
+    """
+    if _prefetch_worker is None:
+        return
+    state = st.session_state
+    previous = state.get('prefetch_job')
+    if previous is not None and previous['filter_state'] != state.filter_state:
+        previous['cancelled'].set()
+    slugs = [neighbor for neighbor in neighbor_pages(slug) if not is_warm(state.filter_signature, neighbor)]
+    if not slugs:
+        return
+    job = {
+        'filter_state': state.filter_state,
+        'use_sample': state.get('sample_mode', True),
+        'sample_size': state.get('sample_size', SAMPLE_SIZE),
+        'slugs': slugs,
+        'cancelled': threading.Event(),
+    }
+    try:
+        _prefetch_queue.put_nowait(job)
+    except queue.Full:
+        return
+    state.prefetch_job = job
+
+
+def start_prewarm():
+    """Start the per-process prewarm and prefetch workers if they are not running yet.
+
+    Only under a Streamlit runtime: without one (bare `python app.py`) the main thread
+    shares the same context-less session state the workers would replay into.
+    """
+    global _worker, _prefetch_worker
+    if not runtime.exists():
+        return
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=prewarm_worker, name="cache-prewarm", daemon=True)
+            _worker.start()
+        if _prefetch_worker is None:
+            _prefetch_worker = threading.Thread(target=prefetch_worker, name="cache-prefetch", daemon=True)
+            _prefetch_worker.start()
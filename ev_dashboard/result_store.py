@@ -0,0 +1,264 @@
+"""Persistent per-filter aggregate results shared by every server process on the host.
+
+Per-filter aggregates sit behind two tiers: the bounded in-memory st.cache_data of each
+process, and below it this SQLite file next to the shared dataset. A result computed by any
+worker is written through to the file, so it survives restarts and is served to the other
+workers on their first miss. Rows are keyed by aggregate name, filter signature (which
+includes the dataset version) and the remaining arguments, under a result schema version.
+Each process purges rows of other schema and dataset versions when it first opens the file;
+once the file passes its byte budget, the least recently used rows are evicted as well.
+"""
+
+import functools
+import hashlib
+import inspect
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+import numpy as np
+
+from ev_dashboard.data import SHARED_DATASET_DIR, get_dataset_schema, get_dataset_version
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # without pyarrow DataFrame results are only cached in memory
+    pa = None
+
+RESULT_STORE_PATH = os.path.join(SHARED_DATASET_DIR, "results.sqlite")
+RESULT_STORE_MAX_BYTES = 256 * 1024 * 1024
+# Results larger than this are only cached in memory
+RESULT_STORE_MAX_ITEM_BYTES = 16 * 1024 * 1024
+# Bump whenever a stored aggregate changes without its own source changing: the helpers it
+# calls (summarize_model_leaves, largest_k, the index builders), TOP_K_SUBSETS and the like.
+# Cleaning changes are covered by the dataset schema, which is part of the version too.
+RESULT_SCHEMA_VERSION = 2
+
+_connections = threading.local()
+# Per-thread count of aggregates computed (in-memory cache misses), so a session run can tell
+# whether everything it drew was already cached
+_computations = threading.local()
+_purged = threading.Event()
+
+
+def get_result_schema():
+    """Version of the stored results: RESULT_SCHEMA_VERSION plus the dataset schema"""
+    return f"{RESULT_SCHEMA_VERSION}-{get_dataset_schema()}"
+
+
+def connect():
+    """This thread's connection to the store, or None when it cannot be opened"""
+    connection = getattr(_connections, 'connection', None)
+    if connection is None:
+        try:
+            os.makedirs(SHARED_DATASET_DIR, exist_ok=True)
+            connection = sqlite3.connect(RESULT_STORE_PATH, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(results)")]
+            if columns and 'schema_version' not in columns:
+                # Stores written before results were versioned cannot be trusted
+                connection.execute("DROP TABLE results")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, schema_version TEXT, "
+                "dataset_version TEXT, name TEXT, format TEXT, payload BLOB, size INTEGER, last_used REAL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+            if not _purged.is_set():
+                _purged.set()
+                purge_results(connection)
+        except (OSError, sqlite3.Error):
+            logging.getLogger(__name__).exception("Could not open the result store")
+            return None
+        _connections.connection = connection
+    return connection
+
+
+def to_json(value):
+    """A result field as plain JSON values (numpy scalars unwrapped), or TypeError"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Cannot store a {type(value).__name__} in the result store")
+
+
+def encode_arrays(value):
+    """A dict result as an .npz archive: arrays as members, the other fields in a JSON manifest.
+
+    Nothing is pickled, so a tampered row cannot run code when it is read back. String arrays
+    held as object dtype are stored as fixed-width unicode and restored to object on load.
+    """
+    arrays, manifest = {}, {'arrays': {}, 'values': {}}
+    for field, item in value.items():
+        if isinstance(item, np.ndarray):
+            if item.dtype == object:
+                if not all(isinstance(element, str) for element in item.flat):
+                    raise TypeError(f"Cannot store the mixed object array {field!r} in the result store")
+                item = item.astype(str)
+                manifest['arrays'][field] = 'object'
+            else:
+                manifest['arrays'][field] = 'array'
+            arrays[field] = item
+        else:
+            manifest['values'][field] = to_json(item)
+    buffer = io.BytesIO()
+    np.savez(buffer, __manifest__=np.frombuffer(json.dumps(manifest).encode(), dtype=np.uint8), **arrays)
+    return buffer.getvalue()
+
+
+def decode_arrays(payload):
+    """Inverse of encode_arrays"""
+    with np.load(io.BytesIO(payload), allow_pickle=False) as archive:
+        manifest = json.loads(archive['__manifest__'].tobytes())
+        value = dict(manifest['values'])
+        for field, kind in manifest['arrays'].items():
+            value[field] = archive[field].astype(object) if kind == 'object' else archive[field]
+    return value
+
+
+def encode_result(value):
+    """DataFrames as Arrow IPC streams, dicts of numpy arrays as .npz archives, None as empty"""
+    if value is None:
+        return "none", b""
+    if isinstance(value, pd.DataFrame):
+        if pa is None:
+            raise TypeError("Storing DataFrame results requires pyarrow")
+        table = pa.Table.from_pandas(value, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return "arrow", sink.getvalue().to_pybytes()
+    if isinstance(value, dict):
+        return "npz", encode_arrays(value)
+    raise TypeError(f"Cannot store a {type(value).__name__} in the result store")
+
+
+def decode_result(result_format, payload):
+    """Inverse of encode_result"""
+    if result_format == "none":
+        return None
+    if result_format == "arrow":
+        return pa.ipc.open_stream(io.BytesIO(payload)).read_all().to_pandas()
+    if result_format == "npz":
+        return decode_arrays(payload)
+    raise ValueError(f"Unknown result format {result_format!r}")
+
+
+def fetch_result(key):
+    """(True, result) for a stored key, else (False, None)"""
+    connection = connect()
+    if connection is None:
+        return False, None
+    try:
+        row = connection.execute("SELECT format, payload FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False, None
+        connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return True, decode_result(*row)
+    except (sqlite3.Error, ValueError, KeyError, OSError, EOFError):
+        logging.getLogger(__name__).exception("Could not read result %s", key)
+        return False, None
+
+
+def store_result(key, name, value, dataset_version):
+    """Write a result computed from the given dataset version through to the store, then
+    evict down to the byte budget"""
+    connection = connect()
+    if connection is None:
+        return
+    try:
+        result_format, payload = encode_result(value)
+        if len(payload) > RESULT_STORE_MAX_ITEM_BYTES:
+            return
+        connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, get_result_schema(), dataset_version, name, result_format, payload, len(payload), time.time()),
+        )
+        evict_results(connection, dataset_version)
+    except TypeError as error:
+        # Results that have no safe encoding stay in the in-memory cache only
+        logging.getLogger(__name__).debug("Not storing result %s: %s", key, error)
+    except (sqlite3.Error, ValueError):
+        logging.getLogger(__name__).exception("Could not store result %s", key)
+
+
+def computed_results():
+    """Aggregates this thread has computed so far, i.e. in-memory cache misses"""
+    return getattr(_computations, 'count', 0)
+
+
+def purge_results(connection):
+    """Drop rows stored under another result schema or for another dataset version"""
+    deleted = connection.execute(
+        "DELETE FROM results WHERE schema_version != ? OR dataset_version != ?",
+        (get_result_schema(), get_dataset_version()),
+    ).rowcount
+    if deleted:
+        logging.getLogger(__name__).info("Purged %d stale results from the result store", deleted)
+
+
+def evict_results(connection, dataset_version):
+    """Drop older dataset versions, then least recently used rows, until under budget"""
+    total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+    if total <= RESULT_STORE_MAX_BYTES:
+        return
+    connection.execute("DELETE FROM results WHERE dataset_version != ?", (dataset_version,))
+    total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+    excess = total - RESULT_STORE_MAX_BYTES
+    if excess <= 0:
+        return
+    freed = 0
+    stale = []
+    for key, size in connection.execute("SELECT key, size FROM results ORDER BY last_used"):
+        stale.append((key,))
+        freed += size
+        if freed >= excess:
+            break
+    connection.executemany("DELETE FROM results WHERE key = ?", stale)
+
+
+def persistent_result(name):
+    """Back a per-filter aggregate with the store.
+
+    Applied under @st.cache_data and keyed the same way: arguments whose names start with an
+    underscore are not part of the key; filter_signature stands in for them. The key also
+    holds the function's source and the result schema version. Editing the aggregate itself
+    changes the key, but changing a helper it calls only does once RESULT_SCHEMA_VERSION is bumped.
+    """
+    def decorator(func):
+        parameters = inspect.signature(func)
+        try:
+            source = inspect.getsource(func).encode()
+        except OSError:
+            source = func.__code__.co_code
+        source_hash = hashlib.sha1(source).hexdigest()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = parameters.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key_args = {arg: value for arg, value in bound.arguments.items() if not arg.startswith('_')}
+            encoded = json.dumps([name, get_result_schema(), source_hash, key_args], sort_keys=True, default=str)
+            key = hashlib.sha1(encoded.encode()).hexdigest()
+            # Only reached when @st.cache_data missed
+            _computations.count = computed_results() + 1
+            found, result = fetch_result(key)
+            if found:
+                return result
+            # Stamp the version the result is computed from, not the one current when it is stored
+            dataset_version = get_dataset_version()
+            result = func(*args, **kwargs)
+            store_result(key, name, result, dataset_version)
+            return result
+
+        return wrapper
+
+    return decorator
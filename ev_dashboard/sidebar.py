@@ -0,0 +1,542 @@
+"""Session state, page navigation and the sidebar filters."""
+
+import streamlit as st
+import pandas as pd
+
+from ev_dashboard.data import get_dataset_version, get_memory_footprint, has_price_data, load_data
+from ev_dashboard.indexes import (
+    CAFV_COLUMN, CUSTOM_CENTER, active_selection, build_facet_codes, build_range_index, build_sample_order,
+    build_spatial_index, combine_masks, facet_counts, numeric_filter_mask, query_bbox, query_radius,
+    query_range_index, rows_to_mask, sample_rows, selection_mask, validate_selection,
+)
+from ev_dashboard.analytics import get_filter_signature
+
+
+# Navigation labels and the page module (under ev_dashboard.views) that renders each one
+PAGES = {
+    "Home": "home",
+    "Executive Dashboard": "overview",
+    "Price Analytics": "price",
+    "Geographic Insights": "geographic",
+    "Performance Analysis": "performance",
+    "Market Leaders": "leaders",
+    "Distribution Analysis": "distribution",
+    "Market Share": "pie",
+    "Box Analysis": "boxplot",
+    "Heatmap Analysis": "heatmap",
+    "Trends Analysis": "trends"
+}
+
+# Sample Mode sizes offered in the sidebar and the default
+SAMPLE_SIZES = [1000, 2500, 5000, 10000, 20000]
+SAMPLE_SIZE = 5000
+
+# Session state keys of the location filter widgets
+LOCATION_KEYS = ["location_mode", "location_center", "location_lat", "location_lon", "location_radius",
+                 "bbox_south", "bbox_west", "bbox_north", "bbox_east"]
+# The keys each location mode reads; the others are leftovers from another mode
+RADIUS_KEYS = ["location_mode", "location_center", "location_radius"]
+CUSTOM_CENTER_KEYS = ["location_lat", "location_lon"]
+BBOX_KEYS = ["location_mode", "bbox_south", "bbox_west", "bbox_north", "bbox_east"]
+
+
+def normalize_location(location):
+    """Keep only the location keys the active mode uses, so one filter always has one signature"""
+    if location is None or location.get('location_mode') == "Anywhere":
+        return None
+    if location['location_mode'] == "Within radius":
+        keys = RADIUS_KEYS + (CUSTOM_CENTER_KEYS if location.get('location_center') == CUSTOM_CENTER else [])
+    else:
+        keys = BBOX_KEYS
+    return {key: location.get(key) for key in keys}
+
+
+def location_filter_widgets(spatial_index, container):
+    """Draw the location filter controls and return their values, or None when not filtering"""
+    mode = container.radio("Location", ["Anywhere", "Within radius", "Bounding box"],
+                           horizontal=True, key="location_mode")
+
+    if mode == "Within radius":
+        center = container.selectbox("Center on", [CUSTOM_CENTER] + sorted(spatial_index['city_centers']),
+                                     key="location_center")
+        if center == CUSTOM_CENTER:
+            col1, col2 = container.columns(2)
+            with col1:
+                st.number_input("Latitude", value=47.61, format="%.4f", key="location_lat")
+            with col2:
+                st.number_input("Longitude", value=-122.33, format="%.4f", key="location_lon")
+        container.slider("Radius (miles)", min_value=1, max_value=100, value=10, key="location_radius")
+
+    if mode == "Bounding box":
+        min_lon, min_lat, max_lon, max_lat = spatial_index['bounds']
+        col1, col2 = container.columns(2)
+        with col1:
+            st.number_input("South", value=float(min_lat), format="%.3f", key="bbox_south")
+            st.number_input("West", value=float(min_lon), format="%.3f", key="bbox_west")
+        with col2:
+            st.number_input("North", value=float(max_lat), format="%.3f", key="bbox_north")
+            st.number_input("East", value=float(max_lon), format="%.3f", key="bbox_east")
+
+    return normalize_location({**{key: st.session_state.get(key) for key in LOCATION_KEYS}, 'location_mode': mode})
+
+
+def query_location(spatial_index, location):
+    """Row positions matching a location filter (LOCATION_KEYS values), or None for no filter"""
+    if location is None or location['location_mode'] == "Anywhere":
+        return None
+    if location['location_mode'] == "Within radius":
+        if location['location_center'] == CUSTOM_CENTER:
+            center_lon, center_lat = location['location_lon'], location['location_lat']
+        else:
+            center_lon, center_lat = spatial_index['city_centers'][location['location_center']]
+        return query_radius(spatial_index, center_lon, center_lat, location['location_radius'])
+    return query_bbox(spatial_index, location['bbox_west'], location['bbox_south'],
+                      location['bbox_east'], location['bbox_north'])
+
+
+def set_multiselect(widget_key, state_key, values):
+    """All/Clear callback: set a multiselect before the rerun instead of forcing a second one"""
+    st.session_state[state_key] = values
+    # Dropping the widget's own state makes it pick up the new default on this rerun
+    st.session_state.pop(widget_key, None)
+
+
+def selection_buttons(container, noun, widget_key, state_key, options, batch_mode):
+    """All/Clear buttons for one multiselect; in batch mode they name it, as they sit above the form"""
+    col1, col2 = container.columns([1, 1])
+    with col1:
+        st.button(f"All {noun}" if batch_mode else "All", key=f"select_all_{noun}", help=f"Select all {noun}",
+                  on_click=set_multiselect, args=(widget_key, state_key, options))
+    with col2:
+        st.button(f"Clear {noun}" if batch_mode else "Clear", key=f"clear_{noun}", help="Clear all selections",
+                  on_click=set_multiselect, args=(widget_key, state_key, []))
+
+
+# Initialize session state
+def init_session_state():
+    """Initialize session state variables"""
+    if 'df' not in st.session_state:
+        st.session_state.dataset_version = get_dataset_version()
+        st.session_state.df, st.session_state.cleaning_report = load_data(st.session_state.dataset_version)
+        st.session_state.dataset_memory_mb = get_memory_footprint(st.session_state.df)
+
+    if st.session_state.df.empty:
+        return
+
+    if 'selected_makes' not in st.session_state:
+        st.session_state.selected_makes = st.session_state.df['Make'].unique().tolist()
+    if 'selected_types' not in st.session_state:
+        st.session_state.selected_types = st.session_state.df['Electric Vehicle Type'].unique().tolist()
+    if 'selected_counties' not in st.session_state:
+        if 'County' in st.session_state.df.columns:
+            st.session_state.selected_counties = st.session_state.df['County'].unique().tolist()
+        else:
+            st.session_state.selected_counties = []
+    if 'year_range' not in st.session_state:
+        min_year = int(st.session_state.df['Model Year'].min())
+        max_year = int(st.session_state.df['Model Year'].max())
+        st.session_state.year_range = (min_year, max_year)
+    if 'price_range' not in st.session_state and has_price_data(st.session_state.df):
+        min_price = int(st.session_state.df['Base MSRP'].min())
+        max_price = int(st.session_state.df['Base MSRP'].max())
+        st.session_state.price_range = (min_price, max_price)
+    if 'current_page' not in st.session_state:
+        st.session_state.current_page = "Home"
+
+
+def go_to_page(page):
+    """Button callback: switch pages and let the navigation selectbox pick up the new page"""
+    st.session_state.current_page = page
+    st.session_state.pop("navigation_selectbox", None)
+
+
+def sync_navigation():
+    """Selectbox callback: follow the page chosen in the sidebar"""
+    st.session_state.current_page = st.session_state.navigation_selectbox
+
+
+def apply_filter_state(filter_state, location_mask=None):
+    """Filter masks and filtered rows for a filter-state dict.
+
+    Also sets the session's filter signature (the per-filter cache key) and the approximate
+    mode sketch query. location_mask can be passed when the caller already queried it.
+    """
+    df = st.session_state.df
+    facets = build_facet_codes(df, st.session_state.dataset_version)
+    if filter_state['location'] is not None and location_mask is None:
+        spatial_index = build_spatial_index(df, st.session_state.dataset_version)
+        location_mask = rows_to_mask(query_location(spatial_index, filter_state['location']), len(df))
+
+    masks = {
+        'County': selection_mask(facets['County'], filter_state['counties']) if 'County' in facets else None,
+        'Make': selection_mask(facets['Make'], filter_state['makes']),
+        'Electric Vehicle Type': selection_mask(facets['Electric Vehicle Type'], filter_state['types']),
+        'numeric': numeric_filter_mask(
+            df, filter_state['years'], filter_state['range'], filter_state['price'], filter_state['cafv']
+        ),
+        'location': location_mask if filter_state['location'] is not None else None,
+    }
+    filtered_df = df[combine_masks(masks)]
+
+    # Signature of the applied filters, used to cache per-filter-state aggregates
+    st.session_state.filter_state = filter_state
+    st.session_state.filter_signature = get_filter_signature(filter_state)
+
+    # Cube coordinates of the applied filters for approximate mode; None when a filter cuts
+    # across the Make x Vehicle Type x Model Year sketch cube and answers must be exact
+    full_range = (int(df['Electric Range'].min()), int(df['Electric Range'].max()))
+    cube_aligned = (
+        masks['County'] is None and masks['location'] is None and filter_state['price'] is None
+        and tuple(filter_state['range']) == full_range and not filter_state['cafv']
+    )
+    st.session_state.sketch_query = {
+        'makes': [facets['Make']['positions'][make] for make in filter_state['makes']]
+        if filter_state['makes'] is not None else None,
+        'types': [facets['Electric Vehicle Type']['positions'][vehicle_type] for vehicle_type in filter_state['types']]
+        if filter_state['types'] is not None else None,
+        'years': filter_state['years'],
+    } if cube_aligned else None
+
+    return masks, filtered_df
+
+
+def display_sample(filtered_df, use_sample, sample_size=SAMPLE_SIZE):
+    """Rows for the point-level charts: in sample mode, a stratified sample of sample_size rows"""
+    if not use_sample or len(filtered_df) <= sample_size:
+        return filtered_df
+    sample_order = build_sample_order(st.session_state.df, st.session_state.dataset_version)
+    rows = sample_rows(sample_order, filtered_df.index.to_numpy(), len(st.session_state.df), sample_size)
+    return filtered_df.loc[rows]
+
+
+# Advanced Sidebar Filtering
+def create_sidebar_filters():
+    """Create comprehensive sidebar filters"""
+    if st.session_state.df.empty:
+        return None, None
+
+    # Navigation at top of sidebar
+    st.sidebar.markdown("### Navigate to Section")
+    # The callback switches pages before the script runs, so navigation takes a single run
+    st.sidebar.selectbox("Choose Page:", list(PAGES.keys()),
+                         index=list(PAGES.keys()).index(st.session_state.current_page),
+                         key="navigation_selectbox", on_change=sync_navigation)
+
+    # Real-Time Analytics at top
+    st.sidebar.markdown("### Real-Time Analytics")
+    if not st.session_state.df.empty:
+        # Quick preview metrics before filtering
+        col1, col2 = st.sidebar.columns(2)
+        with col1:
+            st.metric("Total Vehicles", f"{len(st.session_state.df):,}")
+            if has_price_data(st.session_state.df):
+                avg_price = st.session_state.df['Base MSRP'].mean()
+                st.metric("Avg Price", f"${avg_price:,.0f}")
+        with col2:
+            avg_range = st.session_state.df['Electric Range'].mean()
+            st.metric("Avg Range", f"{avg_range:.0f} mi")
+            if 'County' in st.session_state.df.columns:
+                unique_counties = st.session_state.df['County'].nunique()
+                st.metric("Counties", f"{unique_counties}")
+        st.sidebar.caption(
+            f"Dataset memory: {st.session_state.dataset_memory_mb:.1f} MB "
+            f"({len(st.session_state.df.columns)} columns loaded)"
+        )
+        with st.sidebar.expander("Data Quality Report"):
+            report = pd.DataFrame(list(st.session_state.cleaning_report.items()), columns=['Rule', 'Rows'])
+            st.dataframe(report, use_container_width=True, hide_index=True)
+
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### Advanced Filter Controls")
+
+    # Batch mode stages sidebar edits in a form and commits them as one filter transaction,
+    # so a burst of clicks and slider drags costs a single recompute
+    batch_mode = st.sidebar.toggle(
+        "Batch filter edits", value=False, key="batch_filters",
+        help="Stage filter changes and apply them together with the Apply filters button"
+    )
+    # A button inside the form would submit every staged edit, so in batch mode All/Clear sit
+    # above it and only restage their own multiselect
+    selection_container = st.sidebar.expander("Quick selections", expanded=True) if batch_mode else None
+    filter_container = st.sidebar.form("filter_form", border=False) if batch_mode else st.sidebar
+
+    # Year Range Slider
+    min_year = int(st.session_state.df['Model Year'].min())
+    max_year = int(st.session_state.df['Model Year'].max())
+    year_range = filter_container.slider(
+        "Model Year Range",
+        min_value=min_year,
+        max_value=max_year,
+        value=st.session_state.year_range,
+        key="year_slider"
+    )
+    st.session_state.year_range = year_range
+    year_preview = filter_container.empty()
+
+    # Price Range Filter (if available)
+    price_filter = None
+    if has_price_data(st.session_state.df):
+        filter_container.markdown("#### Price Range")
+        min_price = int(st.session_state.df['Base MSRP'].min())
+        max_price = int(st.session_state.df['Base MSRP'].max())
+        price_filter = filter_container.slider(
+            "MSRP ($)",
+            min_value=min_price,
+            max_value=max_price,
+            value=st.session_state.price_range,
+            format="$%d",
+            key="price_slider"
+        )
+        st.session_state.price_range = price_filter
+        price_preview = filter_container.empty()
+
+    # Electric range bounds (the slider itself is drawn below the multiselects)
+    min_range = int(st.session_state.df['Electric Range'].min())
+    max_range = int(st.session_state.df['Electric Range'].max())
+    active_price_filter = price_filter if price_filter and tuple(price_filter) != (min_price, max_price) else None
+
+    # Geographic Filters - Modern Interface
+    facets = build_facet_codes(st.session_state.df, st.session_state.dataset_version)
+    spatial_index = build_spatial_index(st.session_state.df, st.session_state.dataset_version)
+    if 'County' in facets or spatial_index is not None:
+        filter_container.markdown("#### Geographic Filters")
+
+    # Radius / bounding-box location filter, answered from the spatial index
+    location = location_rows = None
+    if spatial_index is not None:
+        location = location_filter_widgets(spatial_index, filter_container)
+        location_rows = query_location(spatial_index, location)
+
+    # Facet counts: every multiselect option shows how many vehicles match if it is selected
+    # under all the other active filters. Widgets not yet drawn this run are read from state.
+    pending = {
+        'County': st.session_state.get("counties_multiselect", st.session_state.selected_counties),
+        'Make': st.session_state.get("makes_multiselect", st.session_state.selected_makes),
+        'Electric Vehicle Type': st.session_state.get("types_multiselect", st.session_state.selected_types),
+    }
+    masks = {
+        column: selection_mask(facets[column], validate_selection(facets[column], pending[column]))
+        for column in facets
+    }
+    masks['numeric'] = numeric_filter_mask(
+        st.session_state.df, year_range, st.session_state.get("range_slider", (min_range, max_range)),
+        active_price_filter, st.session_state.get("cafv_filter", False)
+    )
+    masks['location'] = rows_to_mask(location_rows, len(st.session_state.df)) if location is not None else None
+
+    # Initialize variables
+    selected_counties = []
+    counties = []
+
+    if 'County' in facets:
+        counties = facets['County']['options']
+
+        # Ensure selected_counties are valid
+        if not st.session_state.selected_counties:
+            st.session_state.selected_counties = counties
+        valid_selected_counties = validate_selection(facets['County'], st.session_state.selected_counties)
+        if not valid_selected_counties:
+            valid_selected_counties = counties
+        st.session_state.selected_counties = valid_selected_counties
+
+        # Modern filter interface
+        filter_container.markdown("**Counties** (Select one or more)")
+        selection_buttons(selection_container or filter_container, "counties", "counties_multiselect",
+                          "selected_counties", counties, batch_mode)
+
+        # Modern multiselect with better UX
+        county_counts = facet_counts(facets['County'], combine_masks(masks, exclude='County'))
+        selected_counties = filter_container.multiselect(
+            "Select Counties",
+            counties,
+            default=st.session_state.selected_counties,
+            format_func=lambda county: f"{county} ({county_counts[county]:,})",
+            key="counties_multiselect",
+            help=f"Select from {len(counties)} available counties"
+        )
+
+        # Update session state only if changed
+        if selected_counties != st.session_state.selected_counties:
+            st.session_state.selected_counties = selected_counties
+
+    # Makes Selection - Modern Interface
+    filter_container.markdown("#### Vehicle Makes")
+    makes = facets['Make']['options']
+
+    # Ensure selected_makes are valid
+    if not st.session_state.selected_makes:
+        st.session_state.selected_makes = makes
+    valid_selected_makes = validate_selection(facets['Make'], st.session_state.selected_makes)
+    if not valid_selected_makes:
+        valid_selected_makes = makes
+    st.session_state.selected_makes = valid_selected_makes
+
+    # Modern filter interface
+    filter_container.markdown(f"**Makes** ({len(st.session_state.selected_makes)}/{len(makes)} selected)")
+    selection_buttons(selection_container or filter_container, "makes", "makes_multiselect", "selected_makes",
+                      makes, batch_mode)
+
+    make_counts = facet_counts(facets['Make'], combine_masks(masks, exclude='Make'))
+    selected_makes = filter_container.multiselect(
+        "Select Makes",
+        makes,
+        default=st.session_state.selected_makes,
+        format_func=lambda make: f"{make} ({make_counts[make]:,})",
+        key="makes_multiselect",
+        help=f"Select from {len(makes)} available makes"
+    )
+
+    # Update session state only if changed
+    if selected_makes != st.session_state.selected_makes:
+        st.session_state.selected_makes = selected_makes
+
+    # Vehicle Types Selection - Modern Interface
+    filter_container.markdown("#### Vehicle Types")
+    vehicle_types = facets['Electric Vehicle Type']['options']
+
+    # Ensure selected_types are valid
+    if not st.session_state.selected_types:
+        st.session_state.selected_types = vehicle_types
+    valid_selected_types = validate_selection(facets['Electric Vehicle Type'], st.session_state.selected_types)
+    if not valid_selected_types:
+        valid_selected_types = vehicle_types
+    st.session_state.selected_types = valid_selected_types
+
+    # Modern filter interface
+    filter_container.markdown(f"**Types** ({len(st.session_state.selected_types)}/{len(vehicle_types)} selected)")
+    selection_buttons(selection_container or filter_container, "types", "types_multiselect", "selected_types",
+                      vehicle_types, batch_mode)
+
+    type_counts = facet_counts(facets['Electric Vehicle Type'], combine_masks(masks, exclude='Electric Vehicle Type'))
+    selected_types = filter_container.multiselect(
+        "Select Vehicle Types",
+        vehicle_types,
+        default=st.session_state.selected_types,
+        format_func=lambda ev_type: f"{ev_type} ({type_counts[ev_type]:,})",
+        key="types_multiselect",
+        help=f"Select from {len(vehicle_types)} available types"
+    )
+
+    # Update session state only if changed
+    if selected_types != st.session_state.selected_types:
+        st.session_state.selected_types = selected_types
+
+    # CAFV Eligibility Filter
+    if CAFV_COLUMN in st.session_state.df.columns:
+        filter_container.markdown("#### CAFV Eligibility")
+        cafv_eligible = filter_container.checkbox("CAFV Eligible Only", value=False, key="cafv_filter")
+    else:
+        cafv_eligible = False
+
+    # Electric Range Filter
+    filter_container.markdown("#### Electric Range Filter")
+    range_filter = filter_container.slider(
+        "Range (miles)",
+        min_value=min_range,
+        max_value=max_range,
+        value=(min_range, max_range),
+        key="range_slider"
+    )
+    range_preview = filter_container.empty()
+
+    if batch_mode:
+        applied = filter_container.form_submit_button("Apply filters", type="primary", use_container_width=True)
+        st.sidebar.caption("Filter edits are staged until you press Apply filters.")
+        # All/Clear restage a multiselect without submitting the form, so the selections last
+        # applied keep filtering until Apply filters is pressed
+        if applied or 'applied_selections' not in st.session_state:
+            st.session_state.applied_selections = (selected_counties, selected_makes, selected_types)
+        selected_counties, selected_makes, selected_types = st.session_state.applied_selections
+    else:
+        st.session_state.pop('applied_selections', None)
+
+    # Live previews for each slider, answered from the range index: vehicles of the selected
+    # types inside that slider's range alone (the other filters are not applied, so the caption
+    # says so rather than claiming to match Filtered Total)
+    range_index = build_range_index(st.session_state.df, st.session_state.dataset_version)
+    preview_types = selected_types or vehicle_types
+    slider_previews = [('Model Year', year_range, year_preview), ('Electric Range', range_filter, range_preview)]
+    slider_bounds = {'Model Year': (min_year, max_year), 'Electric Range': (min_range, max_range)}
+    if price_filter:
+        slider_previews.append(('Base MSRP', price_filter, price_preview))
+        slider_bounds['Base MSRP'] = (min_price, max_price)
+    for column, value_range, placeholder in slider_previews:
+        preview = query_range_index(range_index, column, value_range, preview_types)
+        placeholder.caption(f"{preview['count']:,} vehicles of the selected types in this range")
+
+    # Apply all filters as one combined mask over the base dataframe
+    # (no selection, or selecting every option, leaves that filter off)
+    filter_state = {
+        'dataset_version': st.session_state.dataset_version,
+        'counties': active_selection(facets['County'], selected_counties) if 'County' in facets else None,
+        'makes': active_selection(facets['Make'], selected_makes),
+        'types': active_selection(facets['Electric Vehicle Type'], selected_types),
+        'years': year_range,
+        'price': active_price_filter,
+        'range': range_filter,
+        'cafv': cafv_eligible,
+        'location': location,
+    }
+    masks, filtered_df = apply_filter_state(filter_state, masks['location'])
+
+    # Sample Mode
+    st.sidebar.markdown("#### Display Options")
+    st.sidebar.toggle(
+        "Approximate mode", value=False, key="approx_mode",
+        help="Answer distinct-city counts and price medians from precomputed sketches (marked ≈)"
+    )
+    use_sample = st.sidebar.checkbox(
+        "Sample Mode", value=True, key="sample_mode",
+        help="Draw point-level charts from a sample stratified by EV type and make"
+    )
+    sample_size = SAMPLE_SIZE
+    if use_sample:
+        sample_size = st.sidebar.select_slider(
+            "Sample size", options=SAMPLE_SIZES, value=SAMPLE_SIZE, format_func=lambda size: f"{size:,}",
+            key="sample_size"
+        )
+
+    total_records = len(filtered_df)
+    display_df = display_sample(filtered_df, use_sample, sample_size)
+    if len(display_df) < total_records:
+        st.sidebar.warning(f"Showing {len(display_df):,} of {total_records:,} records")
+    else:
+        st.sidebar.success(f"Showing all {total_records:,} records")
+
+    # Updated Dataset Info after filtering
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### Filtered Results")
+    if not filtered_df.empty:
+        # When the only active restrictions are vehicle types plus one slider, the range index
+        # answers the metrics directly; otherwise fall back to the filtered rows
+        narrowed_sliders = [
+            (column, value_range) for column, value_range, _ in slider_previews
+            if tuple(value_range) != slider_bounds[column]
+        ]
+        index_answerable = (
+            len(narrowed_sliders) <= 1 and not cafv_eligible
+            and masks['Make'] is None and masks['location'] is None
+            and masks['County'] is None
+        )
+        if index_answerable:
+            column, value_range = narrowed_sliders[0] if narrowed_sliders else ('Model Year', year_range)
+            filtered_metrics = query_range_index(range_index, column, value_range, preview_types)
+        else:
+            filtered_metrics = {
+                # None (metric hidden) when no filtered vehicle is priced, as the index path does
+                'avg_price': filtered_df['Base MSRP'].mean() if has_price_data(filtered_df) else None,
+                'avg_range': filtered_df['Electric Range'].mean(),
+            }
+
+        col1, col2 = st.sidebar.columns(2)
+        with col1:
+            st.metric("Filtered Total", f"{total_records:,}")
+            if filtered_metrics['avg_price'] is not None:
+                st.metric("Filtered Avg Price", f"${filtered_metrics['avg_price']:,.0f}")
+        with col2:
+            st.metric("Filtered Avg Range", f"{filtered_metrics['avg_range']:.0f} mi")
+            if 'County' in filtered_df.columns:
+                filtered_unique_counties = filtered_df['County'].nunique()
+                st.metric("Filtered Counties", f"{filtered_unique_counties}")
+
+    return filtered_df, display_df
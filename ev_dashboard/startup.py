@@ -0,0 +1,26 @@
+"""Startup timing. Kept free of heavy imports so app.py can load it before anything else."""
+
+import importlib
+import sys
+import time
+
+# First-import cost of each module in this server process
+IMPORT_TIMES = {}
+
+
+def timed_import(name):
+    """Import a module, recording how long its first import in this process took"""
+    if name in sys.modules:
+        # import_module (not sys.modules) so a module mid-import in another thread is waited for
+        return importlib.import_module(name)
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_TIMES.setdefault(name, time.perf_counter() - started)
+    return module
+
+
+def record_stage(timings, stage, started):
+    """Store the seconds elapsed since `started` under `stage` and return the current time"""
+    now = time.perf_counter()
+    timings[stage] = now - started
+    return now
@@ -0,0 +1,151 @@
+"""Page styling injected on every run."""
+
+# I am using minimal CSS for my professional looking styling
+APP_CSS = """
+<style>
+    .main-header {
+        font-size: 3rem;
+        font-weight: 700;
+        background: linear-gradient(90deg, #2E86AB, #A23B72, #F18F01);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        background-clip: text;
+        text-align: center;
+        margin-bottom: 2rem;
+        text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
+    }
+
+    .sub-header {
+        font-size: 1.8rem;
+        font-weight: 600;
+        color: #2E86AB;
+        margin-bottom: 1rem;
+        border-bottom: 3px solid #A23B72;
+        padding-bottom: 0.5rem;
+    }
+
+    .metric-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 1.5rem;
+        border-radius: 15px;
+        color: white;
+        text-align: center;
+        box-shadow: 0 8px 32px 0 rgba(31, 38, 135, 0.37);
+        backdrop-filter: blur(4px);
+        border: 1px solid rgba(255, 255, 255, 0.18);
+        transition: transform 0.3s ease;
+    }
+
+    .metric-card:hover {
+        transform: translateY(-5px);
+    }
+
+    .nav-card {
+        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
+        padding: 2rem;
+        border-radius: 20px;
+        color: white;
+        text-align: center;
+        margin: 1rem;
+        box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+        transition: transform 0.3s ease;
+        cursor: pointer;
+    }
+
+    .nav-card:hover {
+        transform: translateY(-5px);
+    }
+
+    .insight-box {
+        background: linear-gradient(135deg, #FF6B6B, #4ECDC4);
+        padding: 1rem;
+        border-radius: 10px;
+        color: white;
+        margin: 1rem 0;
+        font-weight: 600;
+    }
+
+    .clickable-section {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 1rem;
+        border-radius: 10px;
+        color: white;
+        margin: 0.5rem 0;
+        cursor: pointer;
+        transition: transform 0.2s ease;
+        border: none;
+        width: 100%;
+        text-align: left;
+    }
+
+    .clickable-section:hover {
+        transform: translateX(5px);
+        background: linear-gradient(135deg, #764ba2 0%, #667eea 100%);
+    }
+
+    .price-tag {
+        background: linear-gradient(135deg, #2ECC71, #27AE60);
+        color: white;
+        padding: 0.5rem 1rem;
+        border-radius: 20px;
+        font-weight: bold;
+        display: inline-block;
+        margin: 0.2rem;
+    }
+
+    .sidebar .stSelectbox > div > div {
+        background-color: #f8f9fa;
+        border-radius: 10px;
+    }
+
+    .stAlert {
+        border-radius: 10px;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    }
+
+    .footer-text {
+        text-align: center;
+        color: #666;
+        font-size: 0.9rem;
+        margin-top: 3rem;
+        padding: 1rem;
+        border-top: 1px solid #eee;
+    }
+
+    .modern-button {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        border: none;
+        padding: 0.3rem 0.8rem;
+        border-radius: 8px;
+        font-size: 0.8rem;
+        cursor: pointer;
+        transition: all 0.2s ease;
+    }
+
+    .modern-button:hover {
+        transform: translateY(-1px);
+        box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+    }
+
+    .filter-counter {
+        background: #4CAF50;
+        color: white;
+        padding: 0.2rem 0.5rem;
+        border-radius: 12px;
+        font-size: 0.75rem;
+        font-weight: bold;
+    }
+
+    .stMultiSelect > div > div {
+        background-color: #f8f9fa;
+        border-radius: 8px;
+        border: 1px solid #e1e5e9;
+    }
+
+    .stMultiSelect > div > div:focus-within {
+        border-color: #667eea;
+        box-shadow: 0 0 0 2px rgba(102, 126, 234, 0.25);
+    }
+</style>
+"""
@@ -0,0 +1,205 @@
+"""Log of popular filter states for adaptive cache prewarming.
+
+Each page run records its filter state, page and compute cost. Entries hold filter values
+only (no session, user or time of day), keyed by a signature without the dataset version so
+a state stays popular across data reloads. The prewarm worker replays the states with the
+highest total cost (frequency x average cost) so their aggregates are cached before anyone asks.
+Custom location coordinates are rounded before they are logged.
+
+A run is a hit when none of its aggregates had to be computed. Which (state, page) pairs are
+warm is tracked with the same bound and lifetime as the caches behind them, so prewarming
+picks states up again once their entries would have been evicted.
+
+Every server process keeps its own log and saves only the runs it recorded since its last
+save, merged into the file under a lock, so processes sharing the file add to each other's
+counts instead of overwriting them.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import fcntl
+except ImportError:  # no advisory locks on Windows; saves there are merged without one
+    fcntl = None
+
+from ev_dashboard.analytics import get_filter_signature
+from ev_dashboard.data import DATA_PATH
+
+USAGE_LOG_PATH = os.path.join(os.path.dirname(DATA_PATH), "filter_usage.json")
+USAGE_LOG_LOCK_PATH = USAGE_LOG_PATH + ".lock"
+USAGE_LOG_MAX_STATES = 200
+
+# Filter signature (without dataset version) -> {'state', 'runs', 'hits', 'misses', 'cost', 'pages'}
+FILTER_LOG = {}
+# The same, holding only the runs this process has recorded since it last saved the log
+PENDING_LOG = {}
+# Versioned filter signature -> {page slug: time its aggregates were cached}, oldest first
+WARM = OrderedDict()
+# Filter states whose aggregates fit in the smallest per-filter cache (model_leaf_stats)
+WARM_MAX_STATES = 16
+# Seconds a warm entry is trusted, the lifetime of the cached dataset (load_data ttl)
+WARM_TTL = 3600
+# Decimal places kept of logged custom coordinates (about 1 km)
+LOCATION_LOG_DECIMALS = 2
+_log_lock = threading.Lock()
+
+
+def merge_entry(log, key, entry):
+    """Add one entry's counts, cost and page runs to the entry under key in log"""
+    merged = log.setdefault(key, {
+        'state': entry['state'], 'runs': 0, 'hits': 0, 'misses': 0, 'cost': 0.0, 'pages': {},
+    })
+    for field in ('runs', 'hits', 'misses', 'cost'):
+        merged[field] += entry[field]
+    for slug, runs in entry['pages'].items():
+        merged['pages'][slug] = merged['pages'].get(slug, 0) + runs
+
+
+def trim_log(log):
+    """Forget the cheapest states so the log stays bounded"""
+    for key in sorted(log, key=lambda key: log[key]['cost'])[:max(len(log) - USAGE_LOG_MAX_STATES, 0)]:
+        del log[key]
+
+
+def is_warm(signature, slug):
+    """Whether the state's aggregates for the page were cached recently enough to still be there"""
+    with _log_lock:
+        cached = WARM.get(signature, {}).get(slug)
+    return cached is not None and time.time() - cached < WARM_TTL
+
+
+def mark_warm(signature, slug):
+    """Record that the state's aggregates for the page are now cached"""
+    with _log_lock:
+        WARM.setdefault(signature, {})[slug] = time.time()
+        WARM.move_to_end(signature)
+        while len(WARM) > WARM_MAX_STATES:
+            WARM.popitem(last=False)
+
+
+def clear_warm():
+    """Forget every warm entry (the caches were rebuilt for a new dataset)"""
+    with _log_lock:
+        WARM.clear()
+
+
+def anonymize_state(filter_state):
+    """Filter values as logged: no dataset version, and custom coordinates rounded"""
+    state = {key: value for key, value in filter_state.items() if key != 'dataset_version'}
+    if state.get('location'):
+        state['location'] = {
+            key: round(value, LOCATION_LOG_DECIMALS) if isinstance(value, float) else value
+            for key, value in state['location'].items()
+        }
+    return state
+
+
+def state_key(filter_state):
+    """Signature of a filter state as logged, which ignores the dataset version"""
+    return get_filter_signature(anonymize_state(filter_state))
+
+
+def record_run(filter_state, signature, slug, seconds, computed):
+    """Log one page run; a hit means none of its aggregates (computed of them) had to be computed"""
+    hit = computed == 0
+    state = anonymize_state(filter_state)
+    run = {'state': state, 'runs': 1, 'hits': int(hit), 'misses': int(not hit), 'cost': seconds, 'pages': {slug: 1}}
+    key = state_key(filter_state)
+    with _log_lock:
+        merge_entry(FILTER_LOG, key, run)
+        merge_entry(PENDING_LOG, key, run)
+        trim_log(FILTER_LOG)
+    mark_warm(signature, slug)
+    return hit
+
+
+def popular_states(n):
+    """The n logged states with the highest total compute cost, most expensive first"""
+    with _log_lock:
+        entries = sorted(FILTER_LOG.values(), key=lambda entry: entry['cost'], reverse=True)
+        return [dict(entry, pages=dict(entry['pages'])) for entry in entries[:n]]
+
+
+def usage_totals():
+    """Total hits and misses across every logged state"""
+    with _log_lock:
+        hits = sum(entry['hits'] for entry in FILTER_LOG.values())
+        misses = sum(entry['misses'] for entry in FILTER_LOG.values())
+    return hits, misses
+
+
+def describe_filter_state(state):
+    """Short human-readable summary of the filters a state applies"""
+    parts = []
+    for key, label in (('counties', 'Counties'), ('makes', 'Makes'), ('types', 'Types')):
+        if state.get(key):
+            values = state[key]
+            parts.append(f"{label}: {', '.join(values[:3])}{' +' + str(len(values) - 3) if len(values) > 3 else ''}")
+    if state.get('years'):
+        parts.append(f"Years {state['years'][0]}-{state['years'][1]}")
+    if state.get('price'):
+        parts.append(f"Price ${state['price'][0]:,}-${state['price'][1]:,}")
+    if state.get('cafv'):
+        parts.append("CAFV eligible")
+    if state.get('location'):
+        parts.append(state['location'].get('location_mode', "Location"))
+    return "; ".join(parts) or "No filters"
+
+
+def read_usage_log():
+    """The log saved next to the dataset, or an empty log"""
+    try:
+        with open(USAGE_LOG_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def refresh_log(saved):
+    """Replace this process's view of the log with the saved one plus its unsaved runs"""
+    with _log_lock:
+        FILTER_LOG.clear()
+        FILTER_LOG.update(saved)
+        for key, entry in PENDING_LOG.items():
+            merge_entry(FILTER_LOG, key, entry)
+        trim_log(FILTER_LOG)
+
+
+def load_usage_log():
+    """Load the persisted log next to the dataset, if there is one"""
+    refresh_log(read_usage_log())
+
+
+def save_usage_log():
+    """Merge this process's unsaved runs into the log next to the dataset, then reload it"""
+    if not os.path.isdir(os.path.dirname(USAGE_LOG_PATH)):
+        return
+    with _log_lock:
+        pending = {key: dict(entry, pages=dict(entry['pages'])) for key, entry in PENDING_LOG.items()}
+        PENDING_LOG.clear()
+    try:
+        with open(USAGE_LOG_LOCK_PATH, "a") as lock:
+            if fcntl is not None:
+                # Held across read-merge-replace so concurrent saves cannot drop each other's runs
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            saved = read_usage_log()
+            for key, entry in pending.items():
+                merge_entry(saved, key, entry)
+            trim_log(saved)
+            partial = f"{USAGE_LOG_PATH}.{os.getpid()}.partial"
+            with open(partial, "w") as f:
+                json.dump(saved, f, default=str)
+            os.replace(partial, USAGE_LOG_PATH)
+    except OSError:
+        logging.getLogger(__name__).exception("Could not save the filter usage log")
+        # Keep the runs for the next save
+        with _log_lock:
+            for key, entry in pending.items():
+                merge_entry(PENDING_LOG, key, entry)
+        return
+    refresh_log(saved)
@@ -0,0 +1,9 @@
+"""Page modules, each imported the first time its page is routed to."""
+
+from ev_dashboard.startup import timed_import
+
+
+def load_page(slug):
+    """Render function for a page slug, importing its module (and altair, for chart pages) on first use"""
+    module = timed_import(f'ev_dashboard.views.{slug}')
+    return getattr(module, f'{slug}_page')
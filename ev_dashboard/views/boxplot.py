@@ -0,0 +1,69 @@
+"""Box Analysis page."""
+
+import streamlit as st
+import altair as alt
+
+from ev_dashboard.analytics import top_k_counts
+from ev_dashboard.sidebar import go_to_page
+
+
+def boxplot_page(filtered_df, display_df):
+    """Box plot analysis page"""
+    st.markdown('<h1 class="main-header">Box Plot Analysis</h1>', unsafe_allow_html=True)
+
+    # Return to Home button
+    st.button("Return to Home", key="box_home", help="Go back to home page", on_click=go_to_page, args=("Home",))
+
+    if display_df.empty:
+        st.warning("No data available with current filters.")
+        return
+
+    # Main box plot
+    box_plot = alt.Chart(display_df).mark_boxplot().encode(
+        x=alt.X('Electric Vehicle Type:N', title='Vehicle Type'),
+        y=alt.Y('Electric Range:Q', title='Electric Range (miles)'),
+        color=alt.Color('Electric Vehicle Type:N', scale=alt.Scale(scheme='dark2'))
+    ).properties(
+        width=700,
+        height=500,
+        title="Electric Range Distribution by Vehicle Type"
+    )
+    st.altair_chart(box_plot, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Box plot by top makes
+        top_makes = top_k_counts(filtered_df, 'Make', 8)['Make']
+        top_makes_df = display_df[display_df['Make'].isin(top_makes)]
+
+        box_makes = alt.Chart(top_makes_df).mark_boxplot().encode(
+            x=alt.X('Make:N', title='Make'),
+            y=alt.Y('Electric Range:Q', title='Electric Range (miles)'),
+            color=alt.Color('Make:N', scale=alt.Scale(scheme='set3'))
+        ).properties(
+            width=350,
+            height=400,
+            title="Range by Top Makes"
+        )
+        st.altair_chart(box_makes, use_container_width=True)
+
+    with col2:
+        # Violin plot alternative
+        violin_plot = alt.Chart(display_df).mark_area(
+            orient='horizontal',
+            opacity=0.7
+        ).transform_density(
+            'Electric Range',
+            as_=['Electric Range', 'density'],
+            groupby=['Electric Vehicle Type']
+        ).encode(
+            x=alt.X('density:Q', title='Density'),
+            y=alt.Y('Electric Range:Q', title='Electric Range (miles)'),
+            color=alt.Color('Electric Vehicle Type:N', scale=alt.Scale(scheme='dark2'))
+        ).properties(
+            width=350,
+            height=400,
+            title="Range Density by Type"
+        )
+        st.altair_chart(violin_plot, use_container_width=True)
@@ -0,0 +1,24 @@
+"""Shared Altair color schemes and selections."""
+
+import altair as alt
+
+
+def get_color_schemes():
+    """Define professional color schemes for Altair"""
+    return {
+        'categorical': 'category20',
+        'sequential': 'viridis',
+        'diverging': 'redyellowblue',
+        'makes': 'set3',
+        'types': 'dark2',
+        'price': 'plasma',
+        'geographic': 'blues',
+        'performance': 'turbo'
+    }
+
+
+def create_selections():
+    """Create Altair selections for interactivity"""
+    click_selection = alt.selection_point(fields=['Electric Vehicle Type'])
+    brush_selection = alt.selection_interval()
+    return click_selection, brush_selection
@@ -0,0 +1,56 @@
+"""Distribution Analysis page."""
+
+import streamlit as st
+import altair as alt
+
+from ev_dashboard.sidebar import go_to_page
+
+
+def distribution_page(filtered_df, display_df):
+    """Distribution analysis page"""
+    st.markdown('<h1 class="main-header">Distribution Analysis</h1>', unsafe_allow_html=True)
+
+    # Return to Home button
+    st.button("Return to Home", key="dist_home", help="Go back to home page", on_click=go_to_page, args=("Home",))
+
+    if display_df.empty:
+        st.warning("No data available with current filters.")
+        return
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Histogram with overlaid curves
+        histogram = alt.Chart(display_df).mark_bar(opacity=0.7).encode(
+            x=alt.X('Electric Range:Q', bin=alt.Bin(maxbins=30), title='Electric Range (miles)'),
+            y=alt.Y('count()', title='Number of Vehicles'),
+            color=alt.Color('Electric Vehicle Type:N', scale=alt.Scale(scheme='dark2')),
+            tooltip=['count()']
+        ).properties(
+            width=350,
+            height=500,
+            title="Electric Range Distribution by Type"
+        )
+        st.altair_chart(histogram, use_container_width=True)
+
+    with col2:
+        # Box plot analysis
+        box_plot = alt.Chart(display_df).mark_boxplot(size=50).encode(
+            x=alt.X('Electric Vehicle Type:N', title='Vehicle Type'),
+            y=alt.Y('Electric Range:Q', title='Electric Range (miles)'),
+            color=alt.Color('Electric Vehicle Type:N', scale=alt.Scale(scheme='dark2'))
+        ).properties(
+            width=350,
+            height=500,
+            title="Range Distribution by Vehicle Type"
+        )
+        st.altair_chart(box_plot, use_container_width=True)
+
+    # Additional distribution metrics
+    st.markdown("### Statistical Summary")
+
+    stats_df = display_df.groupby('Electric Vehicle Type')['Electric Range'].agg([
+        'count', 'mean', 'median', 'std', 'min', 'max'
+    ]).round(2)
+
+    st.dataframe(stats_df, use_container_width=True)
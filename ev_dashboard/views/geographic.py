@@ -0,0 +1,255 @@
+"""Geographic Insights page."""
+
+import streamlit as st
+import pandas as pd
+import altair as alt
+import numpy as np
+
+from ev_dashboard.indexes import (
+    MAP_CELL_SIZES, UNKNOWN_LABEL, auto_map_level, build_facet_codes, build_geo_tree, build_grid_index,
+    geo_leaf_totals, geo_level_table, grid_cell_counts,
+)
+from ev_dashboard.analytics import (
+    MIN_REGION_VEHICLES, SIMILARITY_LEVELS, format_sketch_error, region_similarity, sketch_estimate,
+)
+from ev_dashboard.sidebar import go_to_page
+
+
+@st.fragment
+def geo_drill_down_section(geo_tree, leaf_totals):
+    """Drill down County > City > Postal Code > Census Tract; reruns on its own"""
+    st.markdown("### Regional Drill-Down")
+    parent_path = []
+    drill_columns = st.columns(len(geo_tree['levels']) - 1)
+    for depth, column in enumerate(drill_columns):
+        level = geo_tree['levels'][depth]
+        options = geo_level_table(geo_tree, leaf_totals, depth, parent_path)[level].tolist()
+        with column:
+            choice = st.selectbox(level, ["All"] + options, key=f"geo_drill_{depth}")
+        if choice == "All":
+            break
+        parent_path.append(choice)
+
+    child_level = geo_tree['levels'][len(parent_path)]
+    child_table = geo_level_table(geo_tree, leaf_totals, len(parent_path), parent_path)
+    child_table = child_table.drop(columns=geo_tree['levels'][:len(parent_path)])
+
+    drill_chart = alt.Chart(child_table.head(20)).mark_bar().encode(
+        x=alt.X('Count:Q', title='Number of Vehicles'),
+        y=alt.Y(f'{child_level}:N', sort='-x', title=child_level),
+        color=alt.Color('Avg Range:Q', scale=alt.Scale(scheme='viridis'), title='Avg Range'),
+        tooltip=[child_level, 'Count', alt.Tooltip('Avg MSRP:Q', format='$,.0f'),
+                 alt.Tooltip('Avg Range:Q', format='.0f')]
+    ).properties(
+        width=700,
+        height=400,
+        title=f"Top {child_level} Areas" + (f" in {' > '.join(parent_path)}" if parent_path else "")
+    )
+    st.altair_chart(drill_chart, use_container_width=True)
+    st.dataframe(child_table.round(1), use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def region_similarity_section(geo_tree, filtered_df, similarity_levels):
+    """Regions compared by their make or vehicle type mix; reruns on its own"""
+    st.markdown("### Regional Similarity & Clusters")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        granularity = st.selectbox("Compare", similarity_levels, key="similarity_level")
+    with col2:
+        feature = st.radio("By", ["Make mix", "Vehicle type mix"], horizontal=True, key="similarity_feature")
+    with col3:
+        n_clusters = st.slider("Clusters", min_value=2, max_value=8, value=4, key="similarity_clusters")
+
+    facet_column = 'Make' if feature == "Make mix" else 'Electric Vehicle Type'
+    facet = build_facet_codes(st.session_state.df, st.session_state.dataset_version)[facet_column]
+    similarity = region_similarity(
+        geo_tree, facet, filtered_df.index.to_numpy(), st.session_state.filter_signature,
+        geo_tree['levels'].index(granularity), facet_column, n_clusters
+    )
+
+    if similarity is None:
+        st.info(f"Not enough regions with {MIN_REGION_VEHICLES}+ vehicles to compare.")
+    else:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # Top-k most similar regions for a chosen region
+            by_volume = np.argsort(-similarity['vehicles'])
+            region = st.selectbox("Most similar to", similarity['regions'][by_volume], key="similarity_region")
+            position = int(np.flatnonzero(similarity['regions'] == region)[0])
+            similar = pd.DataFrame({
+                granularity: similarity['regions'][similarity['neighbors'][position]],
+                'Similarity': similarity['scores'][position].round(3),
+                'Vehicles': similarity['vehicles'][similarity['neighbors'][position]],
+                'Cluster': similarity['clusters'][similarity['neighbors'][position]] + 1,
+            })
+            st.dataframe(similar, use_container_width=True, hide_index=True)
+
+        with col2:
+            # Cluster profiles: average share of the most common categories per cluster
+            top_categories = np.argsort(-similarity['shares'].mean(axis=0))[:10]
+            profile = pd.DataFrame(
+                similarity['centers'][:, top_categories],
+                columns=[similarity['categories'][i] for i in top_categories]
+            )
+            profile['Cluster'] = [f"Cluster {i + 1} ({size})" for i, size in
+                                  enumerate(np.bincount(similarity['clusters'], minlength=len(profile)))]
+            profile = profile.melt(id_vars='Cluster', var_name=facet_column, value_name='Share')
+
+            profile_chart = alt.Chart(profile).mark_rect().encode(
+                x=alt.X(f'{facet_column}:N', title=facet_column),
+                y=alt.Y('Cluster:N', title='Cluster (regions)'),
+                color=alt.Color('Share:Q', scale=alt.Scale(scheme='viridis'), title='Avg Share'),
+                tooltip=['Cluster', facet_column, alt.Tooltip('Share:Q', format='.1%')]
+            ).properties(
+                width=350,
+                height=300,
+                title=f"{granularity} Cluster Profiles"
+            )
+            st.altair_chart(profile_chart, use_container_width=True)
+
+
+@st.fragment
+def adoption_map_section(grid_index, filtered_df):
+    """Grid-binned adoption map with its own focus and detail controls; reruns on its own"""
+    st.markdown("### EV Adoption Map")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        focus = st.selectbox("Map focus", ["All of Washington"] + sorted(grid_index['county_bounds']),
+                             key="map_focus")
+    with col2:
+        detail_options = ["Auto"] + [f"{size:g}° cells" for size in MAP_CELL_SIZES]
+        detail = st.select_slider("Map detail", options=detail_options, value="Auto", key="map_detail")
+
+    rows = filtered_df.index.to_numpy()
+    bounds = grid_index['county_bounds'].get(focus)
+    if detail == "Auto":
+        level = auto_map_level(grid_index, rows, bounds)
+    else:
+        level = detail_options.index(detail) - 1
+    cell_counts = grid_cell_counts(grid_index, level, rows, bounds)
+
+    adoption_map = alt.Chart(cell_counts).mark_circle(opacity=0.8).encode(
+        longitude='Longitude:Q',
+        latitude='Latitude:Q',
+        size=alt.Size('Count:Q', scale=alt.Scale(range=[10, 400]), title='Vehicles'),
+        color=alt.Color('Count:Q', scale=alt.Scale(scheme='viridis', type='log'), title='Vehicles'),
+        tooltip=[alt.Tooltip('Longitude:Q', format='.2f'), alt.Tooltip('Latitude:Q', format='.2f'), 'Count']
+    ).project(
+        type='mercator'
+    ).properties(
+        width=700,
+        height=500,
+        title=f"EV Registrations per {MAP_CELL_SIZES[level]:g}° Grid Cell"
+    )
+    st.altair_chart(adoption_map, use_container_width=True)
+    st.caption(f"{len(cell_counts):,} grid cells summarizing {len(filtered_df):,} vehicles")
+
+
+def geographic_page(filtered_df, display_df):
+    """Geographic insights and analysis"""
+    st.markdown('<h1 class="main-header">Geographic Market Insights</h1>', unsafe_allow_html=True)
+
+    # Return to Home button
+    st.button("Return to Home", key="geo_home", help="Go back to home page", on_click=go_to_page, args=("Home",))
+
+    if 'County' not in filtered_df.columns:
+        st.error("Geographic data not available in the dataset.")
+        return
+
+    if filtered_df.empty:
+        st.warning("No data available with current filters.")
+        return
+
+    # Geographic aggregates come from the rollup tree: one bincount over the filtered rows'
+    # leaf ids, then every level is a rollup over the leaf table
+    geo_tree = build_geo_tree(st.session_state.df, st.session_state.dataset_version)
+    leaf_totals = geo_leaf_totals(geo_tree, filtered_df.index.to_numpy())
+    county_table = geo_level_table(geo_tree, leaf_totals, 0)
+    county_table = county_table[county_table['County'] != UNKNOWN_LABEL]
+
+    # Geographic overview metrics
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        total_counties = len(county_table)
+        st.metric("Counties Covered", total_counties)
+
+    with col2:
+        if 'City' in geo_tree['levels']:
+            city_estimate = sketch_estimate('distinct', 'City')
+            if city_estimate is not None:
+                st.metric("Cities", f"≈ {city_estimate['value']:,.0f}")
+                st.caption(format_sketch_error(city_estimate))
+            else:
+                city_table = geo_level_table(geo_tree, leaf_totals, 1)
+                total_cities = city_table.loc[city_table['City'] != UNKNOWN_LABEL, 'City'].nunique()
+                st.metric("Cities", total_cities)
+
+    if county_table.empty:
+        return
+
+    with col3:
+        top_county = county_table['County'].iloc[0]
+        top_county_count = county_table['Count'].iloc[0]
+        st.metric("Leading County", f"{top_county} ({top_county_count:,})")
+
+    with col4:
+        county_adoption_rate = county_table['Count'].sum() / total_counties
+        st.metric("Avg per County", f"{county_adoption_rate:.0f}")
+
+    # Main geographic visualizations
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # County adoption ranking
+        county_counts = county_table[['County', 'Count']].head(15)
+
+        bar_chart = alt.Chart(county_counts).mark_bar().encode(
+            x=alt.X('Count:Q', title='Number of Vehicles'),
+            y=alt.Y('County:N', sort='-x', title='County'),
+            color=alt.Color('Count:Q', scale=alt.Scale(scheme='blues')),
+            tooltip=['County', 'Count']
+        ).properties(
+            width=350,
+            height=500,
+            title="Top 15 Counties by EV Adoption"
+        )
+        st.altair_chart(bar_chart, use_container_width=True)
+
+    with col2:
+        # Vehicle type distribution by counties
+        county_type_dist = county_table.head(8)[['County'] + geo_tree['ev_types']].melt(
+            id_vars='County', var_name='Electric Vehicle Type', value_name='Count'
+        )
+        county_type_dist = county_type_dist[county_type_dist['Count'] > 0]
+
+        stacked_bar = alt.Chart(county_type_dist).mark_bar().encode(
+            x=alt.X('County:N', title='County'),
+            y=alt.Y('Count:Q', title='Number of Vehicles'),
+            color=alt.Color('Electric Vehicle Type:N', scale=alt.Scale(scheme='dark2')),
+            tooltip=['County', 'Electric Vehicle Type', 'Count']
+        ).properties(
+            width=350,
+            height=500,
+            title="Vehicle Types by Top Counties"
+        )
+        st.altair_chart(stacked_bar, use_container_width=True)
+
+    # Drill down County > City > Postal Code > Census Tract
+    if len(geo_tree['levels']) > 1:
+        geo_drill_down_section(geo_tree, leaf_totals)
+
+    # Regions compared by their make or vehicle type mix
+    similarity_levels = [level for level in SIMILARITY_LEVELS if level in geo_tree['levels']]
+    if similarity_levels:
+        region_similarity_section(geo_tree, filtered_df, similarity_levels)
+
+    # Adoption map from server-side grid binning, so the chart size depends on the number of
+    # cells rather than the number of vehicles
+    grid_index = build_grid_index(st.session_state.df, st.session_state.dataset_version)
+    if grid_index is not None:
+        adoption_map_section(grid_index, filtered_df)
@@ -0,0 +1,81 @@
+"""Heatmap Analysis page."""
+
+import streamlit as st
+import pandas as pd
+import altair as alt
+import numpy as np
+
+from ev_dashboard.analytics import get_make_year_matrix
+from ev_dashboard.sidebar import go_to_page
+
+
+def heatmap_page(filtered_df, display_df):
+    """Heatmap analysis page"""
+    st.markdown('<h1 class="main-header">Heatmap Analysis</h1>', unsafe_allow_html=True)
+
+    # Return to Home button
+    st.button("Return to Home", key="heatmap_home", help="Go back to home page", on_click=go_to_page, args=("Home",))
+
+    if filtered_df.empty:
+        st.warning("No data available with current filters.")
+        return
+
+    # Create heatmap data, limited to the top makes for readability
+    make_year = get_make_year_matrix(filtered_df)
+    make_totals = make_year['matrix'].sum(axis=1)
+    top_makes = np.argsort(-make_totals, kind='stable')[:15]
+    top_makes = top_makes[make_totals[top_makes] > 0]
+    make_index, year_index = np.nonzero(make_year['matrix'][top_makes])
+    heatmap_data = pd.DataFrame({
+        'Make': make_year['makes'][top_makes[make_index]],
+        'Model Year': make_year['years'][year_index],
+        'Count': make_year['matrix'][top_makes[make_index], year_index],
+    })
+
+    heatmap = alt.Chart(heatmap_data).mark_rect().encode(
+        x=alt.X('Model Year:O', title='Model Year'),
+        y=alt.Y('Make:N', title='Make'),
+        color=alt.Color('Count:Q', scale=alt.Scale(scheme='viridis'), title='Vehicle Count'),
+        tooltip=['Make', 'Model Year', 'Count']
+    ).properties(
+        width=700,
+        height=600,
+        title="Vehicle Count Heatmap: Make vs Model Year"
+    )
+    st.altair_chart(heatmap, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Average range heatmap
+        avg_range_data = filtered_df.groupby(['Electric Vehicle Type', 'Model Year'])[
+            'Electric Range'].mean().reset_index()
+
+        range_heatmap = alt.Chart(avg_range_data).mark_rect().encode(
+            x=alt.X('Model Year:O', title='Model Year'),
+            y=alt.Y('Electric Vehicle Type:N', title='Vehicle Type'),
+            color=alt.Color('Electric Range:Q', scale=alt.Scale(scheme='plasma'), title='Avg Range'),
+            tooltip=['Electric Vehicle Type', 'Model Year', alt.Tooltip('Electric Range:Q', format='.1f')]
+        ).properties(
+            width=350,
+            height=400,
+            title="Average Range Heatmap"
+        )
+        st.altair_chart(range_heatmap, use_container_width=True)
+
+    with col2:
+        # Price heatmap (if available)
+        if 'Base MSRP' in filtered_df.columns:
+            price_data = filtered_df.groupby(['Electric Vehicle Type', 'Model Year'])['Base MSRP'].mean().dropna().reset_index()
+
+            price_heatmap = alt.Chart(price_data).mark_rect().encode(
+                x=alt.X('Model Year:O', title='Model Year'),
+                y=alt.Y('Electric Vehicle Type:N', title='Vehicle Type'),
+                color=alt.Color('Base MSRP:Q', scale=alt.Scale(scheme='blues'), title='Avg Price'),
+                tooltip=['Electric Vehicle Type', 'Model Year', alt.Tooltip('Base MSRP:Q', format='$,.0f')]
+            ).properties(
+                width=350,
+                height=400,
+                title="Average Price Heatmap"
+            )
+            st.altair_chart(price_heatmap, use_container_width=True)
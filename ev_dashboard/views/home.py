@@ -0,0 +1,179 @@
+"""Landing page."""
+
+import streamlit as st
+
+from ev_dashboard.analytics import SKETCH_FULL_QUERY, sketch_estimate, top_k_counts
+from ev_dashboard.data import has_price_data
+from ev_dashboard.sidebar import go_to_page
+
+
+def home_page():
+    """Enhanced landing page with comprehensive overview"""
+    st.markdown('<h1 class="main-header">Washington State EV Analytics Platform</h1>', unsafe_allow_html=True)
+
+    st.markdown("""
+    <div style='text-align: center; font-size: 1.3rem; color: #666; margin-bottom: 3rem;'>
+        Submitted for final project CSCA 5702 - Fundamentals of Data Visualization<br>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Enhanced key metrics overview
+    if not st.session_state.df.empty:
+        col1, col2, col3, col4, col5 = st.columns(5)
+
+        with col1:
+            total_vehicles = len(st.session_state.df)
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>Total EVs</h3>
+                <h2>{total_vehicles:,}</h2>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col2:
+            unique_makes = st.session_state.df['Make'].nunique()
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>Brands</h3>
+                <h2>{unique_makes}</h2>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col3:
+            # "n/a" rather than $nan when no vehicle has a published MSRP
+            avg_price = f"${st.session_state.df['Base MSRP'].mean():,.0f}" \
+                if has_price_data(st.session_state.df) else "n/a"
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>Avg Price</h3>
+                <h2>{avg_price}</h2>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col4:
+            avg_range = st.session_state.df['Electric Range'].mean()
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>Avg Range</h3>
+                <h2>{avg_range:.0f} mi</h2>
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col5:
+            if 'County' in st.session_state.df.columns:
+                counties = st.session_state.df['County'].nunique()
+                st.markdown(f"""
+                <div class="metric-card">
+                    <h3>Counties</h3>
+                    <h2>{counties}</h2>
+                </div>
+                """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    # Market insights
+    if not st.session_state.df.empty:
+        st.markdown('<h2 class="sub-header">Key Market Insights</h2>', unsafe_allow_html=True)
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            # Top Make
+            top_make, top_make_count = top_k_counts(st.session_state.df, 'Make', 1).iloc[0]
+            st.markdown(f"""
+            <div class="insight-box">
+                Market Leader: <strong>{top_make}</strong><br>
+                {top_make_count:,} vehicles ({top_make_count / len(st.session_state.df) * 100:.1f}% market share)
+            </div>
+            """, unsafe_allow_html=True)
+
+        with col2:
+            # Price insights
+            if has_price_data(st.session_state.df):
+                median_estimate = sketch_estimate(0.5, 'Base MSRP', SKETCH_FULL_QUERY)
+                median_price = st.session_state.df['Base MSRP'].median() if median_estimate is None else None
+                median_text = f"${median_price:,.0f}" if median_estimate is None else \
+                    f"≈ ${median_estimate['value']:,.0f} (±{median_estimate['error']:.0%})"
+                luxury_percent = (st.session_state.df['Base MSRP'].dropna() > 80000).mean() * 100
+                st.markdown(f"""
+                <div class="insight-box">
+                    Median Price: <strong>{median_text}</strong><br>
+                    {luxury_percent:.1f}% are luxury vehicles ($80K+)
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown("""
+                <div class="insight-box">
+                    Median Price: <strong>n/a</strong><br>
+                    No vehicle has a published MSRP
+                </div>
+                """, unsafe_allow_html=True)
+
+        with col3:
+            # Range insights
+            long_range_percent = (st.session_state.df['Electric Range'] > 300).mean() * 100
+            max_range = st.session_state.df['Electric Range'].max()
+            st.markdown(f"""
+            <div class="insight-box">
+                Max Range: <strong>{max_range:.0f} miles</strong><br>
+                {long_range_percent:.1f}% have 300+ mile range
+            </div>
+            """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    # Navigation guide with clickable sections
+    st.markdown('<h2 class="sub-header">Explore Advanced Analytics</h2>', unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.button(
+                "**Price Analytics**\n• MSRP vs Range performance analysis\n• Affordability trends by region\n• Value proposition insights",
+                key="price_nav", help="Click to navigate to Price Analytics",
+                on_click=go_to_page, args=("Price Analytics",))
+
+        st.button(
+                "**Geographic Insights**\n• County-level adoption patterns\n• Urban vs rural preferences\n• Regional market characteristics",
+                key="geo_nav", help="Click to navigate to Geographic Insights",
+                on_click=go_to_page, args=("Geographic Insights",))
+
+        st.button(
+                "**Performance Analysis**\n• Range distribution analysis\n• Technology advancement trends\n• Efficiency improvements",
+                key="perf_nav", help="Click to navigate to Performance Analysis",
+                on_click=go_to_page, args=("Performance Analysis",))
+
+        st.button(
+                "**Market Leaders**\n• Brand performance rankings\n• Model popularity analysis\n• Competitive landscape",
+                key="leaders_nav", help="Click to navigate to Market Leaders",
+                on_click=go_to_page, args=("Market Leaders",))
+
+    with col2:
+        st.button(
+                "**Distribution Analysis**\n• Electric range histograms\n• Statistical distribution insights\n• Frequency analysis by vehicle type",
+                key="dist_nav", help="Click to navigate to Distribution Analysis",
+                on_click=go_to_page, args=("Distribution Analysis",))
+
+        st.button(
+                "**Market Share**\n• Vehicle type market composition\n• Interactive pie chart visualization\n• Proportional analysis",
+                key="share_nav", help="Click to navigate to Market Share",
+                on_click=go_to_page, args=("Market Share",))
+
+        st.button(
+                "**Box Analysis**\n• Range distribution by vehicle type\n• Outlier identification\n• Statistical quartile analysis",
+                key="box_nav", help="Click to navigate to Box Analysis",
+                on_click=go_to_page, args=("Box Analysis",))
+
+        st.button(
+                "**Heatmap Analysis**\n• Make vs. model year correlation\n• Time-based trend analysis\n• Pattern recognition",
+                key="heatmap_nav", help="Click to navigate to Heatmap Analysis",
+                on_click=go_to_page, args=("Heatmap Analysis",))
+
+    # Footer
+    st.markdown("---")
+    st.markdown("""
+    <div style="text-align: center; color: #666; font-size: 12px; margin-top: 2rem;">
+        <p>© 2025 Godwin Effiong | CSCA5702 Final Project - University of Colorado Boulder</p>
+        <p><em>Built with Streamlit & Altair</em></p>
+    </div>
+    """, unsafe_allow_html=True)
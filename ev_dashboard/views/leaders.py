@@ -0,0 +1,199 @@
+"""Market Leaders page."""
+
+import streamlit as st
+import altair as alt
+
+from ev_dashboard.indexes import (
+    build_model_tree, get_model_leaf_stats, longest_range_vehicle, model_level_table,
+)
+from ev_dashboard.analytics import calculate_fastest_growing_make, top_k_counts
+from ev_dashboard.sidebar import go_to_page
+
+
+@st.fragment
+def model_drill_down_section(model_tree, leaf_stats):
+    """Drill down Make > Model > Model Year; each level's table is only built once its parent is picked"""
+    st.markdown("### Model Drill-Down")
+    parent_path = []
+    drill_columns = st.columns(len(model_tree['levels']) - 1)
+    for depth, column in enumerate(drill_columns):
+        level = model_tree['levels'][depth]
+        options = model_level_table(model_tree, leaf_stats, depth, parent_path)[level].tolist()
+        with column:
+            choice = st.selectbox(level, ["All"] + options, key=f"model_drill_{depth}")
+        if choice == "All":
+            break
+        parent_path.append(choice)
+
+    child_level = model_tree['levels'][len(parent_path)]
+    child_table = model_level_table(model_tree, leaf_stats, len(parent_path), parent_path)
+    child_table = child_table.drop(columns=model_tree['levels'][:len(parent_path)] + ['Top Row'])
+
+    drill_chart = alt.Chart(child_table.head(20)).mark_bar().encode(
+        x=alt.X('Count:Q', title='Number of Vehicles'),
+        y=alt.Y(f'{child_level}:N', sort='-x', title=child_level),
+        color=alt.Color('Avg Range:Q', scale=alt.Scale(scheme='viridis'), title='Avg Range'),
+        tooltip=[child_level, 'Count', alt.Tooltip('Avg Range:Q', format='.0f'), 'Max Range',
+                 alt.Tooltip('Avg MSRP:Q', format='$,.0f')]
+    ).properties(
+        width=700,
+        height=400,
+        title=f"Top {child_level} Groups" + (f" in {' > '.join(parent_path)}" if parent_path else "")
+    )
+    st.altair_chart(drill_chart, use_container_width=True)
+    st.dataframe(child_table.round(1), use_container_width=True, hide_index=True)
+
+
+def leaders_page(filtered_df, display_df):
+    """Market Leaders Analysis with comprehensive rankings"""
+    st.markdown('<h1 class="main-header">Market Leaders Analysis</h1>', unsafe_allow_html=True)
+
+    # Return to Home button
+    st.button("Return to Home", key="leaders_home", help="Go back to home page", on_click=go_to_page, args=("Home",))
+
+    if filtered_df.empty:
+        st.warning("No data available with current filters. Please adjust your selection.")
+        return
+
+    model_tree = build_model_tree(st.session_state.df, st.session_state.dataset_version)
+    leaf_stats = get_model_leaf_stats(model_tree, filtered_df)
+
+    # Leadership metrics
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        top_make, top_make_count = top_k_counts(filtered_df, 'Make', 1).iloc[0]
+        market_share = (top_make_count / len(filtered_df)) * 100
+        st.metric("Market Leader", top_make, f"{market_share:.1f}% share")
+
+    with col2:
+        if 'Base MSRP' in filtered_df.columns:
+            luxury_leader = top_k_counts(filtered_df, 'Make', 1, subset='luxury')
+            if not luxury_leader.empty:
+                st.metric("Luxury Leader", luxury_leader['Make'].iloc[0], f"{luxury_leader['Count'].iloc[0]} vehicles")
+
+    with col3:
+        leader_range, leader_make, _ = longest_range_vehicle(model_tree, leaf_stats)
+        st.metric("Range Leader", leader_make, f"{leader_range:.0f} mi")
+
+    with col4:
+        fastest_growing = calculate_fastest_growing_make(filtered_df)
+        if fastest_growing:
+            st.metric("Fastest Growing", fastest_growing[0], f"+{fastest_growing[1]:.1f}%")
+
+    # Main analysis charts
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Market share ranking
+        market_ranking = top_k_counts(filtered_df, 'Make', 10)
+        market_ranking['Market_Share'] = (market_ranking['Count'] / len(filtered_df) * 100).round(1)
+
+        ranking_chart = alt.Chart(market_ranking).mark_bar().encode(
+            x=alt.X('Market_Share:Q', title='Market Share (%)'),
+            y=alt.Y('Make:N', sort='-x', title='Vehicle Make'),
+            color=alt.Color('Market_Share:Q', scale=alt.Scale(scheme='blues'), legend=None),
+            tooltip=['Make', 'Count', alt.Tooltip('Market_Share:Q', format='.1f')]
+        ).properties(
+            width=350,
+            height=400,
+            title="Top 10 Market Share Leaders"
+        )
+        st.altair_chart(ranking_chart, use_container_width=True)
+
+    with col2:
+        # Performance vs Volume scatter
+        make_performance = filtered_df.groupby('Make').agg({
+            'Electric Range': 'mean',
+            'Make': 'count'
+        }).round(1)
+        make_performance.columns = ['Avg_Range', 'Volume']
+        make_performance = make_performance[make_performance['Volume'] >= 5].head(15).reset_index()
+
+        perf_volume_chart = alt.Chart(make_performance).mark_circle(size=100).encode(
+            x=alt.X('Volume:Q', title='Vehicle Volume'),
+            y=alt.Y('Avg_Range:Q', title='Average Range (miles)'),
+            size=alt.Size('Volume:Q', scale=alt.Scale(range=[100, 500]), legend=None),
+            color=alt.Color('Make:N', scale=alt.Scale(scheme='category20'), legend=None),
+            tooltip=['Make', 'Volume', alt.Tooltip('Avg_Range:Q', format='.1f')]
+        ).properties(
+            width=350,
+            height=400,
+            title="Performance vs Volume Matrix"
+        )
+        st.altair_chart(perf_volume_chart, use_container_width=True)
+
+    # Detailed rankings
+    st.markdown("### Detailed Market Rankings")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Volume leaders
+        st.markdown("#### Volume Leaders")
+        volume_leaders = top_k_counts(filtered_df, 'Make', 10)
+        volume_leaders.columns = ['Make', 'Vehicles']
+        volume_leaders['Rank'] = range(1, len(volume_leaders) + 1)
+        volume_leaders['Market Share'] = (volume_leaders['Vehicles'] / len(filtered_df) * 100).round(1)
+
+        st.dataframe(
+            volume_leaders[['Rank', 'Make', 'Vehicles', 'Market Share']],
+            use_container_width=True,
+            hide_index=True
+        )
+
+    with col2:
+        # Performance leaders
+        st.markdown("#### Range Performance Leaders")
+        range_leaders = filtered_df.groupby('Make')['Electric Range'].agg(['mean', 'max', 'count']).round(1)
+        range_leaders.columns = ['Avg Range', 'Max Range', 'Count']
+        range_leaders = range_leaders[range_leaders['Count'] >= 3].sort_values('Avg Range', ascending=False).head(10)
+        range_leaders['Rank'] = range(1, len(range_leaders) + 1)
+        range_leaders = range_leaders.reset_index()
+
+        st.dataframe(
+            range_leaders[['Rank', 'Make', 'Avg Range', 'Max Range']],
+            use_container_width=True,
+            hide_index=True
+        )
+
+    # Drill down Make > Model > Model Year
+    model_drill_down_section(model_tree, leaf_stats)
+
+    # Price leadership analysis
+    if 'Base MSRP' in filtered_df.columns:
+        st.markdown("### Price Segment Analysis")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # Premium segment leaders
+            premium_leaders = top_k_counts(filtered_df, 'Make', 8, subset='premium')
+            if not premium_leaders.empty:
+
+                premium_chart = alt.Chart(premium_leaders).mark_arc().encode(
+                    theta=alt.Theta('Count:Q'),
+                    color=alt.Color('Make:N', scale=alt.Scale(scheme='category20')),
+                    tooltip=['Make', 'Count']
+                ).properties(
+                    width=300,
+                    height=300,
+                    title="Premium Segment Leaders ($60K+)"
+                )
+                st.altair_chart(premium_chart, use_container_width=True)
+
+        with col2:
+            # Value segment leaders
+            value_leaders = top_k_counts(filtered_df, 'Make', 8, subset='value')
+            if not value_leaders.empty:
+
+                value_chart = alt.Chart(value_leaders).mark_arc().encode(
+                    theta=alt.Theta('Count:Q'),
+                    color=alt.Color('Make:N', scale=alt.Scale(scheme='set3')),
+                    tooltip=['Make', 'Count']
+                ).properties(
+                    width=300,
+                    height=300,
+                    title="Value Segment Leaders ($45K-)"
+                )
+                st.altair_chart(value_chart, use_container_width=True)
@@ -0,0 +1,144 @@
+"""Executive Dashboard page."""
+
+import streamlit as st
+import altair as alt
+
+from ev_dashboard.analytics import (
+    bootstrap_interval, calculate_growth_rate, calculate_market_concentration, calculate_price_trend,
+    calculate_range_trend, format_interval, top_k_counts,
+)
+from ev_dashboard.data import has_price_data
+from ev_dashboard.sidebar import go_to_page
+
+
+def overview_page(filtered_df, display_df):
+    """Executive dashboard with comprehensive KPIs"""
+    st.markdown('<h1 class="main-header">Executive Dashboard</h1>', unsafe_allow_html=True)
+
+    # Return to Home button
+    st.button("Return to Home", key="overview_home", help="Go back to home page", on_click=go_to_page, args=("Home",))
+
+    if filtered_df.empty:
+        st.warning("No data available with current filters. Please adjust your selection.")
+        return
+
+    # Executive KPIs
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        total_vehicles = len(filtered_df)
+        growth_rate = calculate_growth_rate(filtered_df)
+        st.metric(
+            "Total Vehicles",
+            f"{total_vehicles:,}",
+            f"{growth_rate:+.1f}% YoY" if growth_rate else None
+        )
+
+    with col2:
+        if not has_price_data(filtered_df):
+            # Unpriced rows are kept with a missing MSRP, so the filters can leave none priced
+            st.metric("Average Price", "n/a", help="No vehicle in the current filters has a published MSRP")
+        else:
+            avg_price = filtered_df['Base MSRP'].mean()
+            price_trend = calculate_price_trend(filtered_df)
+            st.metric(
+                "Average Price",
+                f"${avg_price:,.0f}",
+                f"{price_trend:+.1f}%" if price_trend else None
+            )
+            price_interval = bootstrap_interval(
+                filtered_df['Base MSRP'].to_numpy(dtype='float64'), st.session_state.filter_signature,
+                'Base MSRP', 'mean'
+            )
+            st.caption(format_interval(price_interval, "${:,.0f}"))
+
+    with col3:
+        avg_range = filtered_df['Electric Range'].mean()
+        range_trend = calculate_range_trend(filtered_df)
+        st.metric(
+            "Average Range",
+            f"{avg_range:.0f} mi",
+            f"{range_trend:+.1f}%" if range_trend else None
+        )
+        range_interval = bootstrap_interval(
+            filtered_df['Electric Range'].to_numpy(dtype='float64'), st.session_state.filter_signature,
+            'Electric Range', 'mean'
+        )
+        st.caption(format_interval(range_interval, "{:.0f} mi"))
+
+    with col4:
+        market_concentration = calculate_market_concentration(filtered_df)
+        st.metric("Market Concentration", f"{market_concentration:.1f}%")
+
+    # Main dashboard charts
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Market share evolution
+        if len(filtered_df) > 100:
+            yearly_trends = filtered_df.groupby(['Model Year', 'Electric Vehicle Type']).size().reset_index(
+                name='Count')
+
+            chart = alt.Chart(yearly_trends).mark_area().encode(
+                x=alt.X('Model Year:O', title='Model Year'),
+                y=alt.Y('Count:Q', title='Number of Vehicles'),
+                color=alt.Color('Electric Vehicle Type:N', scale=alt.Scale(scheme='category20')),
+                tooltip=['Model Year', 'Electric Vehicle Type', 'Count']
+            ).properties(
+                width=350,
+                height=400,
+                title="Market Evolution by Vehicle Type"
+            )
+            st.altair_chart(chart, use_container_width=True)
+
+    with col2:
+        # Price vs Performance scatter
+        if 'Base MSRP' in filtered_df.columns:
+            priced_display_df = display_df[display_df['Base MSRP'].notna()]
+            scatter = alt.Chart(priced_display_df).mark_circle(size=60, opacity=0.7).encode(
+                x=alt.X('Electric Range:Q', title='Electric Range (miles)'),
+                y=alt.Y('Base MSRP:Q', title='Base MSRP ($)', scale=alt.Scale(type='log')),
+                color=alt.Color('Electric Vehicle Type:N', scale=alt.Scale(scheme='dark2')),
+                size=alt.Size('Model Year:O', scale=alt.Scale(range=[50, 200])),
+                tooltip=['Make', 'Model', 'Electric Range', 'Base MSRP', 'Electric Vehicle Type']
+            ).properties(
+                width=350,
+                height=400,
+                title="Price vs Performance Matrix"
+            ).interactive()
+            st.altair_chart(scatter, use_container_width=True)
+
+    # Geographic and competitive analysis
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Top performing counties
+        if 'County' in filtered_df.columns:
+            county_adoption = top_k_counts(filtered_df, 'County', 10)
+
+            bar_chart = alt.Chart(county_adoption).mark_bar().encode(
+                x=alt.X('Count:Q', title='Number of Vehicles'),
+                y=alt.Y('County:N', sort='-x', title='County'),
+                color=alt.Color('Count:Q', scale=alt.Scale(scheme='viridis')),
+                tooltip=['County', 'Count']
+            ).properties(
+                width=350,
+                height=400,
+                title="Top Counties by EV Adoption"
+            )
+            st.altair_chart(bar_chart, use_container_width=True)
+
+    with col2:
+        # Brand market share
+        brand_share = top_k_counts(filtered_df, 'Make', 8)
+
+        pie_chart = alt.Chart(brand_share).mark_arc().encode(
+            theta=alt.Theta('Count:Q'),
+            color=alt.Color('Make:N', scale=alt.Scale(scheme='set3')),
+            tooltip=['Make', 'Count']
+        ).properties(
+            width=350,
+            height=400,
+            title="Brand Market Share (Top 8)"
+        )
+        st.altair_chart(pie_chart, use_container_width=True)
@@ -0,0 +1,86 @@
+"""Performance Analysis page."""
+
+import streamlit as st
+import altair as alt
+
+from ev_dashboard.indexes import build_model_tree, get_model_leaf_stats, longest_range_vehicle
+from ev_dashboard.analytics import calculate_range_improvement
+from ev_dashboard.sidebar import go_to_page
+
+
+def performance_page(filtered_df, display_df):
+    """Performance and range analysis"""
+    st.markdown('<h1 class="main-header">Performance Analytics</h1>', unsafe_allow_html=True)
+
+    # Return to Home button
+    st.button("Return to Home", key="perf_home", help="Go back to home page", on_click=go_to_page, args=("Home",))
+
+    if filtered_df.empty:
+        st.warning("No data available with current filters.")
+        return
+
+    # Performance metrics
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        model_tree = build_model_tree(st.session_state.df, st.session_state.dataset_version)
+        max_range, max_make, max_model = longest_range_vehicle(model_tree, get_model_leaf_stats(model_tree, filtered_df))
+        st.metric("Max Range", f"{max_range:.0f} mi", f"{max_make} {max_model}")
+
+    with col2:
+        long_range_count = (filtered_df['Electric Range'] > 300).sum()
+        long_range_percent = (long_range_count / len(filtered_df)) * 100
+        st.metric("Long Range (300mi+)", f"{long_range_count:,} ({long_range_percent:.1f}%)")
+
+    with col3:
+        range_improvement = calculate_range_improvement(filtered_df)
+        st.metric("Range Improvement", f"{range_improvement:.1f}%" if range_improvement else "N/A")
+
+    with col4:
+        avg_range_by_year = filtered_df.groupby('Model Year')['Electric Range'].mean()
+        if len(avg_range_by_year) > 1:
+            latest_avg = avg_range_by_year.iloc[-1]
+            st.metric("Latest Avg Range", f"{latest_avg:.0f} mi")
+
+    # Range analysis charts
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Range evolution over time
+        range_trends = filtered_df.groupby(['Model Year', 'Electric Vehicle Type'])[
+            'Electric Range'].mean().reset_index()
+
+        trend_chart = alt.Chart(range_trends).mark_line(point=True).encode(
+            x=alt.X('Model Year:O', title='Model Year'),
+            y=alt.Y('Electric Range:Q', title='Average Range (miles)'),
+            color=alt.Color('Electric Vehicle Type:N', scale=alt.Scale(scheme='category20')),
+            tooltip=['Model Year', 'Electric Vehicle Type', alt.Tooltip('Electric Range:Q', format='.1f')]
+        ).properties(
+            width=350,
+            height=400,
+            title="Range Evolution by Vehicle Type"
+        )
+        st.altair_chart(trend_chart, use_container_width=True)
+
+    with col2:
+        # Top performers by make
+        make_performance = filtered_df.groupby('Make').agg({
+            'Electric Range': ['mean', 'max', 'count']
+        }).round(1)
+        make_performance.columns = ['Avg_Range', 'Max_Range', 'Count']
+        make_performance = make_performance[make_performance['Count'] >= 5].sort_values('Avg_Range',
+                                                                                        ascending=False).head(
+            10).reset_index()
+
+        scatter_performance = alt.Chart(make_performance).mark_circle(size=100).encode(
+            x=alt.X('Avg_Range:Q', title='Average Range (miles)'),
+            y=alt.Y('Max_Range:Q', title='Maximum Range (miles)'),
+            size=alt.Size('Count:Q', scale=alt.Scale(range=[100, 400])),
+            color=alt.Color('Make:N', scale=alt.Scale(scheme='set3')),
+            tooltip=['Make', 'Avg_Range', 'Max_Range', 'Count']
+        ).properties(
+            width=350,
+            height=400,
+            title="Make Performance Matrix"
+        )
+        st.altair_chart(scatter_performance, use_container_width=True)
@@ -0,0 +1,52 @@
+"""Market Share page."""
+
+import streamlit as st
+import altair as alt
+
+from ev_dashboard.analytics import top_k_counts
+from ev_dashboard.sidebar import go_to_page
+
+
+def pie_page(filtered_df, display_df):
+    """Pie chart and market share analysis"""
+    st.markdown('<h1 class="main-header">Market Share Analysis</h1>', unsafe_allow_html=True)
+
+    # Return to Home button
+    st.button("Return to Home", key="pie_home", help="Go back to home page", on_click=go_to_page, args=("Home",))
+
+    if filtered_df.empty:
+        st.warning("No data available with current filters.")
+        return
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Vehicle Type Market Share
+        type_counts = filtered_df['Electric Vehicle Type'].value_counts().reset_index()
+        type_counts.columns = ['Type', 'Count']
+
+        pie_type = alt.Chart(type_counts).mark_arc().encode(
+            theta=alt.Theta('Count:Q'),
+            color=alt.Color('Type:N', scale=alt.Scale(scheme='dark2')),
+            tooltip=['Type', 'Count']
+        ).properties(
+            width=350,
+            height=400,
+            title="Market Share by Vehicle Type"
+        )
+        st.altair_chart(pie_type, use_container_width=True)
+
+    with col2:
+        # Top Makes Market Share
+        make_counts = top_k_counts(filtered_df, 'Make', 8)
+
+        pie_make = alt.Chart(make_counts).mark_arc().encode(
+            theta=alt.Theta('Count:Q'),
+            color=alt.Color('Make:N', scale=alt.Scale(scheme='set3')),
+            tooltip=['Make', 'Count']
+        ).properties(
+            width=350,
+            height=400,
+            title="Top 8 Makes Market Share"
+        )
+        st.altair_chart(pie_make, use_container_width=True)
@@ -0,0 +1,124 @@
+"""Price Analytics page."""
+
+import streamlit as st
+import altair as alt
+
+from ev_dashboard.analytics import bootstrap_interval, format_interval, format_sketch_error, sketch_estimate
+from ev_dashboard.sidebar import go_to_page
+
+
+def price_page(filtered_df, display_df):
+    """Advanced price analytics page"""
+    st.markdown('<h1 class="main-header">Price Analytics Dashboard</h1>', unsafe_allow_html=True)
+
+    # Return to Home button
+    st.button("Return to Home", key="price_home", help="Go back to home page", on_click=go_to_page, args=("Home",))
+
+    if 'Base MSRP' not in filtered_df.columns:
+        st.error("Price data not available in the dataset.")
+        return
+
+    # Vehicles without a published MSRP stay in the dataset but are left out of price analytics
+    filtered_df = filtered_df[filtered_df['Base MSRP'].notna()]
+
+    if filtered_df.empty:
+        st.warning("No data available with current filters.")
+        return
+
+    # Price distribution overview
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        median_estimate = sketch_estimate(0.5, 'Base MSRP')
+        if median_estimate is not None:
+            st.metric("Median Price", f"≈ ${median_estimate['value']:,.0f}")
+            st.caption(format_sketch_error(median_estimate))
+        else:
+            median_price = filtered_df['Base MSRP'].median()
+            st.metric("Median Price", f"${median_price:,.0f}")
+            median_interval = bootstrap_interval(
+                filtered_df['Base MSRP'].to_numpy(dtype='float64'), st.session_state.filter_signature,
+                'Base MSRP', 'median'
+            )
+            st.caption(format_interval(median_interval, "${:,.0f}"))
+
+    with col2:
+        luxury_count = (filtered_df['Base MSRP'] > 80000).sum()
+        luxury_percent = (luxury_count / len(filtered_df)) * 100
+        st.metric("Luxury Vehicles", f"{luxury_count:,} ({luxury_percent:.1f}%)")
+
+    with col3:
+        affordable_count = (filtered_df['Base MSRP'] < 30000).sum()
+        affordable_percent = (affordable_count / len(filtered_df)) * 100
+        st.metric("Affordable (<$30K)", f"{affordable_count:,} ({affordable_percent:.1f}%)")
+
+    # Price analysis charts
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Price distribution histogram
+        histogram = alt.Chart(filtered_df).mark_bar().encode(
+            x=alt.X('Base MSRP:Q', bin=alt.Bin(maxbins=30), title='Base MSRP ($)'),
+            y=alt.Y('count()', title='Number of Vehicles'),
+            color=alt.Color('Electric Vehicle Type:N', scale=alt.Scale(scheme='dark2')),
+            tooltip=['count()']
+        ).properties(
+            width=350,
+            height=400,
+            title="Price Distribution by Vehicle Type"
+        )
+        st.altair_chart(histogram, use_container_width=True)
+
+    with col2:
+        # Price efficiency analysis
+        filtered_df_copy = filtered_df.copy()
+        filtered_df_copy['Price_per_Mile'] = filtered_df_copy['Base MSRP'] / filtered_df_copy['Electric Range']
+        efficiency_data = filtered_df_copy.groupby('Make')['Price_per_Mile'].mean().sort_values().head(10).reset_index()
+
+        efficiency_chart = alt.Chart(efficiency_data).mark_bar().encode(
+            x=alt.X('Price_per_Mile:Q', title='Price per Mile ($)'),
+            y=alt.Y('Make:N', sort='-x', title='Make'),
+            color=alt.Color('Price_per_Mile:Q', scale=alt.Scale(scheme='plasma')),
+            tooltip=['Make', alt.Tooltip('Price_per_Mile:Q', format='.2f')]
+        ).properties(
+            width=350,
+            height=400,
+            title="Price Efficiency by Make"
+        )
+        st.altair_chart(efficiency_chart, use_container_width=True)
+
+    # Advanced price analysis
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Price trends over time
+        price_trends = filtered_df.groupby(['Model Year', 'Electric Vehicle Type'])['Base MSRP'].mean().reset_index()
+
+        trend_chart = alt.Chart(price_trends).mark_line(point=True).encode(
+            x=alt.X('Model Year:O', title='Model Year'),
+            y=alt.Y('Base MSRP:Q', title='Average Price ($)'),
+            color=alt.Color('Electric Vehicle Type:N', scale=alt.Scale(scheme='category20')),
+            tooltip=['Model Year', 'Electric Vehicle Type', alt.Tooltip('Base MSRP:Q', format='$,.0f')]
+        ).properties(
+            width=350,
+            height=400,
+            title="Average Price Trends Over Time"
+        )
+        st.altair_chart(trend_chart, use_container_width=True)
+
+    with col2:
+        # Price categories
+        if 'Price_Category' in filtered_df.columns:
+            price_cat_dist = filtered_df['Price_Category'].value_counts().reset_index()
+            price_cat_dist.columns = ['Category', 'Count']
+
+            pie_chart = alt.Chart(price_cat_dist).mark_arc().encode(
+                theta=alt.Theta('Count:Q'),
+                color=alt.Color('Category:N', scale=alt.Scale(scheme='plasma')),
+                tooltip=['Category', 'Count']
+            ).properties(
+                width=350,
+                height=400,
+                title="Market Segmentation by Price"
+            )
+            st.altair_chart(pie_chart, use_container_width=True)
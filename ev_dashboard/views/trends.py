@@ -0,0 +1,157 @@
+"""Trends Analysis page."""
+
+import streamlit as st
+import pandas as pd
+import altair as alt
+import numpy as np
+
+from ev_dashboard.indexes import build_facet_codes
+from ev_dashboard.analytics import (
+    FORECAST_YEARS, adoption_forecast, fit_adoption_curves, get_make_year_matrix,
+)
+from ev_dashboard.sidebar import go_to_page
+
+
+@st.fragment
+def adoption_forecast_section(filtered_df):
+    """Per-county or per-make adoption curves with forecast bands; reruns on its own"""
+    st.markdown("### Adoption Forecast")
+    facets = build_facet_codes(st.session_state.df, st.session_state.dataset_version)
+    group_options = [column for column in ['County', 'Make'] if column in facets]
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        group_column = st.radio("Forecast by", group_options, key="forecast_group")
+
+    facet = facets[group_column]
+    rows = filtered_df.index.to_numpy()
+    curves = fit_adoption_curves(
+        facet['codes'][rows], st.session_state.df['Model Year'].to_numpy()[rows],
+        facet['options'], st.session_state.filter_signature, group_column
+    )
+    if curves is None:
+        return
+
+    by_volume = np.argsort(-curves['cumulative'][:, -1])
+    default_groups = [curves['options'][i] for i in by_volume[:5] if curves['valid'][i]]
+    with col2:
+        selected_groups = st.multiselect(
+            f"{group_column} curves", [curves['options'][i] for i in by_volume if curves['valid'][i]],
+            default=default_groups, key=f"forecast_{group_column}"
+        )
+
+    if selected_groups:
+        actual_frames, forecast_frames = [], []
+        for group in selected_groups:
+            actual, forecast = adoption_forecast(curves, facet['positions'][group])
+            actual_frames.append(actual.assign(Group=group))
+            if forecast is not None:
+                forecast_frames.append(forecast.assign(Group=group))
+        actual_data = pd.concat(actual_frames)
+        actual_data = actual_data[actual_data['Vehicles'] > 0]
+
+        actual_lines = alt.Chart(actual_data).mark_line(point=True).encode(
+            x=alt.X('Model Year:O', title='Model Year'),
+            y=alt.Y('Vehicles:Q', title='Cumulative Vehicles', scale=alt.Scale(type='log')),
+            color=alt.Color('Group:N', scale=alt.Scale(scheme='category20'), title=group_column),
+            tooltip=['Group', 'Model Year', 'Vehicles']
+        )
+        layers = [actual_lines]
+        if forecast_frames:
+            forecast_data = pd.concat(forecast_frames)
+            forecast_band = alt.Chart(forecast_data).mark_area(opacity=0.2).encode(
+                x='Model Year:O',
+                y='Lower:Q',
+                y2='Upper:Q',
+                color=alt.Color('Group:N', scale=alt.Scale(scheme='category20'), title=group_column)
+            )
+            forecast_line = alt.Chart(forecast_data).mark_line(strokeDash=[6, 4], point=True).encode(
+                x='Model Year:O',
+                y='Vehicles:Q',
+                color=alt.Color('Group:N', scale=alt.Scale(scheme='category20'), title=group_column),
+                tooltip=['Group', 'Model Year', alt.Tooltip('Vehicles:Q', format=',.0f'),
+                         alt.Tooltip('Lower:Q', format=',.0f'), alt.Tooltip('Upper:Q', format=',.0f')]
+            )
+            layers += [forecast_band, forecast_line]
+
+        forecast_chart = alt.layer(*layers).properties(
+            width=700,
+            height=450,
+            title=f"Cumulative Registrations with {FORECAST_YEARS}-Year Forecast (95% band)"
+        )
+        st.altair_chart(forecast_chart, use_container_width=True)
+
+        growth = pd.DataFrame({
+            group_column: selected_groups,
+            'Vehicles': [int(curves['cumulative'][facet['positions'][g], -1]) for g in selected_groups],
+            'Annual Growth (%)': [(np.exp(curves['slope'][facet['positions'][g]]) - 1) * 100 for g in selected_groups],
+        }).round(1)
+        st.dataframe(growth, use_container_width=True, hide_index=True)
+
+
+def trends_page(filtered_df, display_df):
+    """Trends analysis page"""
+    st.markdown('<h1 class="main-header">Trend Analysis</h1>', unsafe_allow_html=True)
+
+    # Return to Home button
+    st.button("Return to Home", key="trends_home", help="Go back to home page", on_click=go_to_page, args=("Home",))
+
+    if filtered_df.empty:
+        st.warning("No data available with current filters.")
+        return
+
+    # Average range trends over time
+    range_trends = filtered_df.groupby(['Model Year', 'Electric Vehicle Type'])['Electric Range'].mean().reset_index()
+
+    trend_chart = alt.Chart(range_trends).mark_line(point=True).encode(
+        x=alt.X('Model Year:O', title='Model Year'),
+        y=alt.Y('Electric Range:Q', title='Average Electric Range (miles)'),
+        color=alt.Color('Electric Vehicle Type:N', scale=alt.Scale(scheme='dark2')),
+        tooltip=['Model Year', 'Electric Vehicle Type', alt.Tooltip('Electric Range:Q', format='.1f')]
+    ).properties(
+        width=700,
+        height=500,
+        title="Average Electric Range Trends by Vehicle Type"
+    )
+    st.altair_chart(trend_chart, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # Vehicle count trends
+        count_trends = filtered_df.groupby(['Model Year', 'Electric Vehicle Type']).size().reset_index(name='Count')
+
+        area_chart = alt.Chart(count_trends).mark_area().encode(
+            x=alt.X('Model Year:O', title='Model Year'),
+            y=alt.Y('Count:Q', title='Number of Vehicles'),
+            color=alt.Color('Electric Vehicle Type:N', scale=alt.Scale(scheme='category20')),
+            tooltip=['Model Year', 'Electric Vehicle Type', 'Count']
+        ).properties(
+            width=350,
+            height=400,
+            title="Vehicle Registration Trends"
+        )
+        st.altair_chart(area_chart, use_container_width=True)
+
+    with col2:
+        # Make diversity over time
+        make_year = get_make_year_matrix(filtered_df)
+        active_years = make_year['matrix'].sum(axis=0) > 0
+        make_diversity = pd.DataFrame({
+            'Model Year': make_year['years'][active_years],
+            'Unique_Makes': (make_year['matrix'][:, active_years] > 0).sum(axis=0),
+        })
+
+        diversity_chart = alt.Chart(make_diversity).mark_bar().encode(
+            x=alt.X('Model Year:O', title='Model Year'),
+            y=alt.Y('Unique_Makes:Q', title='Number of Unique Makes'),
+            color=alt.Color('Unique_Makes:Q', scale=alt.Scale(scheme='viridis')),
+            tooltip=['Model Year', 'Unique_Makes']
+        ).properties(
+            width=350,
+            height=400,
+            title="Make Diversity Over Time"
+        )
+        st.altair_chart(diversity_chart, use_container_width=True)
+
+    # Adoption curves with forecast bands
+    adoption_forecast_section(filtered_df)
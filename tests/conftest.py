@@ -0,0 +1,23 @@
+"""Shared fixtures: the app package imported from the repo root against a throwaway data directory."""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+# Set before ev_dashboard is imported, so the shared dataset and result store land in a temp dir
+os.environ["EV_DATA_PATH"] = os.path.join(tempfile.mkdtemp(prefix="ev-tests-"), "electric_vehicle_population.csv")
+
+from ev_dashboard.data import DATA_PATH, parse_dataset  # noqa: E402
+from tools.load_test import write_synthetic_dataset  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def vehicles():
+    """A cleaned synthetic dataset shaped like the DOL file"""
+    write_synthetic_dataset(5000, DATA_PATH, seed=1)
+    df, _ = parse_dataset()
+    return df
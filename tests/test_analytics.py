@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import pytest
+import streamlit as st
+
+from ev_dashboard import analytics
+from ev_dashboard.analytics import (
+    SKETCH_HLL_PRECISION, SKETCH_QUANTILE_COLUMNS, SKETCH_RELATIVE_ACCURACY, TOP_K_SUBSETS, build_make_year_matrix,
+    hll_estimate, hll_registers, largest_k, mix64, sketch_estimate, sketch_top_k,
+)
+from ev_dashboard.indexes import build_facet_codes
+
+
+def exact_top_k(codes, k):
+    counts = np.bincount(codes[codes >= 0])
+    top = largest_k(counts, k)
+    return top, counts[top]
+
+
+def skewed_codes(n_rows, n_options, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = (rng.zipf(1.3, n_rows) - 1) % n_options
+    codes[rng.random(n_rows) < 0.01] = -1  # missing values
+    return codes.astype(np.int64)
+
+
+def test_sketch_top_k_matches_bincount_on_skewed_data(monkeypatch):
+    monkeypatch.setattr(analytics, 'TOP_K_SKETCH_CHUNK', 50_000)
+    codes = skewed_codes(600_000, 20_000)
+    for k in (1, 10, 50):
+        top, counts = sketch_top_k(codes, None, None, k)
+        expected_top, expected_counts = exact_top_k(codes, k)
+        assert top.tolist() == expected_top.tolist()
+        assert counts.tolist() == expected_counts.tolist()
+
+
+def test_sketch_top_k_applies_the_price_subset(monkeypatch):
+    monkeypatch.setattr(analytics, 'TOP_K_SKETCH_CHUNK', 50_000)
+    codes = skewed_codes(300_000, 5_000, seed=1)
+    prices = np.random.default_rng(2).uniform(20_000, 120_000, len(codes))
+    low, high = TOP_K_SUBSETS['luxury']
+    top, counts = sketch_top_k(codes, prices, 'luxury', 8)
+    expected_top, expected_counts = exact_top_k(codes[(prices > low) & (prices <= high)], 8)
+    assert top.tolist() == expected_top.tolist()
+    assert counts.tolist() == expected_counts.tolist()
+
+
+def test_compute_top_k_takes_the_sketch_path_above_the_row_threshold(monkeypatch):
+    monkeypatch.setattr(analytics, 'TOP_K_SKETCH_ROWS', 1_000)
+    calls = []
+    monkeypatch.setattr(analytics, 'sketch_top_k', lambda *args: calls.append(args) or sketch_top_k(*args))
+    codes = skewed_codes(50_000, 300, seed=3)
+    options = [f"option {code}" for code in range(300)]
+    result = analytics.compute_top_k(codes, None, options, 'Make', 'sketch-threshold-test', 5, None, len(codes))
+    expected_top, expected_counts = exact_top_k(codes, 5)
+    assert calls
+    assert result['Make'].tolist() == [options[code] for code in expected_top]
+    assert result['Count'].tolist() == expected_counts.tolist()
+
+
+# Sketch estimates against the exact pandas answer, within their stated error bounds
+
+HLL_STANDARD_ERROR = 1.04 / np.sqrt(1 << SKETCH_HLL_PRECISION)
+
+
+@pytest.mark.parametrize('n_distinct', [50, 5_000, 200_000])
+def test_hll_estimate_is_within_three_standard_errors(n_distinct):
+    codes = np.random.default_rng(n_distinct).permutation(np.repeat(np.arange(n_distinct), 3))
+    registers = hll_registers(np.zeros(len(codes), dtype=np.int64), mix64(codes), 1)
+    assert abs(hll_estimate(registers[0]) / n_distinct - 1) <= 3 * HLL_STANDARD_ERROR
+
+
+@pytest.fixture
+def approx_session(vehicles):
+    st.session_state.df = vehicles
+    st.session_state.dataset_version = "vehicles"
+    st.session_state.approx_mode = True
+    yield vehicles
+    for key in ('df', 'dataset_version', 'approx_mode'):
+        del st.session_state[key]
+
+
+def sketch_queries(df):
+    facets = build_facet_codes(df, "vehicles")
+    make_positions = facets['Make']['positions']
+    return [
+        (analytics.SKETCH_FULL_QUERY, np.ones(len(df), dtype=bool)),
+        ({'makes': [make_positions['TESLA'], make_positions['KIA']], 'types': [0], 'years': (2016, 2022)},
+         df['Make'].isin(['TESLA', 'KIA']) & (df['Electric Vehicle Type'] == facets['Electric Vehicle Type']['options'][0])
+         & df['Model Year'].between(2016, 2022)),
+    ]
+
+
+def test_sketch_distinct_cities_match_pandas(approx_session):
+    for query, mask in sketch_queries(approx_session):
+        estimate = sketch_estimate('distinct', 'City', query)
+        exact = approx_session.loc[mask, 'City'].nunique()
+        assert estimate['error'] == HLL_STANDARD_ERROR
+        assert abs(estimate['value'] / exact - 1) <= 3 * HLL_STANDARD_ERROR
+
+
+def test_sketch_quantiles_are_within_the_relative_accuracy(approx_session):
+    for query, mask in sketch_queries(approx_session):
+        for column in SKETCH_QUANTILE_COLUMNS:
+            values = approx_session.loc[mask, column]
+            values = values[values > 0].to_numpy(dtype='float64')
+            for statistic in (0.1, 0.5, 0.9):
+                estimate = sketch_estimate(statistic, column, query)
+                exact = np.quantile(values, statistic, method='higher')
+                assert abs(estimate['value'] / exact - 1) <= SKETCH_RELATIVE_ACCURACY
+
+
+def test_sketch_estimate_defers_to_the_exact_path_outside_approximate_mode(approx_session):
+    st.session_state.approx_mode = False
+    assert sketch_estimate(0.5, 'Base MSRP', analytics.SKETCH_FULL_QUERY) is None
+
+
+def test_make_year_matrix_matches_crosstab(vehicles):
+    facet = build_facet_codes(vehicles, "vehicles")['Make']
+    rows = np.flatnonzero((vehicles['Electric Range'] > 100).to_numpy())
+    result = build_make_year_matrix(facet['codes'][rows], vehicles['Model Year'].to_numpy()[rows],
+                                    facet['options'], 'make-year-matrix-test', len(rows))
+    subset = vehicles.iloc[rows]
+    expected = pd.crosstab(subset['Make'], subset['Model Year'])
+    matrix = pd.DataFrame(result['matrix'], index=result['makes'], columns=result['years'])
+    assert (matrix.loc[expected.index, expected.columns].to_numpy() == expected.to_numpy()).all()
+    assert matrix.to_numpy().sum() == len(rows)
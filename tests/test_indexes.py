@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+
+from ev_dashboard.indexes import build_grid_index, grid_cell_counts
+
+
+def expected_cell_counts(df, origin, cell_size):
+    """Vehicles per grid cell computed directly with pandas"""
+    cells = pd.DataFrame({
+        'column': np.floor((df['Longitude'].astype('float64') - origin[0]) / cell_size),
+        'row': np.floor((df['Latitude'].astype('float64') - origin[1]) / cell_size),
+    }).dropna()
+    return cells.value_counts().sort_index()
+
+
+def test_grid_ignores_empty_cells_around_an_outlier(vehicles):
+    df = vehicles.copy()
+    # One mis-geocoded vehicle on the other side of the world
+    df.loc[df.index[0], ['Longitude', 'Latitude']] = [150.0, -30.0]
+    grid_index = build_grid_index(df, "outlier")
+
+    finest = grid_index['levels'][-1]
+    assert len(finest['grid_cells']) <= len(df)
+    cell_counts = grid_cell_counts(grid_index, len(grid_index['levels']) - 1, np.arange(len(df)))
+    assert cell_counts['Count'].sum() == df['Longitude'].notna().sum()
+    assert (cell_counts['Longitude'] > 149).sum() == 1
+
+
+def test_grid_cell_counts_match_pandas(vehicles):
+    grid_index = build_grid_index(vehicles, "grid")
+    rows = np.flatnonzero(vehicles['Make'].to_numpy() == 'TESLA')
+    for level, cell_size in enumerate(level['cell_size'] for level in grid_index['levels']):
+        cell_counts = grid_cell_counts(grid_index, level, rows)
+        expected = expected_cell_counts(vehicles.iloc[rows], grid_index['origin'], cell_size)
+        assert sorted(cell_counts['Count'].tolist()) == sorted(expected.tolist())
+
+
+# Equivalence of the index engines with the plain pandas computation they replace
+
+from ev_dashboard.indexes import (  # noqa: E402
+    CUSTOM_CENTER, build_facet_codes, build_geo_tree, build_model_tree, build_range_index, build_sample_order,
+    build_spatial_index, facet_counts, geo_leaf_totals, geo_level_table, longest_range_vehicle, model_level_table,
+    query_bbox, query_radius, query_range_index, sample_rows, selection_mask, summarize_model_leaves,
+)
+
+
+def filtered_rows(df):
+    """A filter that cuts across every hierarchy: a few makes and a model year window"""
+    mask = df['Make'].isin(['TESLA', 'FORD', 'KIA']) & df['Model Year'].between(2015, 2021)
+    return np.flatnonzero(mask.to_numpy())
+
+
+def test_range_index_matches_pandas(vehicles):
+    range_index = build_range_index(vehicles, "vehicles")
+    ev_types = vehicles['Electric Vehicle Type'].unique().tolist()
+    for column, value_range in [('Model Year', (2016, 2020)), ('Electric Range', (50, 200)),
+                                ('Base MSRP', (40000, 90000))]:
+        for types in (ev_types, ev_types[:1]):
+            expected = vehicles[vehicles[column].between(*value_range) & vehicles['Electric Vehicle Type'].isin(types)]
+            result = query_range_index(range_index, column, value_range, types)
+            assert result['count'] == len(expected)
+            assert np.isclose(result['avg_range'], expected['Electric Range'].mean())
+            if expected['Base MSRP'].notna().any():
+                assert np.isclose(result['avg_price'], expected['Base MSRP'].mean())
+            else:
+                assert result['avg_price'] is None
+
+
+def test_facet_counts_and_selection_masks_match_pandas(vehicles):
+    facets = build_facet_codes(vehicles, "vehicles")
+    mask = (vehicles['Model Year'] >= 2018).to_numpy()
+    for column, facet in facets.items():
+        expected = vehicles.loc[mask, column].value_counts()
+        counts = facet_counts(facet, mask)
+        assert {option: count for option, count in counts.items() if count} == expected.to_dict()
+        if len(facet['options']) > 2:
+            selected = facet['options'][:2]
+            assert (selection_mask(facet, selected) == vehicles[column].isin(selected).to_numpy()).all()
+        assert selection_mask(facet, facet['options']) is None and selection_mask(facet, []) is None
+
+
+def test_geo_rollups_match_pandas_groupby(vehicles):
+    geo_tree = build_geo_tree(vehicles, "vehicles")
+    rows = filtered_rows(vehicles)
+    subset = vehicles.iloc[rows]
+    leaf_totals = geo_leaf_totals(geo_tree, rows)
+
+    for depth, levels in enumerate([['County'], ['County', 'City']]):
+        table = geo_level_table(geo_tree, leaf_totals, depth).set_index(levels).sort_index()
+        grouped = subset.groupby(levels)
+        assert table['Count'].tolist() == grouped.size().sort_index().tolist()
+        assert np.allclose(table['Avg Range'], grouped['Electric Range'].mean().sort_index(), rtol=1e-4)
+        assert np.allclose(table['Avg MSRP'], grouped['Base MSRP'].mean().sort_index(), rtol=1e-4, equal_nan=True)
+        for ev_type in geo_tree['ev_types']:
+            expected = (subset['Electric Vehicle Type'] == ev_type).groupby([subset[level] for level in levels]).sum()
+            assert table[ev_type].tolist() == expected.sort_index().tolist()
+
+    county = subset['County'].iloc[0]
+    cities = geo_level_table(geo_tree, leaf_totals, 1, (county,))
+    assert set(cities['County']) == {county}
+    assert cities['Count'].sum() == (subset['County'] == county).sum()
+
+
+def test_model_rollups_match_pandas_groupby(vehicles):
+    model_tree = build_model_tree(vehicles, "vehicles")
+    rows = filtered_rows(vehicles)
+    subset = vehicles.iloc[rows]
+    leaf_stats = summarize_model_leaves(model_tree, rows)
+
+    for depth, levels in enumerate([['Make'], ['Make', 'Model']]):
+        table = model_level_table(model_tree, leaf_stats, depth).set_index(levels).sort_index()
+        grouped = subset.groupby(levels)
+        assert table['Count'].tolist() == grouped.size().sort_index().tolist()
+        assert np.allclose(table['Avg Range'], grouped['Electric Range'].mean().sort_index())
+        assert np.allclose(table['Max Range'], grouped['Electric Range'].max().sort_index())
+        for column, statistic in [('Avg MSRP', 'mean'), ('Min MSRP', 'min'), ('Max MSRP', 'max')]:
+            expected = grouped['Base MSRP'].agg(statistic).sort_index()
+            assert np.allclose(table[column], expected, equal_nan=True)
+        # Top Row points at a row holding the group's longest range
+        top_ranges = vehicles['Electric Range'].to_numpy()[table['Top Row'].to_numpy()]
+        assert np.allclose(top_ranges, table['Max Range'])
+
+    longest, make, model = longest_range_vehicle(model_tree, leaf_stats)
+    best = subset.loc[subset['Electric Range'].idxmax()]
+    assert longest == best['Electric Range'] and (make, model) == (best['Make'], best['Model'])
+
+
+def haversine_miles(longitude, latitude, center_lon, center_lat):
+    lon1, lat1, lon2, lat2 = map(np.radians, (center_lon, center_lat, longitude, latitude))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * 3958.8 * np.arcsin(np.sqrt(a))
+
+
+def test_spatial_queries_match_a_full_scan(vehicles):
+    spatial_index = build_spatial_index(vehicles, "vehicles")
+    longitude = vehicles['Longitude'].to_numpy(dtype='float64')
+    latitude = vehicles['Latitude'].to_numpy(dtype='float64')
+
+    box = (-122.6, 47.2, -122.1, 47.8)
+    expected = np.flatnonzero((longitude >= box[0]) & (longitude <= box[2]) &
+                              (latitude >= box[1]) & (latitude <= box[3]))
+    assert query_bbox(spatial_index, *box).tolist() == expected.tolist()
+
+    for radius in (5, 25):
+        expected = np.flatnonzero(haversine_miles(longitude, latitude, -122.33, 47.61) <= radius)
+        assert sorted(query_radius(spatial_index, -122.33, 47.61, radius).tolist()) == expected.tolist()
+    assert CUSTOM_CENTER not in spatial_index['city_centers']
+
+
+def test_stratified_sample_keeps_every_stratum_and_is_stable(vehicles):
+    sample_order = build_sample_order(vehicles, "vehicles")
+    rows = filtered_rows(vehicles)
+    sample = sample_rows(sample_order, rows, len(vehicles), 200)
+    assert len(sample) == 200 and set(sample) <= set(rows)
+    assert (np.diff(sample) > 0).all()
+
+    strata = vehicles.iloc[rows].groupby(['Electric Vehicle Type', 'Make']).size()
+    sampled = vehicles.iloc[sample].groupby(['Electric Vehicle Type', 'Make']).size()
+    assert set(sampled.index) == set(strata.index)
+    assert (sampled.reindex(strata.index) >= np.minimum(strata, 5)).all()
+    assert sample_rows(sample_order, rows, len(vehicles), 200).tolist() == sample.tolist()
+    assert len(sample_rows(sample_order, rows[:50], len(vehicles), 200)) == 50
@@ -0,0 +1,25 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from ev_dashboard import memory
+from ev_dashboard.memory import measure_session, process_memory_totals
+
+
+def test_state_over_budget_is_flagged_once_and_frames_are_not_counted(monkeypatch, caplog):
+    monkeypatch.setattr(memory, 'SESSION_MEMORY_BUDGET', 0.5 * 1024 * 1024)
+    shared = pd.DataFrame({'Electric Range': np.arange(200_000)})
+    filtered = shared.iloc[:100_000]
+    small = [('df', shared), ('selected_makes', ["TESLA", "KIA"])]
+
+    entry = measure_session("budget-test", small, [shared], filtered, filtered)
+    assert not entry['over_budget']
+    assert entry['state'] < 1024 and entry['frames'] >= filtered.memory_usage(deep=True).sum()
+
+    large = small + [('notes', list(range(100_000)))]
+    with caplog.at_level(logging.WARNING, logger=memory.__name__):
+        assert measure_session("budget-test", large, [shared], filtered, filtered)['over_budget']
+        measure_session("budget-test", large, [shared], filtered, filtered)
+    assert len([record for record in caplog.records if "over its" in record.getMessage()]) == 1
+    assert process_memory_totals()['over_budget'] >= 1
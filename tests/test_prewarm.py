@@ -0,0 +1,19 @@
+import threading
+
+import streamlit as st
+
+from ev_dashboard import prewarm
+
+
+def test_render_pages_waits_for_the_foreground_run(monkeypatch):
+    rendered = []
+    monkeypatch.setattr(prewarm, 'load_page', lambda slug: lambda *args: rendered.append(slug))
+    st.session_state.filter_signature = "test"
+    with prewarm.foreground_run():
+        worker = threading.Thread(target=prewarm.render_pages, args=(None, None, ["price", "pie"]))
+        worker.start()
+        worker.join(timeout=0.5)
+        assert worker.is_alive() and rendered == []
+    worker.join(timeout=5)
+    assert rendered == ["price", "pie"]
+    del st.session_state.filter_signature
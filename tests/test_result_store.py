@@ -0,0 +1,59 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from ev_dashboard import result_store
+from ev_dashboard.result_store import connect, decode_result, encode_result, fetch_result, persistent_result
+
+
+def test_dict_results_round_trip_without_pickle():
+    value = {
+        'matrix': np.arange(6).reshape(2, 3),
+        'makes': np.array(["TESLA", "NISSAN"], dtype=object),
+        'options': ["King", "Pierce"],
+        'low': np.float64(1.5),
+        'replicates': 2000,
+        'column': "Base MSRP",
+        'missing': None,
+    }
+    result_format, payload = encode_result(value)
+    assert result_format == "npz"
+    decoded = decode_result(result_format, payload)
+    assert decoded['matrix'].tolist() == value['matrix'].tolist()
+    assert decoded['makes'].dtype == object and decoded['makes'].tolist() == ["TESLA", "NISSAN"]
+    assert {key: decoded[key] for key in ('options', 'low', 'replicates', 'column', 'missing')} == \
+        {'options': ["King", "Pierce"], 'low': 1.5, 'replicates': 2000, 'column': "Base MSRP", 'missing': None}
+
+
+def test_frames_and_none_round_trip():
+    frame = pd.DataFrame({'Make': ["TESLA", "KIA"], 'Count': [3, 1]})
+    pd.testing.assert_frame_equal(decode_result(*encode_result(frame)), frame)
+    assert decode_result(*encode_result(None)) is None
+
+
+class Exploit:
+    def __reduce__(self):
+        return (print, ("pickle was loaded",))
+
+
+def test_pickled_rows_are_never_loaded(capsys):
+    connection = connect()
+    connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                       ("planted", "x", "x", "planted", "pickle", pickle.dumps(Exploit()), 1, 0.0))
+    assert fetch_result("planted") == (False, None)
+    assert "pickle was loaded" not in capsys.readouterr().out
+
+
+def test_results_are_stamped_with_the_version_they_were_computed_from(monkeypatch):
+    connect()
+    versions = iter(["computed-version", "reloaded-version"])
+    monkeypatch.setattr(result_store, 'get_dataset_version', lambda: next(versions))
+
+    @persistent_result('version_stamp_test')
+    def aggregate(filter_signature):
+        return {'total': np.int64(1)}
+
+    assert aggregate("version-stamp") == {'total': 1}
+    row = connect().execute("SELECT dataset_version FROM results WHERE name = 'version_stamp_test'").fetchone()
+    assert row == ("computed-version",)
@@ -0,0 +1,27 @@
+from ev_dashboard.analytics import get_filter_signature
+from ev_dashboard.indexes import CUSTOM_CENTER
+from ev_dashboard.sidebar import normalize_location
+
+BBOX = {'location_mode': "Bounding box", 'bbox_south': 47.0, 'bbox_west': -123.0, 'bbox_north': 48.0,
+        'bbox_east': -122.0}
+
+
+def test_stale_radius_keys_do_not_change_the_bbox_signature():
+    stale = dict(BBOX, location_center="Seattle", location_lat=47.61, location_lon=-122.33, location_radius=10)
+    assert normalize_location(stale) == BBOX
+    assert get_filter_signature({'location': normalize_location(stale)}) == \
+        get_filter_signature({'location': normalize_location(BBOX)})
+
+
+def test_radius_keeps_custom_coordinates_only_for_a_custom_center():
+    radius = {'location_mode': "Within radius", 'location_center': "Seattle", 'location_radius': 10,
+              'location_lat': 46.0, 'location_lon': -120.0, 'bbox_south': 47.0}
+    assert normalize_location(radius) == {'location_mode': "Within radius", 'location_center': "Seattle",
+                                          'location_radius': 10}
+    custom = dict(radius, location_center=CUSTOM_CENTER)
+    assert normalize_location(custom)['location_lat'] == 46.0
+    assert 'bbox_south' not in normalize_location(custom)
+
+
+def test_anywhere_is_no_location_filter():
+    assert normalize_location(dict(BBOX, location_mode="Anywhere")) is None
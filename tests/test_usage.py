@@ -0,0 +1,59 @@
+import multiprocessing
+
+from ev_dashboard import usage
+from ev_dashboard.usage import FILTER_LOG, PENDING_LOG, WARM_MAX_STATES, is_warm, mark_warm, record_run, state_key
+
+
+def custom_radius_state(lat, lon):
+    return {'dataset_version': "v1", 'makes': None, 'location': {
+        'location_mode': "Within radius", 'location_center': "Custom coordinates",
+        'location_lat': lat, 'location_lon': lon, 'location_radius': 10}}
+
+
+def test_logged_coordinates_are_rounded():
+    state = custom_radius_state(47.612345, -122.331234)
+    record_run(state, "signature-a", "price", 0.1, computed=1)
+    logged = FILTER_LOG[state_key(state)]['state']['location']
+    assert (logged['location_lat'], logged['location_lon']) == (47.61, -122.33)
+    assert 'dataset_version' not in FILTER_LOG[state_key(state)]['state']
+    # Nearby points land on the same logged state
+    assert state_key(custom_radius_state(47.6149, -122.3311)) == state_key(state)
+
+
+def test_hits_count_runs_that_computed_nothing():
+    state = {'dataset_version': "v1", 'makes': ["TESLA"], 'location': None}
+    assert record_run(state, "signature-b", "price", 0.1, computed=3) is False
+    assert record_run(state, "signature-b", "price", 0.1, computed=0) is True
+    entry = FILTER_LOG[state_key(state)]
+    assert (entry['hits'], entry['misses']) == (1, 1)
+
+
+def test_warm_entries_are_bounded_and_expire(monkeypatch):
+    for position in range(WARM_MAX_STATES + 1):
+        mark_warm(f"bounded-{position}", "price")
+    assert not is_warm("bounded-0", "price")
+    assert is_warm(f"bounded-{WARM_MAX_STATES}", "price")
+    monkeypatch.setattr(usage, 'WARM_TTL', 0)
+    assert not is_warm(f"bounded-{WARM_MAX_STATES}", "price")
+
+
+def record_and_save(worker, n_runs):
+    PENDING_LOG.clear()
+    for run in range(n_runs):
+        state = {'dataset_version': "v1", 'makes': [f"MAKE {run % 3}"], 'location': None}
+        record_run(state, f"signature-{worker}-{run}", "price", 0.01, computed=1)
+        usage.save_usage_log()
+
+
+def test_concurrent_saves_keep_every_process_runs():
+    usage.save_usage_log()
+    before = sum(entry['runs'] for entry in usage.read_usage_log().values())
+    workers = [multiprocessing.get_context("fork").Process(target=record_and_save, args=(worker, 20))
+               for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+    saved = usage.read_usage_log()
+    assert sum(entry['runs'] for entry in saved.values()) - before == 4 * 20
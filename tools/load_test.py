@@ -0,0 +1,207 @@
+"""Headless load test: concurrent scripted dashboard sessions against app.py.
+
+Each session is a Streamlit AppTest that navigates pages, edits the make multiselect, drags
+the year and range sliders and flips Sample Mode, timing every rerun. AppTest swaps a mock
+runtime in and out of a process-wide global on every run, so sessions cannot share a
+process: each runs in its own spawned process and starts on a common barrier. Processes share
+only what the app shares across server processes (the mapped Arrow dataset and the result
+store), so the figures are per-process costs, as for one session per server worker.
+
+    python tools/load_test.py --sessions 8 --actions 30
+    python tools/load_test.py --sessions 16 --synthetic 200000
+
+Reports p50/p95/p99 rerun latency, throughput, and each session process's resident and peak
+memory. --synthetic generates a dataset of that many rows in a temporary directory (via
+EV_DATA_PATH), so the test runs without the DOL file.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+
+# Relative weights of the scripted session actions
+ACTIONS = {
+    'navigate': 4,
+    'makes': 2,
+    'years': 2,
+    'range': 1,
+    'sample': 1,
+}
+
+SYNTHETIC_MAKES = {
+    'TESLA': ['MODEL 3', 'MODEL Y', 'MODEL S', 'MODEL X'],
+    'NISSAN': ['LEAF', 'ARIYA'],
+    'CHEVROLET': ['BOLT EV', 'VOLT'],
+    'FORD': ['MUSTANG MACH-E', 'F-150', 'FUSION'],
+    'BMW': ['I3', 'X5', '330E'],
+    'KIA': ['NIRO', 'EV6'],
+    'HYUNDAI': ['IONIQ 5', 'KONA'],
+    'RIVIAN': ['R1T', 'R1S'],
+}
+SYNTHETIC_COUNTIES = {
+    'King': (-122.33, 47.61), 'Pierce': (-122.44, 47.25), 'Snohomish': (-122.20, 47.98),
+    'Spokane': (-117.43, 47.66), 'Clark': (-122.66, 45.64), 'Thurston': (-122.90, 47.04),
+}
+
+
+def write_synthetic_dataset(n_rows, path, seed=0):
+    """Write a DOL-shaped CSV of n_rows random vehicles"""
+    rng = np.random.default_rng(seed)
+    makes = rng.choice(list(SYNTHETIC_MAKES), n_rows)
+    models = np.array([rng.choice(SYNTHETIC_MAKES[make]) for make in makes])
+    counties = rng.choice(list(SYNTHETIC_COUNTIES), n_rows)
+    centers = np.array([SYNTHETIC_COUNTIES[county] for county in counties])
+    points = centers + rng.normal(0, 0.15, size=(n_rows, 2))
+    phev = rng.random(n_rows) < 0.25
+    postal_codes = rng.integers(98001, 99403, n_rows)
+    pd.DataFrame({
+        'County': counties,
+        'City': np.char.add(np.char.upper(counties.astype(str)), rng.choice(['', ' HEIGHTS', ' PARK'], n_rows)),
+        'State': 'WA',
+        'Postal Code': postal_codes,
+        'Model Year': rng.integers(2011, 2025, n_rows),
+        'Make': makes,
+        'Model': models,
+        'Electric Vehicle Type': np.where(phev, 'Plug-in Hybrid Electric Vehicle (PHEV)',
+                                          'Battery Electric Vehicle (BEV)'),
+        'Clean Alternative Fuel Vehicle (CAFV) Eligibility': np.where(
+            rng.random(n_rows) < 0.6, 'Clean Alternative Fuel Vehicle Eligible', 'Eligibility unknown'),
+        'Electric Range': np.where(phev, rng.integers(0, 60, n_rows), rng.integers(0, 340, n_rows)),
+        'Base MSRP': np.where(rng.random(n_rows) < 0.1, rng.integers(30000, 110000, n_rows), 0),
+        'Vehicle Location': [f"POINT ({lon:.5f} {lat:.5f})" for lon, lat in points],
+        '2020 Census Tract': 53000000000 + postal_codes,
+    }).to_csv(path, index=False)
+
+
+def process_memory():
+    """Resident and peak resident bytes of this process"""
+    memory = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                field, _, value = line.partition(":")
+                if field in ('VmRSS', 'VmHWM'):
+                    memory[field] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux
+    peak = memory.get('VmHWM', resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+    return {'rss': memory.get('VmRSS', peak), 'peak': peak}
+
+
+def run_action(at, action, rng):
+    """Apply one scripted user action to the session's widgets (the caller reruns)"""
+    if action == 'navigate':
+        navigation = at.selectbox(key="navigation_selectbox")
+        navigation.set_value(rng.choice(navigation.options))
+    elif action == 'makes':
+        makes = at.multiselect(key="makes_multiselect")
+        # Mostly narrow to a few makes, sometimes go back to every make
+        chosen = makes.options if rng.random() < 0.3 else rng.sample(makes.options, rng.randint(1, 3))
+        makes.set_value(chosen)
+    elif action in ('years', 'range'):
+        slider = at.slider(key="year_slider" if action == 'years' else "range_slider")
+        low, high = slider.min, slider.max
+        start = rng.randint(low, high)
+        slider.set_range(start, rng.randint(start, high))
+    elif action == 'sample':
+        sample_mode = at.checkbox(key="sample_mode")
+        sample_mode.set_value(not sample_mode.value)
+
+
+def run_session(session_id, n_actions, seed, barrier, results):
+    """Script one session in this process and put its latencies, errors and memory on results"""
+    from streamlit import config
+    from streamlit.testing.v1 import AppTest
+
+    # Streamlit's magic rewrites the script through the ast module on every run; app.py uses none
+    config.set_option("runner.magicEnabled", False)
+    rng = random.Random(seed + session_id)
+    latencies, errors = [], 0
+    at = AppTest.from_file(APP_PATH, default_timeout=300)
+    barrier.wait()
+    started = time.perf_counter()
+    try:
+        at.run()
+        latencies.append(time.perf_counter() - started)
+    except Exception as error:
+        # Still report, so the parent is not left waiting for this session
+        results.put({'latencies': latencies, 'errors': 1, **process_memory()})
+        print(f"session {session_id}: first run failed: {error}", file=sys.stderr)
+        return
+    for _ in range(n_actions):
+        action = rng.choices(list(ACTIONS), weights=list(ACTIONS.values()))[0]
+        try:
+            run_action(at, action, rng)
+            started = time.perf_counter()
+            at.run()
+            latencies.append(time.perf_counter() - started)
+        except Exception as error:
+            errors += 1
+            print(f"session {session_id}: {action} failed: {error}", file=sys.stderr)
+            continue
+        if at.exception:
+            errors += 1
+            print(f"session {session_id}: {action} raised: {at.exception[0].message}", file=sys.stderr)
+    results.put({'latencies': latencies, 'errors': errors, **process_memory()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent sessions")
+    parser.add_argument("--actions", type=int, default=20, help="scripted actions per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--synthetic", type=int, metavar="ROWS",
+                        help="generate a synthetic dataset of ROWS vehicles instead of using data/")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        data_dir = tempfile.mkdtemp(prefix="ev-load-test-")
+        os.environ["EV_DATA_PATH"] = os.path.join(data_dir, "electric_vehicle_population.csv")
+        write_synthetic_dataset(args.synthetic, os.environ["EV_DATA_PATH"], args.seed)
+
+    # Spawned, not forked, so every session starts from a fresh interpreter like a server worker
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(args.sessions + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(target=run_session, args=(session_id, args.actions, args.seed, barrier, results))
+        for session_id in range(args.sessions)
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    started = time.perf_counter()
+    finished = []
+    for process in processes:
+        # Drain the queue before joining so no worker blocks on a full pipe
+        finished.append(results.get())
+    elapsed = time.perf_counter() - started
+    for process in processes:
+        process.join()
+
+    latencies = np.concatenate([result['latencies'] for result in finished]) * 1000
+    rss_mb = np.array([result['rss'] for result in finished]) / 1024 / 1024
+    peak_mb = np.array([result['peak'] for result in finished]) / 1024 / 1024
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"Sessions:          {len(finished)} x {args.actions} actions, one process each")
+    print(f"Reruns:            {len(latencies):,} ({sum(result['errors'] for result in finished)} errors)")
+    print(f"Rerun latency:     p50 {p50:,.0f} ms | p95 {p95:,.0f} ms | p99 {p99:,.0f} ms | max {latencies.max():,.0f} ms")
+    print(f"Throughput:        {len(latencies) / elapsed:.1f} reruns/s over {elapsed:.1f} s")
+    print(f"Session RSS:       mean {rss_mb.mean():,.0f} MB | max {rss_mb.max():,.0f} MB")
+    print(f"Session peak RSS:  mean {peak_mb.mean():,.0f} MB | max {peak_mb.max():,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()